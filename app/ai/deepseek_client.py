@@ -1,29 +1,23 @@
-import os
-import requests
-from app.config.settings import DEEPSEEK_API_KEY
+import logging
 
-API_URL = "https://api.deepseek.com/v1/chat/completions"
+from app.ai.llm_client import LLMError, llm_client
+from app.config.settings import DEEPSEEK_API_KEY, DEEPSEEK_API_URL
 
-def ask_deepseek(message: str) -> str:
-    headers = {
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": "deepseek-chat",
-        "messages": [
-            {"role": "system", "content": "Sən satış və biznes üzrə ağıllı AI köməkçisən."},
-            {"role": "user", "content": message}
-        ],
-        "temperature": 0.4
-    }
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = "Sən satış və biznes üzrə ağıllı AI köməkçisən."
+
+async def ask_deepseek(message: str) -> str:
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": message}
+    ]
     try:
-        response = requests.post(API_URL, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"]
-    except requests.exceptions.HTTPError as errh:
-        print("❌ HTTP Error:", errh)
-        return "DeepSeek API xətası: HTTP Error"
-    except requests.exceptions.RequestException as err:
-        print("❌ API Error:", err)
+        # Paylaşılan pool-lu session (bloklayan requests.post əvəzinə); açar və URL settings-dən
+        return await llm_client.chat(messages, url=DEEPSEEK_API_URL, api_key=DEEPSEEK_API_KEY, temperature=0.4)
+    except LLMError as err:
+        if err.status:
+            logger.error(f"❌ HTTP Error: {err}")
+            return "DeepSeek API xətası: HTTP Error"
+        logger.error(f"❌ API Error: {err}")
         return "DeepSeek API xətası: Unknown Error"
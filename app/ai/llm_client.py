@@ -0,0 +1,175 @@
+# brain/app/ai/llm_client.py
+import asyncio
+import json
+import logging
+import os
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEEPSEEK_URL = "https://api.deepseek.com/v1/chat/completions"
+DEEPSEEK_MODEL = "deepseek-chat"
+
+# Təkrar cəhd təhlükəsiz olan cavablar (sorğu emal olunmayıb / müvəqqəti xəta)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """LLM API-dan uğursuz cavab (status 0 - şəbəkə/timeout xətası).
+
+    `retryable` - sorğunu təkrarlamaq təhlükəsizdir (bağlantı qurulmayıb,
+    429 və ya müvəqqəti 5xx).
+    """
+
+    def __init__(self, message: str, status: int = 0, retryable: bool = None):
+        super().__init__(message)
+        self.status = status
+        self.retryable = status in RETRYABLE_STATUS if retryable is None else retryable
+
+
+def _network_error(e: Exception) -> LLMError:
+    # Bağlantı heç qurulmayıbsa sorğu serverə çatmayıb - təkrarlamaq olar
+    return LLMError(f"{type(e).__name__}: {e}",
+                    retryable=isinstance(e, aiohttp.ClientConnectorError))
+
+
+class LLMClient:
+    """DeepSeek (OpenAI-uyğun) API üçün paylaşılan async client.
+
+    Bir uzunömürlü `aiohttp.ClientSession` saxlanılır: keep-alive
+    bağlantılar pool-da qalır (hər sual üçün yeni TCP+TLS handshake yoxdur),
+    DNS nəticələri keşlənir, host başına bağlantı sayı məhdudlaşdırılır.
+    Session ilk sorğuda və ya `start()`-da yaradılır, `close()` ilə bağlanır.
+    """
+
+    def __init__(self, url: str = DEEPSEEK_URL, api_key: str = None, model: str = DEEPSEEK_MODEL,
+                 timeout: float = float(os.getenv("LLM_TIMEOUT", "30")), limit: int = 100, limit_per_host: int = 32,
+                 dns_ttl: int = 300, keepalive_timeout: float = 60.0):
+        self.url = url
+        self._api_key = api_key
+        self.model = model
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=min(timeout, 10.0))
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._session = None
+        self._lock = None
+
+    @property
+    def api_key(self):
+        # .env client yaradıldıqdan sonra yüklənə bilər
+        return self._api_key or os.getenv("DEEPSEEK_API_KEY")
+
+    # ===== LIFECYCLE =====
+    async def start(self) -> aiohttp.ClientSession:
+        """Session-u yarat (artıq varsa eynisini qaytar)"""
+        if self._session is not None and not self._session.closed:
+            return self._session
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=self.dns_ttl,
+                    use_dns_cache=True,
+                    keepalive_timeout=self.keepalive_timeout
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=self.timeout,
+                    headers={"Content-Type": "application/json"}
+                )
+                logger.info(f"🔌 LLM HTTP pool açıldı (host başına {self.limit_per_host})")
+        return self._session
+
+    async def close(self):
+        """Pool-u bağla (bütün keep-alive bağlantılar)"""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+            logger.info("🔌 LLM HTTP pool bağlandı")
+
+    # ===== SORĞULAR =====
+    async def post(self, payload: dict, url: str = None, api_key: str = None) -> dict:
+        """Payload-u API-a göndər, JSON cavabı qaytar; xətada LLMError.
+
+        `url` / `api_key` - bu sorğu üçün başqa endpoint (eyni pool ilə).
+        """
+        api_key = api_key or self.api_key
+        if not api_key:
+            raise LLMError("API KEY yoxdur")
+
+        session = await self.start()
+        headers = {"Authorization": f"Bearer {api_key}"}
+        try:
+            async with session.post(url or self.url, json=payload, headers=headers) as response:
+                if response.status != 200:
+                    error = await response.text()
+                    raise LLMError(f"HTTP {response.status}: {error[:200]}", response.status)
+                return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise _network_error(e) from e
+
+    async def chat(self, messages: list, url: str = None, api_key: str = None, **params) -> str:
+        """Chat completion - cavab mətnini qaytar"""
+        payload = {"model": self.model, "messages": messages, **params}
+        result = await self.post(payload, url, api_key)
+        return result["choices"][0]["message"]["content"]
+
+    async def stream_chat(self, messages: list, **params):
+        """Chat completion SSE axını (`stream=true`) - mətn parçalarını yield edir"""
+        if not self.api_key:
+            raise LLMError("API KEY yoxdur")
+
+        payload = {"model": self.model, "messages": messages, **params, "stream": True}
+        session = await self.start()
+        headers = {"Authorization": f"Bearer {self.api_key}", "Accept": "text/event-stream"}
+        try:
+            async with session.post(self.url, json=payload, headers=headers) as response:
+                if response.status != 200:
+                    error = await response.text()
+                    raise LLMError(f"HTTP {response.status}: {error[:200]}", response.status)
+
+                # Hər event: "data: {json}\n\n", axırıncı "data: [DONE]"
+                async for raw in response.content:
+                    line = raw.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise _network_error(e) from e
+
+
+# Prosesdə tək instance - bot və FastAPI eyni pool-u istifadə edir
+llm_client = LLMClient(url=os.getenv("DEEPSEEK_API_URL", DEEPSEEK_URL))
+
+
+# ===== HOOKS =====
+async def startup():
+    """FastAPI startup"""
+    await llm_client.start()
+
+
+async def shutdown():
+    """FastAPI shutdown"""
+    await llm_client.close()
+
+
+async def post_init(application):
+    """Telegram Application.post_init"""
+    await llm_client.start()
+
+
+async def post_shutdown(application):
+    """Telegram Application.post_shutdown"""
+    await llm_client.close()
@@ -0,0 +1,282 @@
+# brain/app/ai/resilience.py
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import deque
+
+from app.ai.llm_client import LLMError, llm_client
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(LLMError):
+    """Upstream sağlam deyil - sorğu göndərilmədən dərhal imtina"""
+
+
+class AdaptiveLimiter:
+    """AIMD paralellik limiti.
+
+    Gecikmə `latency_target`-dən aşağı olan hər uğurlu cavab limiti
+    təxminən bir "pəncərədə" +1 artırır (additive increase); yavaş cavab
+    və ya upstream xətası limiti `backoff` dəfə azaldır (multiplicative
+    decrease, `latency_target` ərzində ən çox bir dəfə).
+    """
+
+    def __init__(self, initial: int = 8, min_limit: int = 1, max_limit: int = 64,
+                 latency_target: float = 5.0, backoff: float = 0.7):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.in_flight = 0
+        self._waiters = deque()
+        self._last_decrease = 0.0
+
+    async def acquire(self):
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Yer verilmişdi, amma artıq lazım deyil
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: float, ok: bool):
+        self.in_flight -= 1
+        if ok and latency <= self.latency_target:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        else:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.latency_target:
+                self._last_decrease = now
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                logger.info(f"📉 LLM paralellik limiti: {self.limit:.1f}")
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class TokenBucket:
+    """API kvotası: saniyədə `rate` sorğu, `capacity`-ə qədər burst"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, max_wait: float = None) -> bool:
+        """Bir token götür; `max_wait`-dən çox gözləmək lazımdırsa False"""
+        self._refill()
+        # Token-i əvvəlcədən "borc" götür - növbədəkilər ardıcıl gözləyir
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if max_wait is not None and wait > max_wait:
+            self.tokens += 1
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+
+class CircuitBreaker:
+    """Ardıcıl `failure_threshold` upstream xətasından sonra açılır;
+    `reset_timeout` keçəndə bir sınaq sorğusu buraxılır (half-open).
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def cancel_probe(self):
+        """Sınaq sorğusu göndərilmədi - növbəti çağırış sınasın"""
+        if self.state == self.HALF_OPEN:
+            self._probing = False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info("✅ LLM circuit bağlandı - upstream bərpa olundu")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"⚡ LLM circuit açıldı ({self.failures} xəta)")
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+
+
+def _is_upstream_failure(error: LLMError) -> bool:
+    # 4xx (açar, payload) upstream-in sağlamlığı haqqında deyil
+    return error.status == 0 or error.status >= 500
+
+
+class ResilientClient:
+    """LLMClient ətrafında qoruma qatı - `chat` / `stream_chat` eyni interfeysdir.
+
+    Sıra: circuit breaker -> token bucket -> adaptiv paralellik limiti ->
+    sorğu. Yalnız `retryable` xətalar jitter-li eksponensial gözləmə ilə
+    təkrarlanır (axında - yalnız ilk parça gəlməmişsə).
+    """
+
+    def __init__(self, client=llm_client, limiter: AdaptiveLimiter = None,
+                 bucket: TokenBucket = None, breaker: CircuitBreaker = None,
+                 retries: int = 2, backoff_base: float = 0.5, backoff_cap: float = 4.0,
+                 max_queue_wait: float = 10.0):
+        self.client = client
+        self.limiter = limiter or AdaptiveLimiter()
+        self.bucket = bucket or TokenBucket(rate=5.0, capacity=10.0)
+        self.breaker = breaker or CircuitBreaker()
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_queue_wait = max_queue_wait
+        self.retried = 0
+        self.rejected = 0
+
+    @property
+    def api_key(self):
+        return self.client.api_key
+
+    async def chat(self, messages: list, **params) -> str:
+        for attempt in range(self.retries + 1):
+            await self._admit()
+            started = time.monotonic()
+            try:
+                reply = await self.client.chat(messages, **params)
+            except LLMError as e:
+                self._record(time.monotonic() - started, e)
+                if not e.retryable or attempt == self.retries:
+                    raise
+                await self._backoff(attempt, e)
+            except BaseException:
+                self._record(time.monotonic() - started)
+                raise
+            else:
+                self._record(time.monotonic() - started)
+                return reply
+
+    async def stream_chat(self, messages: list, **params):
+        for attempt in range(self.retries + 1):
+            await self._admit()
+            started = time.monotonic()
+            # Axında limiter üçün gecikmə - ilk parçaya qədər vaxt
+            first_latency = None
+            try:
+                async for delta in self.client.stream_chat(messages, **params):
+                    if first_latency is None:
+                        first_latency = time.monotonic() - started
+                    yield delta
+            except LLMError as e:
+                self._record(first_latency or time.monotonic() - started, e)
+                if first_latency is not None or not e.retryable or attempt == self.retries:
+                    raise
+                await self._backoff(attempt, e)
+            except BaseException:
+                # Oxuyan tərəf axını dayandırdı - slotu qaytar
+                self._record(first_latency or time.monotonic() - started)
+                raise
+            else:
+                self._record(first_latency or time.monotonic() - started)
+                return
+
+    async def _admit(self):
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError("LLM circuit açıqdır")
+        try:
+            if not await self.bucket.acquire(self.max_queue_wait):
+                self.rejected += 1
+                raise LLMError("LLM kvotası dolub", status=429, retryable=False)
+            await self.limiter.acquire()
+        except BaseException:
+            self.breaker.cancel_probe()
+            raise
+
+    def _record(self, latency: float, error: LLMError = None):
+        failed = error is not None and _is_upstream_failure(error)
+        self.limiter.release(latency, not failed)
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    async def _backoff(self, attempt: int, error: LLMError):
+        # Full jitter: eyni anda düşən client-lər eyni anda qayıtmasın
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        self.retried += 1
+        logger.info(f"🔁 LLM təkrar cəhd {attempt + 1} ({delay:.2f}s): {error}")
+        await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limiter.limit, 1),
+            "in_flight": self.limiter.in_flight,
+            "circuit": self.breaker.state,
+            "retried": self.retried,
+            "rejected": self.rejected
+        }
+
+
+# Bot-un DeepSeek çağırışları üçün (limitlər API kvotasına uyğun .env-dən)
+resilient_client = ResilientClient(
+    llm_client,
+    limiter=AdaptiveLimiter(
+        initial=int(os.getenv("LLM_CONCURRENCY", "8")),
+        max_limit=int(os.getenv("LLM_MAX_CONCURRENCY", "64")),
+        latency_target=float(os.getenv("LLM_LATENCY_TARGET", "8"))
+    ),
+    bucket=TokenBucket(
+        rate=float(os.getenv("LLM_RATE", "5")),
+        capacity=float(os.getenv("LLM_BURST", "10"))
+    ),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+        reset_timeout=float(os.getenv("LLM_BREAKER_RESET", "30"))
+    ),
+    retries=int(os.getenv("LLM_RETRIES", "2"))
+)
@@ -0,0 +1,59 @@
+# brain/app/ai/single_flight.py
+import asyncio
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Eyni açarlı paralel çağırışları bir upstream çağırışa birləşdir.
+
+    İlk gələn (leader) çağırışı ayrıca task kimi başladır; o bitənə qədər
+    eyni açarla gələnlər həmin nəticəni gözləyir. Leader-in handler-i
+    ləğv olunsa belə task davam edir - gözləyənlər nəticəsiz qalmır.
+    Xəta da bütün gözləyənlərə ötürülür; növbəti çağırış yenidən cəhd edir.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self.leaders = 0     # upstream-ə gedən çağırışlar
+        self.coalesced = 0   # başqasının nəticəsini gözləyənlər
+
+    async def do(self, key, fn):
+        """`fn()`-i açar üzrə bir dəfə icra et: (nəticə, shared) qaytarır"""
+        task = self._flights.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task), True
+
+        self.leaders += 1
+        task = asyncio.ensure_future(fn())
+        self._flights[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), False
+
+    def _forget(self, key, task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Heç kim gözləmirsə xəta "never retrieved" kimi itməsin
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Single-flight xətası: {task.exception()}")
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced
+        }
+
+
+def prompt_key(messages: list) -> str:
+    """Tam prompt-un (chat messages) açarı - yalnız eyni prompt-lar birləşir"""
+    payload = json.dumps(messages, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,69 @@
+# brain/app/api/alerts.py
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+from ..services.alert_index import AlertIndex
+
+router = APIRouter(prefix="/api/alerts", tags=["alerts"])
+
+alert_index = AlertIndex()
+
+
+class ReadRequest(BaseModel):
+    ids: Optional[List[str]] = None  # yoxdursa - hamısı
+
+
+def _changed():
+    """Alert statusu dəyişdi - dashboard keşi köhnəlir"""
+    from ..main import view_cache
+    view_cache.bump(immediate=True)
+
+
+@router.get("")
+async def list_alerts(limit: int = Query(20, ge=1, le=200), cursor: Optional[str] = None,
+                      include_acknowledged: bool = False, user_id: Optional[str] = None):
+    """Ən təcili alert-lər (risk, sonra yenilik) - cursor ilə səhifələnir"""
+    try:
+        alerts, next_cursor = alert_index.page(limit, cursor, include_acknowledged, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "success": True,
+        "count": len(alerts),
+        "unread": alert_index.unread,
+        "alerts": [alert.to_dict() for alert in alerts],
+        "next_cursor": next_cursor,
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@router.get("/{alert_id}")
+async def get_alert(alert_id: str):
+    alert = alert_index.get(alert_id)
+    if alert is None:
+        raise HTTPException(status_code=404, detail="Alert tapılmadı")
+    return {"success": True, "alert": alert.to_dict()}
+
+
+@router.post("/read")
+async def mark_alerts_read(request: ReadRequest):
+    """Alert-ləri oxunmuş et"""
+    changed = alert_index.mark_read(request.ids)
+    if changed:
+        _changed()
+    return {"success": True, "changed": changed, "unread": alert_index.unread}
+
+
+@router.post("/{alert_id}/ack")
+async def acknowledge_alert(alert_id: str):
+    """Alert-i təsdiqlə (bağla) - bütün admin-lərə bildirilir"""
+    from .live import ALERTS_TOPIC, hub
+
+    alert = alert_index.acknowledge(alert_id)
+    if alert is None:
+        raise HTTPException(status_code=404, detail="Alert tapılmadı")
+    _changed()
+    hub.publish(ALERTS_TOPIC, "alert_acknowledged", alert.to_dict())
+    return {"success": True, "alert": alert.to_dict()}
@@ -0,0 +1,75 @@
+# brain/app/api/analytics.py
+from fastapi import APIRouter, HTTPException, Query, Request
+from datetime import datetime
+import time
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+# Dəstəklənən aralıqlar (saniyə)
+RANGES = {
+    "1h": 3600,
+    "24h": 24 * 3600,
+    "7d": 7 * 24 * 3600,
+    "30d": 30 * 24 * 3600,
+    "90d": 90 * 24 * 3600,
+}
+
+
+def _rollups():
+    from ..main import rollups
+    if rollups is None:
+        raise HTTPException(status_code=503, detail="Analitika üçün numpy lazımdır")
+    return rollups
+
+
+def _range_seconds(range_name: str) -> int:
+    seconds = RANGES.get(range_name)
+    if seconds is None:
+        raise HTTPException(status_code=400, detail=f"Naməlum aralıq: {range_name} ({', '.join(RANGES)})")
+    return seconds
+
+
+@router.get("/series")
+async def get_series(request: Request, range: str = "24h", points: int = Query(300, ge=10, le=1000)):
+    """Zaman sırası (sütunlar): mesajlar, user-lar, risk histoqramı, bot/memory/deepseek"""
+    from ..main import view_cache
+
+    rollups = _rollups()
+    seconds = _range_seconds(range)
+
+    def build():
+        now = time.time()
+        return {
+            "success": True,
+            "range": range,
+            "series": rollups.query(now - seconds, now, points),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    try:
+        return view_cache.respond(request, f"analytics_series_{range}_{points}", build)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/summary")
+async def get_summary(request: Request, range: str = "24h"):
+    """Aralığın cəmləri və payları (bot / memory / deepseek)"""
+    from ..main import view_cache
+
+    rollups = _rollups()
+    seconds = _range_seconds(range)
+
+    def build():
+        now = time.time()
+        return {
+            "success": True,
+            "range": range,
+            "data": rollups.summary(now - seconds, now),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    try:
+        return view_cache.respond(request, f"analytics_summary_{range}", build)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
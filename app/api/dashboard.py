@@ -1,7 +1,9 @@
 # brain/app/api/dashboard.py
-from fastapi import APIRouter, HTTPException
-from datetime import datetime, timedelta
-from collections import defaultdict
+from fastapi import APIRouter, HTTPException, Request
+from datetime import datetime
+import time
+
+from ..services.fast_json import FastJSONResponse
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
@@ -10,31 +12,12 @@ router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 def get_real_dashboard_stats():
     """Real dashboard stats"""
-    from ..main import chat_messages, active_users, intervention_mode, bot_stopped
-    
-    now = datetime.now()
-    one_day_ago = now - timedelta(days=1)
-    
-    # Günün mesajları
-    today_msgs = [
-        msg for msg in chat_messages
-        if datetime.fromisoformat(msg["timestamp"]) > one_day_ago
-    ]
-    
-    # Unikal user-lar
-    unique_users_today = len(set(msg["user_id"] for msg in today_msgs))
+    from ..main import rolling_stats, risk_tracker, message_store, intervention_mode, bot_stopped
     
-    # Riskli user-lar
-    warning_users = set()
-    danger_users = set()
-    
-    for msg in today_msgs:
-        uid = msg["user_id"]
-        risk = msg.get("risk_score", 0)
-        if risk > 80:
-            danger_users.add(uid)
-        elif risk > 60:
-            warning_users.add(uid)
+    # Son 24 saat / 1 saat sayğacları - inkremental yenilənir
+    window = rolling_stats.snapshot()
+    # Warning/danger - user-ların cari (sönən) risk vəziyyətindən
+    levels = risk_tracker.level_counts()
     
     # Müdaxilələr
     active_interventions = sum(1 for mode in intervention_mode.values() if mode)
@@ -44,12 +27,12 @@ def get_real_dashboard_stats():
     stopped_bots = len([uid for uid, stopped in bot_stopped.items() if stopped])
     
     return {
-        "total_users": max(unique_users_today, 1),
-        "active_chats": len(active_users),
-        "messages_today": len(today_msgs),
-        "messages_hour": len([m for m in today_msgs if datetime.fromisoformat(m["timestamp"]) > now - timedelta(hours=1)]),
-        "warning_users": len(warning_users),
-        "danger_users": len(danger_users),
+        "total_users": max(window["unique_users"], 1),
+        "active_chats": message_store.user_count,
+        "messages_today": window["messages_today"],
+        "messages_hour": window["messages_hour"],
+        "warning_users": levels["warning"],
+        "danger_users": levels["danger"],
         "active_interventions": active_interventions,
         "active_bots": active_bots,
         "stopped_bots": stopped_bots,
@@ -60,99 +43,57 @@ def get_real_dashboard_stats():
     }
 
 def get_real_alerts():
-    """Real alerts"""
-    from ..main import chat_messages
-    
-    one_hour_ago = datetime.now() - timedelta(hours=1)
-    
-    high_risk_msgs = [
-        msg for msg in chat_messages
-        if msg.get("risk_score", 0) > 70 and 
-        datetime.fromisoformat(msg["timestamp"]) > one_hour_ago and
-        not msg.get("is_bot", False)
-    ]
+    """Real alerts - ən təcili 10 açıq alert (alert indeksindən)"""
+    from .alerts import alert_index
     
-    alerts = []
-    for msg in high_risk_msgs[:10]:
-        risk_level = "high" if msg["risk_score"] > 80 else "medium"
-        
-        alerts.append({
-            "id": f"alert_{len(alerts)}",
-            "username": msg["username"],
-            "risk_score": msg["risk_score"],
-            "level": risk_level,
-            "message": msg["message"][:150],
-            "timestamp": msg["timestamp"],
-            "user_id": msg["user_id"],
-            "risk_reasons": msg.get("risk_reasons", [])
-        })
-    
-    return alerts
+    return [alert.to_dict() for alert in alert_index.top(10)]
 
 def get_real_active_chats():
     """Real active chats"""
-    from ..main import chat_messages, active_users, intervention_mode, bot_stopped
-    
-    two_hours_ago = datetime.now() - timedelta(hours=2)
-    
-    recent_msgs = [
-        msg for msg in chat_messages
-        if datetime.fromisoformat(msg["timestamp"]) > two_hours_ago
-    ]
-    
-    if not recent_msgs:
-        return []
+    from ..main import message_store, risk_tracker, intervention_mode, bot_stopped
     
-    # User-lara görə qrupla
-    user_chats = defaultdict(list)
-    for msg in recent_msgs:
-        user_chats[msg["user_id"]].append(msg)
+    now = time.time()
+    two_hours_ago = now - 7200
+    five_min_ago = now - 300
     
     chats = []
-    for user_id, msgs in user_chats.items():
-        msgs.sort(key=lambda x: x["timestamp"])
-        last_msg = msgs[-1]
+    # Yalnız son 2 saatda aktiv olan user-lar (son aktiv əvvəl)
+    for user_id, last_ts in message_store.recent_users(two_hours_ago):
+        last_msg = message_store.user_stats(user_id).last
         
-        # Risk analizi
-        risk_scores = [m["risk_score"] for m in msgs]
-        max_risk = max(risk_scores, default=0)
-        
-        # Sayımlar
-        danger_count = len([m for m in msgs if m["risk_score"] > 80])
-        warning_count = len([m for m in msgs if 60 < m["risk_score"] <= 80])
+        # Risk - mesajlar yenidən keçilmir, user-ın sönən risk vəziyyəti oxunur
+        risk = risk_tracker.get(user_id, now)
         
         # Son mesajı qısalt
-        last_message = last_msg["message"]
+        last_message = last_msg.message
         if len(last_message) > 120:
             last_message = last_message[:117] + "..."
         
         # Unread mesajlar (son 5 dəqiqə)
-        five_min_ago = datetime.now() - timedelta(minutes=5)
         unread_count = len([
-            m for m in msgs 
-            if not m.get("is_bot", False) and 
-            not m.get("is_admin", False) and
-            datetime.fromisoformat(m["timestamp"]) > five_min_ago
+            msg for msg in message_store.user_messages_since(user_id, five_min_ago)
+            if not msg.is_bot and not msg.is_admin
         ])
         
         chats.append({
             "user_id": user_id,
-            "username": last_msg["username"],
+            "username": last_msg.username,
             "last_message": last_message,
-            "last_time": last_msg["timestamp"],
-            "is_bot": last_msg["is_bot"],
-            "message_count": len(msgs),
-            "risk_score": int(max_risk),
-            "has_danger": danger_count > 0,
-            "has_warning": warning_count > 0,
+            "last_time": last_msg.timestamp,
+            "is_bot": last_msg.is_bot,
+            "message_count": sum(1 for _ in message_store.user_messages_since(user_id, two_hours_ago)),
+            "risk_score": risk["risk_score"],
+            "risk_level": risk["level"],
+            "risk_trend": risk["velocity"],
+            "risk_streak": risk["streak"],
+            "has_danger": risk["level"] == "danger",
+            "has_warning": risk["level"] == "warning",
             "intervention_mode": intervention_mode.get(user_id, False),
             "bot_stopped": bot_stopped.get(user_id, False),
             "unread": unread_count,
-            "last_activity": active_users.get(user_id, {}).get("last_active", datetime.now()).isoformat()
+            "last_activity": datetime.fromtimestamp(last_ts).isoformat()
         })
     
-    # Sırala (son aktiv əvvəl)
-    chats.sort(key=lambda x: x["last_time"], reverse=True)
     return chats
 
 def get_real_bot_status():
@@ -173,15 +114,16 @@ def get_real_bot_status():
 
 def get_real_recent_interventions():
     """Real interventions"""
-    from ..main import intervention_mode, active_users
+    from ..main import intervention_mode, message_store
     
     interventions = []
     for user_id, intervened in intervention_mode.items():
-        if intervened and user_id in active_users:
+        if intervened and user_id in message_store:
+            last = message_store.user_stats(user_id).last
             interventions.append({
                 "user_id": user_id,
-                "username": active_users[user_id]["username"],
-                "started_at": active_users[user_id].get("last_active", datetime.now()).isoformat(),
+                "username": last.username,
+                "started_at": last.timestamp,
                 "reason": "high_risk",
                 "status": "active"
             })
@@ -194,11 +136,11 @@ async def get_dashboard_stats():
     """Dashboard stats cards üçün data"""
     try:
         data = get_real_dashboard_stats()
-        return {
+        return FastJSONResponse({
             "success": True,
             "data": data,
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -207,12 +149,12 @@ async def get_alerts():
     """Real-time alerts üçün data"""
     try:
         alerts = get_real_alerts()
-        return {
+        return FastJSONResponse({
             "success": True,
             "count": len(alerts),
             "alerts": alerts,
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -221,12 +163,12 @@ async def get_active_chats():
     """Active chats üçün data"""
     try:
         chats = get_real_active_chats()
-        return {
+        return FastJSONResponse({
             "success": True,
             "count": len(chats),
             "chats": chats,
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -235,11 +177,11 @@ async def get_bot_status():
     """Bot status üçün data"""
     try:
         status = get_real_bot_status()
-        return {
+        return FastJSONResponse({
             "success": True,
             "data": status,
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -248,29 +190,35 @@ async def get_recent_interventions():
     """Recent interventions üçün data"""
     try:
         interventions = get_real_recent_interventions()
-        return {
+        return FastJSONResponse({
             "success": True,
             "count": len(interventions),
             "interventions": interventions,
             "timestamp": datetime.now().isoformat()
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def build_dashboard_overview():
+    """Bütün dashboard view-ları bir payload-da"""
+    return {
+        "success": True,
+        "data": {
+            "stats": get_real_dashboard_stats(),
+            "alerts": get_real_alerts(),
+            "active_chats": get_real_active_chats(),
+            "bot_status": get_real_bot_status(),
+            "recent_interventions": get_real_recent_interventions()
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+
 @router.get("/overview")
-async def get_dashboard_overview():
-    """Bütün dashboard data bir yerdə"""
+async def get_dashboard_overview(request: Request):
+    """Bütün dashboard data bir yerdə (versiya keşi + ETag)"""
+    from ..main import view_cache
+    
     try:
-        return {
-            "success": True,
-            "data": {
-                "stats": get_real_dashboard_stats(),
-                "alerts": get_real_alerts(),
-                "active_chats": get_real_active_chats(),
-                "bot_status": get_real_bot_status(),
-                "recent_interventions": get_real_recent_interventions()
-            },
-            "timestamp": datetime.now().isoformat()
-        }
+        return view_cache.respond(request, "dashboard_overview", build_dashboard_overview)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
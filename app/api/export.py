@@ -0,0 +1,125 @@
+# brain/app/api/export.py
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Optional
+import asyncio
+import csv
+import io
+import json
+import logging
+import zlib
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+logger = logging.getLogger(__name__)
+
+# Bir DB sorğusunda oxunan sətir sayı - yaddaş bu ölçü ilə məhdudlaşır
+EXPORT_CHUNK_SIZE = 2000
+
+CSV_COLUMNS = ("id", "user_id", "username", "message", "timestamp", "is_bot", "is_admin",
+               "risk_score", "risk_reasons", "source")
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+
+def _row_values(row) -> tuple:
+    msg_id, user_id, username, text, ts, risk, is_bot, is_admin, reasons, source = row
+    return (msg_id, str(user_id), username or "", text or "",
+            datetime.fromtimestamp(float(ts or 0)).isoformat(), bool(is_bot), bool(is_admin),
+            risk or 0, reasons or "", source)
+
+
+def _format_csv(rows: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(_row_values(row) for row in rows)
+    return buffer.getvalue()
+
+
+def _format_ndjson(rows: list) -> str:
+    lines = []
+    for row in rows:
+        record = dict(zip(CSV_COLUMNS, _row_values(row)))
+        record["risk_reasons"] = record["risk_reasons"].split("|") if record["risk_reasons"] else []
+        lines.append(json.dumps(record, ensure_ascii=False))
+    lines.append("")
+    return "\n".join(lines)
+
+
+FORMATTERS = {"csv": _format_csv, "ndjson": _format_ndjson}
+
+
+async def _stream(fmt: str, compress: bool, filters: dict):
+    """Hissə-hissə oxu, formatla, (lazım olsa) sıx və göndər.
+
+    Oxuma, formatlama və sıxma thread-də gedir - event loop bloklanmır.
+    Növbəti hissə yalnız client əvvəlkini qəbul edəndən sonra oxunur,
+    ona görə yaddaşda eyni anda ən çox bir hissə olur.
+    """
+    from ..main import message_db
+
+    formatter = FORMATTERS[fmt]
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor is not None else data
+
+    def next_chunk(conn, after_id: int):
+        rows = message_db.read_chunk(conn, after_id, EXPORT_CHUNK_SIZE, **filters)
+        if not rows:
+            return None, b""
+        return rows[-1][0], encode(formatter(rows))
+
+    conn = await asyncio.to_thread(message_db.open_reader)
+    exported = 0
+    try:
+        if fmt == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(CSV_COLUMNS)
+            yield encode(buffer.getvalue())
+
+        after_id = 0
+        while True:
+            last_id, data = await asyncio.to_thread(next_chunk, conn, after_id)
+            if last_id is None:
+                break
+            after_id = last_id
+            exported += 1
+            if data:
+                yield data
+
+        if compressor is not None:
+            yield compressor.flush()
+    finally:
+        conn.close()
+        logger.info(f"📤 Export bitdi: {fmt}{'.gz' if compress else ''}, {exported} hissə")
+
+
+@router.get("/messages")
+async def export_messages(format: str = "csv", gzip: bool = False, user_id: Optional[str] = None,
+                          since: Optional[datetime] = None, until: Optional[datetime] = None,
+                          min_risk: Optional[int] = Query(None, ge=0, le=100)):
+    """Mesaj tarixçəsini CSV / NDJSON axını kimi ixrac et (sabit yaddaş)"""
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Naməlum format: {format} ({', '.join(FORMATS)})")
+
+    filters = {
+        "user_id": user_id,
+        "since": since.timestamp() if since else None,
+        "until": until.timestamp() if until else None,
+        "min_risk": min_risk
+    }
+    media_type, extension = FORMATS[format]
+    filename = f"messages_{datetime.now():%Y%m%d_%H%M%S}.{extension}"
+    if gzip:
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        _stream(format, gzip, filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
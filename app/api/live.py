@@ -0,0 +1,185 @@
+# brain/app/api/live.py
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from datetime import datetime
+import json
+import os
+
+from ..models.chat import MessageRecord
+from ..services.fanout import COALESCE, ConnectionManager, TopicHub
+from .alerts import alert_index
+
+router = APIRouter(tags=["live"])
+
+manager = ConnectionManager(
+    max_queue=int(os.getenv("WS_SEND_QUEUE", "256")),
+    policy=os.getenv("WS_SLOW_POLICY", COALESCE)
+)
+hub = TopicHub(manager)
+
+CHATS_TOPIC = "chats"
+ALERTS_TOPIC = "alerts"
+USER_TOPIC_PREFIX = "user:"
+
+ACTIVE_WINDOW = 3600
+
+
+ESCALATION_TYPES = ("level_up", "streak", "surge")
+
+
+# ===== SNAPSHOTS =====
+def _chats_snapshot(topic: str):
+    from ..main import build_active_chats
+    return build_active_chats()["chats"]
+
+
+def _alerts_snapshot(topic: str):
+    from .dashboard import get_real_alerts
+    return get_real_alerts()
+
+
+def _user_snapshot(topic: str):
+    from ..main import build_full_chat
+    return build_full_chat(topic[len(USER_TOPIC_PREFIX):])
+
+
+hub.register_snapshot(CHATS_TOPIC, _chats_snapshot)
+hub.register_snapshot(ALERTS_TOPIC, _alerts_snapshot)
+hub.register_snapshot(USER_TOPIC_PREFIX, _user_snapshot)
+
+
+# ===== DELTAS =====
+def _risk_change(event: dict) -> dict:
+    return {
+        "user_id": event["user_id"],
+        "risk_score": event["risk_score"],
+        "level": event["level"],
+        "previous_level": event["previous_level"]
+    }
+
+
+def _escalation(event: dict, username: str) -> dict:
+    return {**event, "username": username, "timestamp": datetime.fromtimestamp(event["ts"]).isoformat()}
+
+
+def publish_message_events(record: MessageRecord, previous: MessageRecord = None, escalations=()):
+    """Yeni mesajdan sonra topic-lərə delta-ları göndər.
+
+    `previous` - həmin user-ın bu mesajdan əvvəlki son mesajı,
+    `escalations` - risk_tracker.update() hadisələri.
+    """
+    from ..main import build_chat_row, build_chat_stats, format_chat_message
+
+    user_id = record.user_id
+
+    # Tək user-ın söhbəti
+    hub.publish(USER_TOPIC_PREFIX + user_id, "message_appended", {
+        "message": record.to_dict(),
+        "view": format_chat_message(record),
+        "stats": build_chat_stats(user_id)
+    })
+
+    # Aktiv söhbətlər siyahısı
+    is_new = previous is None or previous.ts <= record.ts - ACTIVE_WINDOW
+    hub.publish(CHATS_TOPIC, "chat_added" if is_new else "chat_updated", build_chat_row(user_id),
+                key=("chat", user_id))
+
+    # Risk vəziyyəti: səviyyə dəyişikliyi və eskalasiyalar
+    for event in escalations:
+        if "previous_level" in event:
+            change = _risk_change(event)
+            hub.publish(CHATS_TOPIC, "risk_changed", change, key=("risk_changed", user_id))
+            hub.publish(USER_TOPIC_PREFIX + user_id, "risk_changed", change, key=("risk_changed", user_id))
+        if event["type"] in ESCALATION_TYPES:
+            escalation = _escalation(event, record.username)
+            hub.publish(ALERTS_TOPIC, "escalation", escalation)
+            hub.publish(USER_TOPIC_PREFIX + user_id, "escalation", escalation)
+
+    # Alert-lər: user-ın açıq alert-i ya bu mesajla yarandı, ya da yeniləndi
+    if not record.is_bot and record.risk_score > alert_index.threshold:
+        alert = alert_index.open_alert(user_id)
+        hub.publish(ALERTS_TOPIC, "alert" if alert.num == record.id else "alert_updated", alert.to_dict(),
+                    key=("alert", alert.id))
+
+
+def publish_batch_events(batch: dict, escalations=()):
+    """Bulk ingest-dən sonra hər topic-ə BİR delta.
+
+    `batch` - {user_id: (previous, [records...])}; `previous` - partiyadan
+    əvvəlki son mesaj. User başına görünüş və statistika bir dəfə qurulur.
+    `escalations` - partiyadakı risk_tracker hadisələri (sıra ilə).
+    """
+    from ..main import build_chat_row, build_chat_stats, format_chat_message
+
+    rows = []
+    risk_changes = [_risk_change(event) for event in escalations if "previous_level" in event]
+    escalated = [
+        _escalation(event, batch[event["user_id"]][1][-1].username)
+        for event in escalations if event["type"] in ESCALATION_TYPES
+    ]
+    alerts = []
+    updated_alerts = []
+    for user_id, (_, records) in batch.items():
+        # Tək user-ın söhbəti - izləyən yoxdursa data qurulmur
+        hub.publish(USER_TOPIC_PREFIX + user_id, "messages_appended", lambda: {
+            "messages": [record.to_dict() for record in records],
+            "views": [format_chat_message(record) for record in records],
+            "stats": build_chat_stats(user_id)
+        })
+
+        rows.append(build_chat_row(user_id))
+
+        # Partiyada riskli mesaj varsa user-ın açıq alert-i (yeni və ya yenilənmiş)
+        if any(not record.is_bot and record.risk_score > alert_index.threshold for record in records):
+            alert = alert_index.open_alert(user_id)
+            (alerts if alert.num >= records[0].id else updated_alerts).append(alert.to_dict())
+
+    hub.publish(CHATS_TOPIC, "chats_updated", {"chats": rows, "risk_changes": risk_changes})
+    if alerts:
+        hub.publish(ALERTS_TOPIC, "alerts", alerts)
+    if updated_alerts:
+        hub.publish(ALERTS_TOPIC, "alerts_updated", updated_alerts)
+    if escalated:
+        hub.publish(ALERTS_TOPIC, "escalations", escalated)
+
+
+# ===== WEBSOCKET =====
+def _handle_client_message(websocket: WebSocket, message: dict):
+    msg_type = message.get("type")
+
+    if msg_type == "ping":
+        manager.send(websocket, {
+            "type": "pong",
+            "timestamp": datetime.now().isoformat()
+        })
+
+    elif msg_type == "subscribe":
+        # Köhnə forma: {"type": "subscribe", "user_id": ...}
+        topic = message.get("topic") or (
+            USER_TOPIC_PREFIX + str(message["user_id"]) if message.get("user_id") else None
+        )
+        if topic:
+            hub.subscribe(websocket, topic, message.get("since"), message.get("epoch"))
+
+    elif msg_type == "unsubscribe":
+        topic = message.get("topic")
+        if topic:
+            hub.unsubscribe(websocket, topic)
+        else:
+            hub.unsubscribe(websocket, prefix=USER_TOPIC_PREFIX)
+
+
+@router.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    await manager.connect(websocket)
+    try:
+        while True:
+            data = await websocket.receive_text()
+            try:
+                _handle_client_message(websocket, json.loads(data))
+            except:
+                pass
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        hub.drop(websocket)
+        manager.disconnect(websocket)
@@ -1,19 +1,38 @@
 # brain/app/main.py
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel
-from datetime import datetime, timedelta
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import List, Optional
+from datetime import datetime
+import asyncio
 import json
 import os
+import time
 import logging
 
+from .api import alerts, analytics, dashboard, export, live
+from .api.alerts import alert_index
+from .api.live import manager, publish_batch_events, publish_message_events
+from .ai import llm_client
+from .models.chat import MessageRecord
+from .services.fast_json import GZIP_LEVEL, GZIP_MIN_SIZE, FastJSONResponse
+from .services.message_db import MessageDB
+from .services.message_store import MessageStore
+from .services.risk_engine import NO_RISK, risk_engine
+from .services.risk_state import NO_EVENTS, RiskTracker
+from .services.rollups import Rollups, np
+from .services.rolling_stats import RollingStats
+from .services.view_cache import ViewCache
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Telegram AI Monitor")
+# Dict cavablar orjson ilə serialize olunur (bax services/fast_json.py)
+app = FastAPI(title="Telegram AI Monitor", default_response_class=FastJSONResponse)
 
 # CORS
 app.add_middleware(
@@ -24,6 +43,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Böyük JSON cavablar (overview, aktiv söhbətlər) gzip ilə; kiçiklər olduğu kimi
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
+# Dashboard API və canlı WebSocket
+app.include_router(dashboard.router)
+app.include_router(alerts.router)
+app.include_router(analytics.router)
+app.include_router(export.router)
+app.include_router(live.router)
+
 # Cari qovluğu tap
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
@@ -75,49 +104,65 @@ async def health_check():
     }
 
 # ================== DATA STORAGE ==================
-chat_messages = []
-active_users = {}
+message_store = MessageStore()
+rolling_stats = RollingStats()
+risk_tracker = RiskTracker()
+view_cache = ViewCache()
+message_db = MessageDB(os.getenv("MESSAGES_DB_PATH", os.path.join(project_root, "bot_messages.db")))
+# Analitika zaman sıraları (numpy yoxdursa söndürülür)
+rollups = Rollups(os.getenv("ROLLUPS_PATH", os.path.join(project_root, "data", "rollups.npz"))) if np is not None else None
+ROLLUP_SAVE_INTERVAL = float(os.getenv("ROLLUP_SAVE_INTERVAL", "60"))
+rollup_task = None
+intervention_mode = {}
+bot_stopped = {}
 
-# ================== WEBSOCKET ==================
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections = []
-    
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"📡 Yeni WebSocket: {len(self.active_connections)}")
-    
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-    
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except:
-                self.disconnect(connection)
+# Startup-da DB-dən yaddaşa yüklənən "isti" pəncərə
+REHYDRATE_WINDOW = 24 * 3600
+REHYDRATE_TIME_BUDGET = 5.0
 
-manager = ConnectionManager()
+def track_risk(record: MessageRecord) -> tuple:
+    """User-ın risk vəziyyətini yenilə (yalnız müştəri mesajları)"""
+    if record.is_bot or record.is_admin:
+        return NO_EVENTS
+    return risk_tracker.update(record.user_id, record.risk_score, record.ts)
 
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
-    try:
-        while True:
-            data = await websocket.receive_text()
-            try:
-                message = json.loads(data)
-                if message.get("type") == "ping":
-                    await websocket.send_json({
-                        "type": "pong",
-                        "timestamp": datetime.now().isoformat()
-                    })
-            except:
-                pass
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
+def ingest_record(record: MessageRecord, persist: bool = True) -> tuple:
+    """Mesajı yaddaş indekslərinə əlavə et və DB növbəsinə at; eskalasiyaları qaytar"""
+    message_store.add(record)
+    rolling_stats.add(record.user_id, record.ts)
+    if rollups is not None:
+        rollups.add(record)
+    alert_index.observe(record)
+    escalations = track_risk(record)
+    view_cache.bump()
+    if persist:
+        message_db.enqueue(record)
+    return escalations
+
+def ingest_batch(records: list) -> tuple:
+    """Partiyanı bir keçiddə əlavə et: ({user_id: (previous, [records])}, eskalasiyalar).
+    
+    Keş versiyası partiyaya bir dəfə artırılır; `previous` - user-ın
+    partiyadan əvvəlki son mesajı (delta-lar üçün).
+    """
+    by_user = {}
+    escalations = []
+    for record in records:
+        entry = by_user.get(record.user_id)
+        if entry is None:
+            stats = message_store.user_stats(record.user_id)
+            entry = by_user[record.user_id] = (stats.last if stats else None, [])
+        message_store.add(record)
+        rolling_stats.add(record.user_id, record.ts)
+        if rollups is not None:
+            rollups.add(record)
+        alert_index.observe(record)
+        escalations.extend(track_risk(record))
+        message_db.enqueue(record)
+        entry[1].append(record)
+    if records:
+        view_cache.bump()
+    return by_user, escalations
 
 # ================== API ENDPOINTS ==================
 class TelegramMessage(BaseModel):
@@ -127,136 +172,312 @@ class TelegramMessage(BaseModel):
     is_bot: bool = False
     is_admin: bool = False
     risk_score: int = 0
+    ts: Optional[float] = None  # bot-da yaranma vaxtı (outbox gecikmə ilə göndərir)
+    source: Optional[str] = None  # bot cavabının mənbəyi: memory / deepseek
+
+def to_record(message: TelegramMessage, now: float, risk) -> MessageRecord:
+    """Gələn mesaj -> MessageRecord; risk_engine qiyməti göndərilənlə birləşir (max)"""
+    return MessageRecord(
+        user_id=message.user_id,
+        username=message.username,
+        message=message.message,
+        ts=min(message.ts, now) if message.ts else now,
+        risk_score=max(message.risk_score, risk.score),
+        risk_reasons=risk.reasons,
+        is_bot=message.is_bot,
+        is_admin=message.is_admin,
+        source=message.source
+    )
 
 @app.post("/api/telegram/message")
 async def receive_telegram_message(message: TelegramMessage):
     """Telegram botundan mesaj qəbul et"""
     try:
-        message_data = {
-            "user_id": message.user_id,
-            "username": message.username,
-            "message": message.message,
-            "is_bot": message.is_bot,
-            "is_admin": message.is_admin,
-            "risk_score": message.risk_score,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        chat_messages.append(message_data)
+        now = time.time()
+        record = to_record(message, now, NO_RISK if message.is_bot else risk_engine.score(message.message))
         
-        # Aktiv user-ları yenilə
-        active_users[message.user_id] = {
-            "username": message.username,
-            "last_message": message.message[:100],
-            "last_time": datetime.now().isoformat(),
-            "risk_score": message.risk_score
-        }
+        # İndekslər, sayğaclar və DB növbəsi (aktiv user-lar da store-dan gəlir)
+        previous_stats = message_store.user_stats(record.user_id)
+        previous = previous_stats.last if previous_stats else None
+        escalations = ingest_record(record)
         
         logger.info(f"📨 Telegram: {message.username} -> {message.message[:50]}...")
         
-        # WebSocket bildiriş
-        await manager.broadcast({
+        # WebSocket bildiriş - yalnız növbəyə atılır, socket-lər gözlənmir
+        publish_message_events(record, previous, escalations)
+        manager.publish({
             "type": "new_message",
-            "data": message_data
-        })
+            "data": record.to_dict()
+        }, legacy_only=True)
         
         return JSONResponse({
             "success": True,
             "message": "Mesaj qəbul edildi",
-            "risk_score": message.risk_score
+            "risk_score": record.risk_score,
+            "risk_reasons": list(record.risk_reasons)
         })
         
     except Exception as e:
         logger.error(f"Mesaj xətası: {e}")
         return JSONResponse({"success": False, "error": str(e)})
 
-@app.get("/api/chats/active")
-async def get_active_chats():
-    """Aktiv söhbətləri gətir"""
+# Bulk ingest: partiya ölçüsü (validasiya, ingest və broadcast bu ölçüdə)
+BULK_CHUNK_SIZE = 1000
+_message_list = TypeAdapter(List[TelegramMessage])
+
+def _validate_chunk(items: list, indexes, rejected: list) -> list:
+    """Partiyanı bir dəfəyə validasiya et; səhvlər olsa yalnız onları at.
+    
+    `indexes` - hər elementin body-dəki sıra nömrəsi (rejected üçün).
+    """
     try:
-        # Son 1 saat ərzində aktiv olan söhbətlər
-        one_hour_ago = datetime.now() - timedelta(hours=1)
-        
-        active_list = []
-        for user_id, user_data in active_users.items():
-            last_time = datetime.fromisoformat(user_data["last_time"])
-            if last_time > one_hour_ago:
-                active_list.append({
-                    "user_id": user_id,
-                    "username": user_data["username"],
-                    "last_message": user_data["last_message"],
-                    "last_time": user_data["last_time"],
-                    "risk_score": user_data["risk_score"],
-                    "message_count": len([m for m in chat_messages if m["user_id"] == user_id])
-                })
-        
-        # Son aktivliyə görə sırala
-        active_list.sort(key=lambda x: x["last_time"], reverse=True)
+        return _message_list.validate_python(items)
+    except ValidationError as e:
+        bad = {error["loc"][0] for error in e.errors() if error["loc"]}
+        for i in sorted(bad):
+            rejected.append({"index": indexes[i], "error": "validation"})
+        return _message_list.validate_python([item for i, item in enumerate(items) if i not in bad])
+
+def _ingest_chunk(messages: list, now: float) -> int:
+    # Risk partiya ilə hesablanır (bot cavabları qiymətləndirilmir)
+    risks = iter(risk_engine.score_many([message.message for message in messages if not message.is_bot]))
+    records = [
+        to_record(message, now, NO_RISK if message.is_bot else next(risks))
+        for message in messages
+    ]
+    batch, escalations = ingest_batch(records)
+    if records:
+        # Hər topic-ə və köhnə client-lərə partiya başına BİR mesaj
+        publish_batch_events(batch, escalations)
+        manager.publish({
+            "type": "new_messages",
+            "data": [record.to_dict() for record in records]
+        }, legacy_only=True)
+    return len(records)
+
+async def _ndjson_chunks(request: Request, rejected: list):
+    """NDJSON body-ni axınla oxu, BULK_CHUNK_SIZE-lıq partiyalar qaytar"""
+    buffer = b""
+    items = []
+    indexes = []
+    index = 0
+
+    def parse(line: bytes):
+        nonlocal index
+        if line.strip():
+            try:
+                items.append(json.loads(line))
+                indexes.append(index)
+            except ValueError:
+                rejected.append({"index": index, "error": "json"})
+            index += 1
+
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            parse(line)
+            if len(items) >= BULK_CHUNK_SIZE:
+                yield items, indexes
+                items, indexes = [], []
+    parse(buffer)
+    if items:
+        yield items, indexes
+
+@app.post("/api/telegram/messages/bulk")
+async def receive_telegram_messages_bulk(request: Request):
+    """Çoxlu mesaj qəbul et: JSON massiv və ya NDJSON axını.
+    
+    NDJSON üçün Content-Type: application/x-ndjson. Etibarsız sətirlər
+    atılır və `rejected`-də index ilə qaytarılır, qalanlar qəbul olunur.
+    """
+    accepted = 0
+    rejected = []
+    try:
+        now = time.time()
+        if "ndjson" in request.headers.get("content-type", ""):
+            async for items, indexes in _ndjson_chunks(request, rejected):
+                accepted += _ingest_chunk(_validate_chunk(items, indexes, rejected), now)
+        else:
+            items = json.loads(await request.body())
+            if not isinstance(items, list):
+                return JSONResponse({"success": False, "error": "JSON massiv gözlənilir"}, status_code=422)
+            for start in range(0, len(items), BULK_CHUNK_SIZE):
+                chunk = items[start:start + BULK_CHUNK_SIZE]
+                chunk = _validate_chunk(chunk, range(start, start + len(chunk)), rejected)
+                accepted += _ingest_chunk(chunk, now)
         
-        return {
+        logger.info(f"📨 Telegram bulk: {accepted} mesaj, {len(rejected)} rədd")
+        return JSONResponse({
             "success": True,
-            "chats": active_list,
-            "count": len(active_list),
-            "timestamp": datetime.now().isoformat()
-        }
+            "accepted": accepted,
+            "rejected": rejected
+        })
         
+    except ValueError as e:
+        return JSONResponse({"success": False, "error": str(e)}, status_code=422)
+    except Exception as e:
+        logger.error(f"Bulk mesaj xətası: {e}")
+        return JSONResponse({"success": False, "error": str(e), "accepted": accepted}, status_code=500)
+
+def build_chat_row(user_id: str) -> dict:
+    """Aktiv söhbətlər siyahısında bir sətir"""
+    user_stats = message_store.user_stats(user_id)
+    last = user_stats.last
+    risk = risk_tracker.get(user_id)
+    return {
+        "user_id": user_id,
+        "username": last.username,
+        "last_message": last.message[:100],
+        "last_time": last.timestamp,
+        "risk_score": risk["risk_score"],
+        "risk_level": risk["level"],
+        "message_count": user_stats.total
+    }
+
+def build_active_chats():
+    """Son 1 saat ərzində aktiv olan söhbətlər (artıq son aktivliyə görə sıralı)"""
+    one_hour_ago = time.time() - 3600
+    
+    active_list = [
+        build_chat_row(user_id)
+        for user_id, _ in message_store.recent_users(one_hour_ago)
+    ]
+    
+    return {
+        "success": True,
+        "chats": active_list,
+        "count": len(active_list),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/api/chats/active")
+async def get_active_chats(request: Request):
+    """Aktiv söhbətləri gətir (versiya keşi + ETag)"""
+    try:
+        return view_cache.respond(request, "chats_active", build_active_chats)
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+def format_chat_message(msg: MessageRecord) -> dict:
+    """Chat pəncərəsi üçün mesaj görünüşü (mesaj dəyişmir - bir dəfə qurulub keşlənir)"""
+    view = msg.view
+    if view is not None:
+        return view
+    
+    sender_name = msg.username
+    
+    if msg.is_bot:
+        sender_name = "🤖 Bot"
+    elif msg.is_admin:
+        sender_name = "👨‍💼 Admin"
+    
+    view = msg.view = {
+        "id": msg.id,
+        "sender": sender_name,
+        "text": msg.message,
+        "time": datetime.fromtimestamp(msg.ts).strftime("%H:%M"),
+        "is_bot": msg.is_bot,
+        "is_admin": msg.is_admin,
+        "risk_score": msg.risk_score
+    }
+    return view
+
+RISK_LEVEL_LABELS = {"danger": "YÜKSƏK", "warning": "ORTA", "normal": "AŞAĞI"}
+
+def build_chat_stats(user_id: str) -> dict:
+    user_stats = message_store.user_stats(user_id)
+    # Səviyyə bütün tarixçənin max-ından yox, cari (sönən) risk vəziyyətindən
+    risk = risk_tracker.get(user_id)
+    return {
+        "total": user_stats.total,
+        "max_risk": user_stats.max_risk,
+        "risk_score": risk["risk_score"],
+        "risk_level": RISK_LEVEL_LABELS[risk["level"]],
+        "risk_trend": risk["velocity"],
+        "risk_streak": risk["streak"],
+        "last_activity": "indi"
+    }
+
+CHAT_PAGE_SIZE = 50
+
+def build_full_chat(user_id: str) -> dict:
+    """User-ın son 50 mesajı və statistikası - birbaşa indeksdən.
+    
+    Köhnə mesajlar `before` cursor-u ilə /api/chats/{user_id}/messages-dən
+    səhifə-səhifə gəlir; səhifə doludursa `has_more` (DB-də ola bilər).
+    """
+    user_stats = message_store.user_stats(user_id)
+    
+    if not user_stats:
+        return {
+            "success": False,
+            "error": "Bu user üçün mesaj tapılmadı"
+        }
+    
+    records = message_store.user_page(user_id, CHAT_PAGE_SIZE)
+    return {
+        "success": True,
+        "username": user_stats.username,
+        "user_id": user_id,
+        "messages": [format_chat_message(msg) for msg in records],
+        "has_more": len(records) == CHAT_PAGE_SIZE,
+        "before": records[0].id if records else None,
+        "stats": build_chat_stats(user_id)
+    }
+
 @app.get("/api/chats/{user_id}/full")
 async def get_full_chat(user_id: str):
     """User-ın tam chat tarixçəsini gətir"""
     try:
-        # User-ın mesajlarını tap
-        user_messages = [
-            msg for msg in chat_messages 
-            if msg["user_id"] == user_id
-        ]
-        
-        if not user_messages:
-            return {
-                "success": False,
-                "error": "Bu user üçün mesaj tapılmadı"
-            }
-        
-        formatted_messages = []
-        for msg in user_messages[-50:]:
-            sender_type = "user"
-            sender_name = msg["username"]
-            
-            if msg.get("is_bot"):
-                sender_type = "bot"
-                sender_name = "🤖 Bot"
-            elif msg.get("is_admin"):
-                sender_type = "admin"
-                sender_name = "👨‍💼 Admin"
-            
-            formatted_messages.append({
-                "sender": sender_name,
-                "text": msg["message"],
-                "time": datetime.fromisoformat(msg["timestamp"]).strftime("%H:%M"),
-                "is_bot": msg.get("is_bot", False),
-                "is_admin": msg.get("is_admin", False),
-                "risk_score": msg.get("risk_score", 0)
-            })
-        
-        # Statistikalar
-        risk_scores = [m.get("risk_score", 0) for m in user_messages]
-        max_risk = max(risk_scores) if risk_scores else 0
+        return FastJSONResponse(build_full_chat(user_id))
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+async def load_chat_page(user_id: str, limit: int, before: int = None, after: int = None) -> tuple:
+    """Tarixçə səhifəsi: ([records], has_more) - köhnədən yeniyə.
+    
+    Yaddaşdakı buffer user-ın son mesajlarını saxlayır; cursor ondan
+    köhnəyə düşəndə çatışmayan hissə DB-dən (user_id, id) keyset ilə
+    oxunur. `limit + 1` götürülür - artıq sətir `has_more` deməkdir.
+    """
+    oldest = message_store.oldest_id(user_id)
+    
+    if after is not None:
+        records = []
+        # Cursor yaddaşdakı buffer-dən köhnədirsə aradakı boşluq DB-dədir
+        if oldest is None or after < oldest:
+            records = await asyncio.to_thread(message_db.read_user_page, user_id, limit + 1, oldest, after)
+        if len(records) <= limit:
+            records += message_store.user_page(user_id, limit + 1 - len(records), after=after)
+        return records[:limit], len(records) > limit
+    
+    records = message_store.user_page(user_id, limit + 1, before=before)
+    if len(records) <= limit:
+        anchor = records[0].id if records else oldest
+        if anchor is None or (before is not None and before < anchor):
+            anchor = before
+        older = await asyncio.to_thread(message_db.read_user_page, user_id, limit + 1 - len(records), anchor)
+        records = older + records
+    return records[-limit:], len(records) > limit
+
+@app.get("/api/chats/{user_id}/messages")
+async def get_chat_messages(user_id: str, before: Optional[int] = None, after: Optional[int] = None,
+                            limit: int = Query(CHAT_PAGE_SIZE, ge=1, le=200)):
+    """Söhbət tarixçəsi səhifələri (cursor: `before` - köhnələr, `after` - yenilər)"""
+    try:
+        if before is not None and after is not None:
+            return {"success": False, "error": "before və after birlikdə verilə bilməz"}
         
-        return {
+        records, has_more = await load_chat_page(user_id, limit, before, after)
+        return FastJSONResponse({
             "success": True,
-            "username": user_messages[0]["username"],
             "user_id": user_id,
-            "messages": formatted_messages,
-            "stats": {
-                "total": len(user_messages),
-                "max_risk": max_risk,
-                "risk_level": "YÜKSƏK" if max_risk > 80 else "ORTA" if max_risk > 60 else "AŞAĞI",
-                "last_activity": "indi"
-            }
-        }
-        
+            "messages": [format_chat_message(msg) for msg in records],
+            "has_more": has_more,
+            "before": records[0].id if records else before,
+            "after": records[-1].id if records else after
+        })
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -280,15 +501,54 @@ async def create_demo_message():
     demo_msg = TelegramMessage(
         user_id=f"demo_{random.randint(1000, 9999)}",
         username=user,
-        message=message,
-        risk_score=random.randint(20, 90)
+        message=message
     )
     
     return await receive_telegram_message(demo_msg)
 
 # ================== STARTUP ==================
+async def save_rollups():
+    """Rollup-ları diskə yaz: surət event loop-da, fayl yazısı thread-də"""
+    try:
+        await asyncio.to_thread(rollups.save, rollups.snapshot())
+    except Exception as e:
+        logger.warning(f"⚠️ Rollup-lar saxlanmadı: {e}")
+
+async def persist_rollups():
+    while True:
+        await asyncio.sleep(ROLLUP_SAVE_INTERVAL)
+        await save_rollups()
+
 @app.on_event("startup")
 async def startup_event():
+    global rollup_task
+    
+    # DB-ni aç və son pəncərəni yaddaşa yüklə
+    await message_db.start()
+    await llm_client.startup()
+    if rollups is not None:
+        # Persist olunmuş rollup-lar əvvəl yüklənir - rehydrate yalnız yeni mesajları sayır
+        if await asyncio.to_thread(rollups.load):
+            logger.info(f"📊 Rollup-lar yükləndi (son mesaj #{rollups.last_id})")
+        rollup_task = asyncio.create_task(persist_rollups())
+    started = time.monotonic()
+    records = await asyncio.to_thread(
+        message_db.load_recent,
+        time.time() - REHYDRATE_WINDOW,
+        message_store.max_messages,
+        REHYDRATE_TIME_BUDGET
+    )
+    for record in records:
+        ingest_record(record, persist=False)
+    # DB persist olunmuş rollup-lardan geri qala bilər (fayl silinib, yazı itib) -
+    # yeni id-lər hər ikisindən sonra başlamalıdır, yoxsa rollup onları "sayılmış" hesab edir
+    last_id = await asyncio.to_thread(message_db.max_id)
+    if rollups is not None and rollups.last_id > last_id:
+        logger.warning(f"⚠️ DB rollup-lardan geridədir (#{last_id} < #{rollups.last_id})")
+        last_id = rollups.last_id
+    message_store.reserve_ids(last_id)
+    logger.info(f"🗄️ DB-dən {len(records)} mesaj yükləndi ({time.monotonic() - started:.2f}s)")
+    
     logger.info("=" * 60)
     logger.info("🚀 TELEGRAM AI MONITOR SERVER")
     logger.info("=" * 60)
@@ -298,6 +558,18 @@ async def startup_event():
     logger.info("🤖 Telegram Bot: READY")
     logger.info("=" * 60)
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    global rollup_task
+    
+    await llm_client.shutdown()
+    if rollup_task is not None:
+        rollup_task.cancel()
+        rollup_task = None
+        await save_rollups()
+    await message_db.stop()
+    logger.info(f"🗄️ Mesaj DB bağlandı: {message_db.written} mesaj yazıldı")
+
 # ================== SERVER RUN ==================
 if __name__ == "__main__":
     import uvicorn
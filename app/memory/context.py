@@ -0,0 +1,217 @@
+# brain/app/memory/context.py
+import asyncio
+import logging
+import math
+import re
+import time
+
+from app.memory.memory import MEMORY_FILE
+from app.memory.normalize import normalize_text
+from app.memory.storage import get_store
+
+logger = logging.getLogger(__name__)
+
+_TOKENS = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+SUMMARY_PREFIX = "Əvvəlki söhbətin xülasəsi: "
+
+# Replikalar öyrənilmiş cavablardan ayrı faylda saxlanılır -
+# hər söhbət mesajı memory.json-un kompaksiyasını tetikləməsin
+CONVERSATIONS_FILE = MEMORY_FILE.with_name("conversations.json")
+conversation_store = get_store(CONVERSATIONS_FILE, compact_every=2000)
+
+# Əvvəlki söhbətə istinad edən sözlər (normalize_text formasında)
+FOLLOW_UP_WORDS = frozenset((
+    "bu", "o", "onu", "onun", "ona", "onda", "ondan", "bunu", "bunun", "buna", "bunda", "bundan",
+    "onlar", "onlari", "bunlar", "bunlari", "hemin", "ele", "yene",
+    "это", "этот", "эта", "эти", "этого", "он", "она", "оно", "они", "его", "ее", "их", "тот", "того",
+))
+# Yalnız cümlənin əvvəlində davam bildirən sözlər ("Bəs çatdırılma?")
+FOLLOW_UP_OPENERS = frozenset(("bes", "ve", "amma", "a", "и", "а"))
+
+
+def count_tokens(text: str) -> int:
+    """Token sayının lokal (yuxarıdan) təxmini.
+
+    Hər durğu işarəsi bir token, hər söz ~4 simvola bir token -
+    Azərbaycan dilində BPE tokenizer-lər sözləri adətən 2-3 hissəyə bölür.
+    """
+    if not text:
+        return 0
+    return sum(max(1, math.ceil(len(part) / 4)) for part in _TOKENS.findall(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Mətni təxminən `max_tokens`-ə qədər kəs (söz sərhədində)"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    words = []
+    used = 0
+    for word in text.split():
+        cost = count_tokens(word)
+        if used + cost > max_tokens:
+            break
+        words.append(word)
+        used += cost
+    return " ".join(words) + "…"
+
+
+def is_follow_up(question: str) -> bool:
+    """Sual əvvəlki söhbətsiz başa düşülmürmü (əvəzlik və ya davam sözü)"""
+    words = normalize_text(question).split()
+    if not words:
+        return False
+    return words[0] in FOLLOW_UP_OPENERS or any(word in FOLLOW_UP_WORDS for word in words)
+
+
+def local_summary(previous: str, turns: list) -> str:
+    """LLM olmadan xülasə: əvvəlki xülasə + müştərinin sualları"""
+    questions = "; ".join(turn["content"] for turn in turns if turn["role"] == "user")
+    return f"{previous} Müştəri soruşdu: {questions}".strip()
+
+
+class ConversationContext:
+    """Hər user üçün söhbət tarixçəsi və token büdcəli prompt.
+
+    Ayrıca conversations.json store-unda saxlanılır:
+    users[uid]["turns"]   - hələ xülasəyə daxil olmamış replikalar
+    users[uid]["summary"] - köhnə replikaların rolling xülasəsi
+
+    Store məhduddur: user başına ən çox `max_turns` replika (xülasə
+    gecikəndə köhnələr atılır), `retention` müddətində yazmayan
+    user-lar açılışda silinir.
+
+    Prompt həmişə `budget` token-dən kiçikdir: system + xülasə + sığan son
+    replikalar + sual. Sığmayan replikalar olanda xülasə köhnəlmiş sayılır
+    və arxa fonda (user başına bir task) yenilənir - cavab gözləmir.
+    Xülasə yalnız bu halda yenidən qurulur, qalan vaxt keşdən götürülür.
+    """
+
+    def __init__(self, summarize=None, budget: int = 1500, summary_tokens: int = 200,
+                 max_turns: int = 40, retention: float = 7 * 24 * 3600, store=None):
+        self.summarize = summarize    # async (previous, turns) -> str
+        self.budget = budget
+        self.summary_tokens = summary_tokens
+        self.max_turns = max_turns
+        self.retention = retention
+        self.store = store if store is not None else conversation_store
+        self._refreshing = {}          # user_id -> task
+        self._data = None
+
+    def _user(self, user_id: str) -> dict:
+        if self._data is None:
+            # Fayl ilk istifadədə yüklənir, köhnə söhbətlər atılır
+            self._data = self.store.load({"users": {}})
+            self._prune(time.time() - self.retention)
+        return self._data.setdefault("users", {}).setdefault(user_id, {})
+
+    def _prune(self, cutoff: float):
+        users = self._data.get("users", {})
+        kept = {}
+        for user_id, user in users.items():
+            turns = user.get("turns") or []
+            last = max(turns[-1]["ts"] if turns else 0, user.get("summary", {}).get("updated", 0))
+            if last > cutoff:
+                kept[user_id] = user
+        if len(kept) < len(users):
+            self.store.set(["users"], kept)
+            logger.info(f"🧹 {len(users) - len(kept)} köhnə söhbət silindi")
+
+    def turns(self, user_id: str) -> list:
+        return self._user(user_id).get("turns", [])
+
+    def summary(self, user_id: str) -> str:
+        return self._user(user_id).get("summary", {}).get("text", "")
+
+    # ===== TARİXÇƏ =====
+    def add_turn(self, user_id: str, role: str, content: str):
+        """Replikanı yaz ("user" / "assistant")"""
+        turns = self._user(user_id).get("turns", [])
+        self.store.append(["users", user_id, "turns"], {
+            "role": role,
+            "content": content,
+            "tokens": count_tokens(content),
+            "ts": time.time()
+        })
+        # Xülasə işləmirsə (LLM xətası) siyahı sonsuz böyüməsin - yarım pəncərə ehtiyatla kəs
+        if len(turns) > self.max_turns + self.max_turns // 2:
+            self.store.set(["users", user_id, "turns"], turns[-self.max_turns:])
+
+    def reset(self, user_id: str):
+        self._user(user_id)
+        task = self._refreshing.pop(user_id, None)
+        if task is not None:
+            task.cancel()
+        self.store.set(["users", user_id, "turns"], [])
+        self.store.set(["users", user_id, "summary"], {})
+
+    # ===== PROMPT =====
+    def _history_budget(self, system_prompt: str, question: str) -> int:
+        return (self.budget - count_tokens(system_prompt) - count_tokens(question)
+                - count_tokens(SUMMARY_PREFIX) - self.summary_tokens)
+
+    def build_messages(self, user_id: str, system_prompt: str, question: str) -> list:
+        """Büdcəyə sığan chat messages: system, xülasə, son replikalar, sual"""
+        messages = [{"role": "system", "content": system_prompt}]
+        summary = self.summary(user_id)
+        if summary:
+            messages.append({"role": "system", "content": SUMMARY_PREFIX + summary})
+
+        turns = self.turns(user_id)
+        remaining = self._history_budget(system_prompt, question)
+        recent = []
+        for turn in reversed(turns):
+            if turn["tokens"] > remaining:
+                break
+            remaining -= turn["tokens"]
+            recent.append({"role": turn["role"], "content": turn["content"]})
+        recent.reverse()
+
+        if len(recent) < len(turns):
+            self.refresh_summary(user_id, self._history_budget(system_prompt, ""))
+
+        messages.extend(recent)
+        messages.append({"role": "user", "content": question})
+        return messages
+
+    # ===== XÜLASƏ =====
+    def refresh_summary(self, user_id: str, keep_tokens: int):
+        """Sığmayan köhnə replikaları arxa fonda xülasəyə qat"""
+        task = self._refreshing.get(user_id)
+        if task is not None and not task.done():
+            return
+        self._refreshing[user_id] = asyncio.ensure_future(self._refresh(user_id, keep_tokens))
+
+    async def _refresh(self, user_id: str, keep_tokens: int):
+        turns = self.turns(user_id)
+        # Sondan büdcənin yarısı qalır (xülasə hər mesajda yenilənməsin), qalanı xülasəyə gedir
+        kept = 0
+        cut = len(turns)
+        while cut > 0 and kept + turns[cut - 1]["tokens"] <= keep_tokens // 2:
+            cut -= 1
+            kept += turns[cut]["tokens"]
+        if cut == 0:
+            return
+        old_turns = turns[:cut]
+        previous = self.summary(user_id)
+
+        text = None
+        if self.summarize is not None:
+            try:
+                text = await self.summarize(previous, old_turns)
+            except Exception as e:
+                logger.warning(f"⚠️ Xülasə LLM ilə alınmadı: {e}")
+        if not text:
+            text = local_summary(previous, old_turns)
+        text = truncate_tokens(text, self.summary_tokens)
+
+        # Xülasə gözlənilən müddətdə yeni replikalar gəlmiş, add_turn siyahını
+        # kəsmiş ola bilər - mövqe ilə yox, son xülasə olunan replikanın ts-i ilə kəsilir
+        last_ts = old_turns[-1]["ts"]
+        self.store.set(["users", user_id, "summary"], {
+            "text": text,
+            "turns": self._user(user_id).get("summary", {}).get("turns", 0) + cut,
+            "updated": time.time()
+        })
+        self.store.set(["users", user_id, "turns"], [turn for turn in self.turns(user_id) if turn["ts"] > last_ts])
+        logger.info(f"🧾 {user_id} söhbəti xülasə olundu ({cut} replika)")
@@ -1,18 +1,21 @@
-import json
 from pathlib import Path
 from datetime import datetime
 
+from app.memory.storage import get_store
+
 BASE_DIR = Path(__file__).resolve().parents[2]  # brain/
 MEMORY_FILE = BASE_DIR / "data" / "memory.json"
 MEMORY_FILE.parent.mkdir(parents=True, exist_ok=True)
 
+# Yazılar journal-a əlavə olunur, fayl periodik kompaksiya olunur
+store = get_store(MEMORY_FILE)
+
 def load_memory():
-    if not MEMORY_FILE.exists():
-        return {"users": {}}
-    return json.loads(MEMORY_FILE.read_text(encoding="utf-8"))
+    return store.load({"users": {}})
 
 def save_memory(data):
-    MEMORY_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    load_memory()
+    store.reset(data)
 
 def get_answer_from_memory(user_id: str, question: str):
     data = load_memory()
@@ -25,27 +28,9 @@ def get_answer_from_memory(user_id: str, question: str):
     return None
 
 def learn_new_answer(user_id: str, question: str, answer: str):
-    data = load_memory()
-    users = data.setdefault("users", {})
-    user = users.setdefault(user_id, {})
-
-    # Əgər "learned" yoxdursa, əlavə et
-    user.setdefault("learned", [])
-
-    user["learned"].append({
-        "question": question,
-        "answer": answer,
-        "learned_at": datetime.utcnow().isoformat()
-    })
-
-    save_memory(data)
-
-    data = load_memory()
-    users = data.setdefault("users", {})
-    user = users.setdefault(user_id, {"learned": []})
-    user["learned"].append({
+    load_memory()
+    store.append(["users", user_id, "learned"], {
         "question": question,
         "answer": answer,
         "learned_at": datetime.utcnow().isoformat()
     })
-    save_memory(data)
@@ -0,0 +1,33 @@
+# brain/app/memory/normalize.py
+import re
+import unicodedata
+
+# Azərbaycan / türk / rus hərf variantları -> əsas forma
+_LETTER_MAP = str.maketrans({
+    "ə": "e",
+    "ı": "i",
+    "ё": "е",
+})
+
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """Yaddaş açarı üçün mətni normallaşdır.
+
+    Böyük/kiçik hərf, durğu işarələri, artıq boşluqlar və hərf variantları
+    (ə/e, ı/i, ş/s, ç/c, ö/o, ü/u, ğ/g, ё/е) fərq yaratmır:
+    "Məhsulun qiyməti nədir?" == "mehsulun  qiymeti nedir"
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text)
+    # Türk "İ"/"I" lower()-da səhv çevrilir
+    text = text.replace("İ", "i").replace("I", "ı").lower()
+    text = text.translate(_LETTER_MAP)
+    # Diakritikləri at (ş -> s, ç -> c, ö -> o ...)
+    text = "".join(
+        ch for ch in unicodedata.normalize("NFD", text)
+        if not unicodedata.combining(ch)
+    )
+    return " ".join(_NON_WORD.sub(" ", text).split())
@@ -0,0 +1,176 @@
+# brain/app/memory/similarity.py
+import re
+
+from app.memory.normalize import normalize_text
+
+try:
+    import numpy as np
+except ImportError:  # numpy yoxdursa semantik axtarış söndürülür
+    np = None
+
+_NUMBERS = re.compile(r"\d+")
+
+# n-qram hash-ı üçün sabitlər (uint64 daşması mod 2^64 sayılır)
+if np is not None:
+    _PRIME = np.uint64(1_000_003)
+    _MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _numbers(text: str) -> set:
+    return set(_NUMBERS.findall(text))
+
+
+class SemanticIndex:
+    """Yaxın-dublikat sual axtarışı (offline, xarici model olmadan).
+
+    Mətn simvol n-qramlarına bölünür, n-qramlar hash ilə sabit ölçülü
+    vektora yığılır (hashing trick) və L2 normallaşdırılır. Hash-lar
+    NumPy ilə toplu hesablanır - tək sorğu da eyni yoldan keçir. Bütün
+    vektorlar bir bitişik NumPy matrisində saxlanılır; top-k cosine
+    axtarışı bir matris-vektor hasilidir.
+
+    Yaddaş: hər entry `dim * 4` bayt (float32; float16 matris-vektor
+    hasili NumPy-da BLAS-sız və ~15x yavaşdır). dim=256 ilə 100k entry
+    ~100 MB, 200k ~200 MB. Başlanğıc yükləmə `add_many` ilə dəqiq ölçüdə
+    ayrılır, sonrakı əlavələr tutumu 1.5x artırır. `max_entries`-dən
+    sonra yeni pattern-lər semantik indeksə düşmür (exact indeks işləyir).
+    """
+
+    def __init__(self, dim: int = 256, ngram_sizes=(3, 4), threshold: float = 0.65,
+                 initial_capacity: int = 1024, max_entries: int = 200_000):
+        if np is None:
+            raise RuntimeError("SemanticIndex üçün numpy lazımdır")
+        self.dim = dim
+        self.ngram_sizes = ngram_sizes
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._matrix = np.zeros((min(initial_capacity, max_entries), dim), dtype=np.float32)
+        self.items = []   # matrisin sətirləri ilə eyni sırada
+        self.keys = []    # orijinal pattern-lər
+        self.skipped = 0  # limitə görə indekslənməyənlər
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def nbytes(self) -> int:
+        return self._matrix.nbytes
+
+    def _hash_ngrams(self, keys: list):
+        """Normallaşdırılmış mətnlərin n-qramları: (sətir, sütun, işarə) massivləri.
+
+        Mətnlər bir codepoint massivinə birləşdirilir, n-qram hash-ları
+        (polinomial + qarışdırma, mod 2^64) NumPy ilə bir dəfəyə hesablanır;
+        mətn sərhədini keçən n-qramlar atılır.
+        """
+        padded = [f" {key} " if key else "" for key in keys]
+        lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+        codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        ends = np.cumsum(lengths)
+        owner = np.repeat(np.arange(len(padded)), lengths)
+
+        rows, columns, signs = [], [], []
+        for n in self.ngram_sizes:
+            count = len(codes) - n + 1
+            if count <= 0:
+                continue
+            h = np.zeros(count, dtype=np.uint64)
+            for k in range(n):
+                h = h * _PRIME + codes[k:k + count]
+            h ^= h >> np.uint64(29)
+            h *= _MIX
+            h ^= h >> np.uint64(32)
+            valid = np.arange(count) + n <= ends[owner[:count]]
+            h = h[valid]
+            rows.append(owner[:count][valid])
+            columns.append((h % np.uint64(self.dim)).astype(np.int64))
+            signs.append(np.where(h >> np.uint64(63), 1.0, -1.0))
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+        return np.concatenate(rows), np.concatenate(columns), np.concatenate(signs)
+
+    def _vectorize_many(self, keys: list, out, chunk: int = 8192):
+        """Normallaşdırılmış mətnləri birbaşa `out` sətirlərinə vektorlaşdır"""
+        for start in range(0, len(keys), chunk):
+            block = keys[start:start + chunk]
+            rows, columns, signs = self._hash_ngrams(block)
+            vectors = np.bincount(rows * self.dim + columns, weights=signs,
+                                  minlength=len(block) * self.dim).reshape(len(block), self.dim)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            out[start:start + len(block)] = vectors / norms
+
+    def vectorize(self, text: str):
+        """Mətni L2-normallaşdırılmış hashed n-qram vektoruna çevir"""
+        vector = np.zeros((1, self.dim), dtype=np.float32)
+        self._vectorize_many([normalize_text(text)], vector)
+        return vector[0]
+
+    def add(self, pattern: str, item: dict):
+        """Yeni pattern-i indeksə əlavə et - O(dim)"""
+        size = len(self.items)
+        if size >= self.max_entries:
+            self.skipped += 1
+            return
+        if size == self._matrix.shape[0]:
+            self._reserve(min(max(size * 3 // 2, size + 1), self.max_entries))
+        self._matrix[size] = self.vectorize(pattern)
+        self.items.append(item)
+        self.keys.append(pattern)
+
+    def add_many(self, entries, keys: list = None):
+        """(pattern, item) cütlərini bir dəfəyə əlavə et - yükləmə üçün.
+
+        Matris bir dəfə lazımi ölçüyə genişlənir, vektorlar toplu hesablanır.
+        `keys` - pattern-lərin artıq hesablanmış `normalize_text` nəticələri.
+        """
+        entries = list(entries)
+        if keys is None:
+            keys = [normalize_text(pattern) for pattern, _ in entries]
+        size = len(self.items)
+        room = max(self.max_entries - size, 0)
+        if len(entries) > room:
+            self.skipped += len(entries) - room
+            entries = entries[:room]
+            keys = keys[:room]
+        if not entries:
+            return
+        if size + len(entries) > self._matrix.shape[0]:
+            self._reserve(size + len(entries))
+        self._vectorize_many(keys, self._matrix[size:size + len(entries)])
+        self.keys.extend(pattern for pattern, _ in entries)
+        self.items.extend(item for _, item in entries)
+
+    def _reserve(self, capacity: int):
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        size = len(self.items)
+        grown[:size] = self._matrix[:size]
+        self._matrix = grown
+
+    def search(self, text: str, top_k: int = 3) -> list:
+        """Ən oxşar `top_k` nəticə: [(score, pattern, item), ...]"""
+        size = len(self.items)
+        if not size:
+            return []
+        query = self.vectorize(text)
+        scores = self._matrix[:size] @ query
+
+        k = min(top_k, size)
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(float(scores[i]), self.keys[i], self.items[i]) for i in top]
+
+    def best(self, text: str, top_k: int = 3):
+        """`threshold`-dan yüksək ən yaxşı nəticə: (score, pattern, item) və ya None.
+
+        Rəqəmlər (sifariş/məhsul nömrəsi) üst-üstə düşməlidir - "Məhsul 3"
+        sualına "Məhsul 1"-in cavabı verilmir.
+        """
+        query_numbers = _numbers(text)
+        for score, pattern, item in self.search(text, top_k):
+            if score < self.threshold:
+                break
+            if _numbers(pattern) == query_numbers:
+                return score, pattern, item
+        return None
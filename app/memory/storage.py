@@ -0,0 +1,316 @@
+# brain/app/memory/storage.py
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Köhnə format: seq əsas faylın içində saxlanılırdı (yükləmədə oxunub atılır)
+SEQ_KEY = "_journal_seq"
+
+
+class JournalStore:
+    """memory.json üçün append-only journal + periodik kompaksiya.
+
+    - yeni entry yaddaşdakı data-ya dərhal tətbiq olunur, sonra JSONL
+      journal-a arxa fon thread-i ilə yazılır (yazı qiyməti O(entry))
+    - journal `compact_every` entry-yə çatanda əsas fayl temp fayla
+      yazılıb atomik `os.replace` ilə əvəz olunur, journal sıfırlanır
+    - açılışda əsas fayl oxunur, journal-dakı əməliyyatlar təkrar
+      tətbiq olunur (crash recovery); yarımçıq son sətir atılır
+
+    Hər əməliyyatın artan `seq` nömrəsi var; əsas fayla daxil olan son
+    nömrə yanındakı `.seq.json` faylında əsas faylın digest-i ilə saxlanılır
+    (əsas fayl bilik bazası olaraq təmiz qalır). Seq faylı əsas fayldan
+    əvvəl yazılır: arada crash olsa digest uyğun gəlmir və əvvəlki seq
+    götürülür. Replay zamanı bu nömrədən kiçik olanlar buraxılır.
+
+    Kompaksiya lock altında yalnız struktur surəti götürür, serialize
+    lock-dan kənarda olur; journal-dan yalnız snapshot seq-inə qədər olan
+    entry-lər silinir. `close()` yalnız dəyişiklik olubsa kompaksiya edir.
+    """
+
+    def __init__(self, path, compact_every: int = 500):
+        self.path = Path(path)
+        self.journal_path = self.path.with_name(self.path.stem + ".journal.jsonl")
+        self.seq_path = self.path.with_name(self.path.stem + ".seq.json")
+        self.compact_every = compact_every
+        self.data = None
+
+        self._lock = threading.Lock()      # data + seq
+        self._io_lock = threading.Lock()   # journal / əsas fayl
+        self._queue = queue.Queue()
+        self._seq = 0
+        self._base_seq = 0                 # əsas fayla daxil olan son seq
+        self._journal_entries = 0
+        self._journal = None
+        self._thread = None
+
+    # ===== YÜKLƏMƏ =====
+    def load(self, default: dict) -> dict:
+        """Əsas faylı oxu, journal-ı tətbiq et; çatışmayan açarları `default`-dan götür"""
+        with self._lock:
+            if self.data is None:
+                raw = self._read_raw()
+                self.data = self._parse(raw) if raw is not None else {}
+                self._seq = self._base_seq = self._read_seq(raw, self.data.pop(SEQ_KEY, 0))
+                replayed = self._replay()
+                if replayed:
+                    logger.info(f"♻️ Journal-dan {replayed} əməliyyat bərpa olundu")
+
+            missing = False
+            for key, value in default.items():
+                if key not in self.data:
+                    self.data[key] = value
+                    missing = True
+            if missing:
+                self._seq += 1
+
+        if missing or not self.path.exists():
+            self.compact()
+        self._start()
+        return self.data
+
+    def _read_raw(self):
+        return self.path.read_bytes() if self.path.exists() else None
+
+    def _parse(self, raw: bytes) -> dict:
+        # BOM ilə yazılmış köhnə faylları da oxu
+        for encoding in ("utf-8-sig", "utf-16"):
+            try:
+                return json.loads(raw.decode(encoding))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+        raise ValueError(f"{self.path} oxuna bilmədi")
+
+    def _read_seq(self, raw, fallback: int) -> int:
+        """Əsas fayla daxil olan son seq (seq faylı yoxdursa `fallback`)"""
+        if raw is None or not self.seq_path.exists():
+            return fallback
+        try:
+            meta = json.loads(self.seq_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return fallback
+        if meta.get("digest") == _digest(raw):
+            return meta["seq"]
+        # Kompaksiya əsas fayl əvəzlənməzdən əvvəl kəsilib
+        return meta.get("previous", fallback)
+
+    def _replay(self) -> int:
+        if not self.journal_path.exists():
+            return 0
+        replayed = 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("⚠️ Journal-ın yarımçıq sətri atıldı")
+                    break
+                if entry["seq"] <= self._seq:
+                    continue
+                self._apply(entry)
+                self._seq = entry["seq"]
+                replayed += 1
+        self._journal_entries = replayed
+        return replayed
+
+    # ===== ƏMƏLİYYATLAR =====
+    def append(self, path: list, item):
+        """`path` üzrə siyahıya `item` əlavə et (məs. ["users", uid, "learned"])"""
+        with self._lock:
+            self._seq += 1
+            entry = {"seq": self._seq, "op": "append", "path": path, "item": item}
+            self._apply(entry)
+            # Sətir indi serialize olunur - sonrakı dəyişikliklər ayrıca entry-dir
+            line = json.dumps(entry, ensure_ascii=False) + "\n"
+        self._queue.put(line)
+
+    def set(self, path: list, value):
+        """`path` üzrə dəyəri əvəz et (məs. ["users", uid, "summary"])"""
+        with self._lock:
+            self._seq += 1
+            entry = {"seq": self._seq, "op": "set", "path": path, "item": value}
+            self._apply(entry)
+            # Sətir indi serialize olunur - sonrakı dəyişikliklər ayrıca entry-dir
+            line = json.dumps(entry, ensure_ascii=False) + "\n"
+        self._queue.put(line)
+
+    def reset(self, data: dict):
+        """Bütün data-nı əvəz et və dərhal kompaksiya et"""
+        with self._lock:
+            self.data.clear()
+            self.data.update(data)
+            self._seq += 1
+        self.compact()
+
+    def _apply(self, entry: dict):
+        *parents, leaf = entry["path"]
+        node = self.data
+        for key in parents:
+            node = node.setdefault(key, {})
+        if entry["op"] == "append":
+            node.setdefault(leaf, []).append(entry["item"])
+        elif entry["op"] == "set":
+            node[leaf] = entry["item"]
+
+    # ===== YAZMA =====
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="memory-journal", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            line = self._queue.get()
+            if line is None:
+                break
+            batch = [line]
+            while True:
+                try:
+                    line = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    self._write(batch)
+                    return
+                batch.append(line)
+            self._write(batch)
+
+    def _write(self, batch):
+        try:
+            with self._io_lock:
+                if self._journal is None:
+                    self._journal = open(self.journal_path, "a", encoding="utf-8")
+                self._journal.write("".join(batch))
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+                self._journal_entries += len(batch)
+        except Exception as e:
+            logger.error(f"❌ Journal yazma xətası: {e}")
+            return
+
+        if self._journal_entries >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Əsas faylı atomik yenidən yaz, journal-dan daxil olan entry-ləri sil"""
+        with self._lock:
+            snapshot = _snapshot(self.data)
+            seq = self._seq
+        # Serialize lock-dan kənarda - append/set gözləmir
+        payload = json.dumps(snapshot, ensure_ascii=False, indent=2).encode("utf-8")
+        meta = {"seq": seq, "digest": _digest(payload)}
+
+        with self._io_lock:
+            if seq <= self._base_seq and self.path.exists():
+                return  # paralel kompaksiya daha yeni snapshot-u artıq yazıb
+            meta["previous"] = self._base_seq
+            _write_atomic(self.seq_path, json.dumps(meta).encode("utf-8"))
+            _write_atomic(self.path, payload)
+            self._base_seq = seq
+            self._journal_entries = self._trim_journal(seq)
+        logger.info(f"💾 Memory kompaksiya olundu (seq {seq})")
+
+    def _trim_journal(self, seq: int) -> int:
+        """Journal-dan seq <= `seq` entry-ləri at (onlar artıq əsas fayldadır).
+
+        Snapshot-dan sonra yazılmış entry-lər saxlanılır. `_io_lock` altında
+        çağırılır; qalan entry sayını qaytarır.
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if not self.journal_path.exists():
+            return 0
+
+        kept = []
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry_seq = json.loads(line)["seq"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    break  # yarımçıq son sətir
+                if entry_seq > seq:
+                    kept.append(line)
+
+        tmp_path = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("".join(kept))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        return len(kept)
+
+    def close(self):
+        """Növbəni boşalt; dəyişiklik olubsa son kompaksiyanı et"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self.data is not None and self._seq > self._base_seq:
+            try:
+                self.compact()
+            except OSError as e:
+                # Məs. müvəqqəti qovluq artıq silinib - çıxışda xəta atılmır
+                logger.warning(f"⚠️ Son kompaksiya alınmadı ({self.path}): {e}")
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+def _digest(payload: bytes) -> str:
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _write_atomic(path: Path, payload: bytes):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _snapshot(node):
+    """Kompaksiya üçün ucuz surət.
+
+    Əməliyyatlar yalnız dict-lər üzrə gedir və siyahıların sonuna əlavə edir
+    (və ya dəyəri tam əvəz edir), element-lər yerində dəyişmir. Ona görə
+    dict-lər rekursiv, siyahılar dayaz kopyalanır.
+    """
+    if isinstance(node, dict):
+        return {key: _snapshot(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return list(node)
+    return node
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path, **kwargs) -> JournalStore:
+    """Eyni fayl üçün prosesdə tək JournalStore (bot və memory.py paylaşır)"""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = JournalStore(path, **kwargs)
+            atexit.register(store.close)
+        return store
+
+
+def release_store(path):
+    """Store-u bağla və reyestrdən çıxar (müvəqqəti qovluq silinməzdən əvvəl)"""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        store = _stores.pop(key, None)
+    if store is not None:
+        atexit.unregister(store.close)
+        store.close()
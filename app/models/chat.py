@@ -0,0 +1,67 @@
+# brain/app/models/chat.py
+from datetime import datetime
+import sys
+
+
+def intern_str(value: str) -> str:
+    """Təkrarlanan string-ləri (user_id, username) bir nüsxədə saxla"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class MessageRecord:
+    """Yaddaşda saxlanan kompakt mesaj.
+
+    Dict əvəzinə `__slots__` istifadə olunur, vaxt epoch float kimi
+    saxlanılır, user_id və username intern edilir.
+    """
+
+    __slots__ = ("id", "user_id", "username", "message", "ts",
+                 "risk_score", "risk_reasons", "is_bot", "is_admin", "source", "view")
+
+    def __init__(self, user_id: str, username: str, message: str, ts: float,
+                 risk_score: int = 0, is_bot: bool = False, is_admin: bool = False,
+                 id: int = 0, risk_reasons: tuple = (), source: str = None):
+        self.id = id
+        self.user_id = intern_str(user_id)
+        self.username = intern_str(username)
+        self.message = message
+        self.ts = ts
+        self.risk_score = int(risk_score)
+        self.risk_reasons = risk_reasons  # risk_engine səbəbləri (ortaq string-lər)
+        self.is_bot = bool(is_bot)
+        self.is_admin = bool(is_admin)
+        self.source = intern_str(source)  # bot cavabının mənbəyi: memory / deepseek
+        self.view = None  # chat pəncərəsi görünüşü (ilk formatlamada keşlənir)
+
+    @property
+    def timestamp(self) -> str:
+        """ISO formatında vaxt (API cavabları üçün)"""
+        return datetime.fromtimestamp(self.ts).isoformat()
+
+    def to_dict(self) -> dict:
+        """API / WebSocket üçün dict forması"""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "username": self.username,
+            "message": self.message,
+            "is_bot": self.is_bot,
+            "is_admin": self.is_admin,
+            "source": self.source,
+            "risk_score": self.risk_score,
+            "risk_reasons": list(self.risk_reasons),
+            "timestamp": self.timestamp
+        }
+
+
+class UserStats:
+    """User üzrə inkremental statistikalar"""
+
+    __slots__ = ("username", "total", "max_risk", "last", "lag")
+
+    def __init__(self, username: str):
+        self.username = intern_str(username)
+        self.total = 0
+        self.max_risk = 0
+        self.last = None  # ən son (ts-ə görə) MessageRecord
+        self.lag = 0.0  # gecikmiş mesajların maksimum geriliyi (saniyə)
@@ -0,0 +1,216 @@
+# brain/app/services/alert_index.py
+import base64
+import heapq
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from ..models.chat import MessageRecord
+
+# Alert statusları
+UNREAD = "unread"
+READ = "read"
+ACKNOWLEDGED = "acknowledged"
+
+
+class Alert:
+    """User üzrə birləşdirilmiş alert (bir açıq alert - bir user)"""
+
+    __slots__ = ("id", "num", "user_id", "username", "risk_score", "message", "reasons",
+                 "count", "first_ts", "last_ts", "status", "acked_at", "version")
+
+    def __init__(self, record: MessageRecord):
+        self.num = record.id
+        self.id = f"alert_{record.id}"   # ilk mesajın id-si - dəyişmir
+        self.user_id = record.user_id
+        self.username = record.username
+        self.risk_score = record.risk_score
+        self.message = record.message[:150]
+        self.reasons = record.risk_reasons
+        self.count = 1
+        self.first_ts = record.ts
+        self.last_ts = record.ts
+        self.status = UNREAD
+        self.acked_at = None
+        self.version = 0
+
+    @property
+    def key(self) -> tuple:
+        """Heap açarı: yüksək risk, sonra daha yeni, sonra id"""
+        return (-self.risk_score, -self.last_ts, -self.num)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "username": self.username,
+            "risk_score": self.risk_score,
+            "level": "high" if self.risk_score > 80 else "medium",
+            "message": self.message,
+            "risk_reasons": list(self.reasons),
+            "count": self.count,
+            "status": self.status,
+            "timestamp": datetime.fromtimestamp(self.last_ts).isoformat(),
+            "first_timestamp": datetime.fromtimestamp(self.first_ts).isoformat(),
+            "acknowledged_at": datetime.fromtimestamp(self.acked_at).isoformat() if self.acked_at else None
+        }
+
+
+def encode_cursor(key: tuple) -> str:
+    risk, ts, num = key
+    return base64.urlsafe_b64encode(f"{risk}:{ts!r}:{num}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Cursor -> heap açarı; səhv cursor ValueError verir"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        risk, ts, num = raw.split(":")
+        return (int(risk), float(ts), int(num))
+    except Exception as e:
+        raise ValueError(f"Yanlış cursor: {cursor}") from e
+
+
+class AlertIndex:
+    """Risk və yeniliyə görə heap-sıralı alert indeksi.
+
+    - user başına bir açıq alert: yeni riskli mesaj onu yeniləyir (count,
+      max risk, son mesaj, səbəblər), yeni alert yaratmır; acknowledge
+      olunandan sonrakı mesaj yeni alert açır
+    - id ilk mesajın DB id-sidir - sorğular arasında dəyişmir
+    - heap-də köhnəlmiş qeydlər (yenilənmiş/silinmiş alert) tənbəl atılır;
+      yarıdan çoxu köhnəlibsə heap yenidən qurulur
+    - siyahı cursor ilə səhifələnir; qiymət mesaj sayından yox, alert
+      sayından və səhifə ölçüsündən asılıdır
+    """
+
+    def __init__(self, threshold: int = 70, max_alerts: int = 5000, retention: float = 24 * 3600):
+        self.threshold = threshold
+        self.max_alerts = max_alerts
+        self.retention = retention
+        self._alerts = OrderedDict()  # id -> Alert (son yenilənən sonda)
+        self._open = {}               # user_id -> açıq alert
+        self._heap = []               # (key, version, id)
+        self.unread = 0
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def get(self, alert_id: str) -> Alert:
+        return self._alerts.get(alert_id)
+
+    def open_alert(self, user_id: str) -> Alert:
+        return self._open.get(user_id)
+
+    # ===== INGEST =====
+    def observe(self, record: MessageRecord) -> Alert:
+        """Riskli müştəri mesajını indeksə qat; yaranan/yenilənən alert-i qaytar"""
+        if record.is_bot or record.risk_score <= self.threshold:
+            return None
+        alert = self._open.get(record.user_id)
+        if alert is None:
+            alert = Alert(record)
+            self._open[record.user_id] = alert
+            self._alerts[alert.id] = alert
+            self.unread += 1
+        else:
+            if record.risk_score >= alert.risk_score:
+                alert.risk_score = record.risk_score
+                alert.message = record.message[:150]
+            alert.username = record.username
+            alert.reasons = tuple(dict.fromkeys(alert.reasons + record.risk_reasons))
+            alert.count += 1
+            alert.last_ts = max(alert.last_ts, record.ts)
+            alert.version += 1
+            if alert.status == READ:
+                alert.status = UNREAD
+                self.unread += 1
+            self._alerts.move_to_end(alert.id)
+        heapq.heappush(self._heap, (alert.key, alert.version, alert.id))
+        self._evict(record.ts)
+        return alert
+
+    # ===== STATUS =====
+    def mark_read(self, alert_ids=None) -> int:
+        """Alert-ləri oxunmuş et (ids yoxdursa hamısını); dəyişən sayı"""
+        if alert_ids is None:
+            alerts = [alert for alert in self._alerts.values() if alert.status == UNREAD]
+        else:
+            alerts = [self._alerts[i] for i in alert_ids if i in self._alerts]
+        changed = 0
+        for alert in alerts:
+            if alert.status == UNREAD:
+                alert.status = READ
+                self.unread -= 1
+                changed += 1
+        return changed
+
+    def acknowledge(self, alert_id: str) -> Alert:
+        """Alert-i bağla - user-ın növbəti riskli mesajı yeni alert açır"""
+        alert = self._alerts.get(alert_id)
+        if alert is None or alert.status == ACKNOWLEDGED:
+            return alert
+        if alert.status == UNREAD:
+            self.unread -= 1
+        alert.status = ACKNOWLEDGED
+        alert.acked_at = time.time()
+        if self._open.get(alert.user_id) is alert:
+            del self._open[alert.user_id]
+        return alert
+
+    # ===== SİYAHI =====
+    def page(self, limit: int = 20, cursor: str = None, include_acknowledged: bool = False,
+             user_id: str = None) -> tuple:
+        """(alert-lər, növbəti cursor) - ən təcili əvvəl"""
+        self._evict(time.time())
+        after = decode_cursor(cursor) if cursor else None
+
+        # Heap üzərində best-first gəzinti: kökdən başlayıb yalnız lazım olan
+        # qədər qeyd açılır - ilk səhifə O(limit log limit), bütün heap keçilmir
+        heap = self._heap
+        frontier = [(heap[0], 0)] if heap else []
+        found = []
+        while frontier and len(found) <= limit:
+            entry, index = heapq.heappop(frontier)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+            key, version, alert_id = entry
+            alert = self._alerts.get(alert_id)
+            if alert is None or alert.version != version:
+                continue  # köhnəlmiş qeyd
+            if after is not None and key <= after:
+                continue
+            if not include_acknowledged and alert.status == ACKNOWLEDGED:
+                continue
+            if user_id is not None and alert.user_id != user_id:
+                continue
+            found.append((key, alert))
+
+        alerts = [alert for _, alert in found[:limit]]
+        next_cursor = encode_cursor(found[limit - 1][0]) if len(found) > limit else None
+        return alerts, next_cursor
+
+    def top(self, limit: int = 10) -> list:
+        """Ən təcili açıq alert-lər"""
+        return self.page(limit)[0]
+
+    # ===== DAXİLİ =====
+    def _evict(self, now: float):
+        """Köhnə və limitdən artıq alert-ləri at, lazım olsa heap-i sıxlaşdır"""
+        cutoff = now - self.retention
+        while self._alerts:
+            alert = next(iter(self._alerts.values()))
+            if len(self._alerts) <= self.max_alerts and alert.last_ts > cutoff:
+                break
+            self._drop(alert)
+        if len(self._heap) > 2 * len(self._alerts) + 64:
+            self._heap = [(alert.key, alert.version, alert.id) for alert in self._alerts.values()]
+            heapq.heapify(self._heap)
+
+    def _drop(self, alert: Alert):
+        del self._alerts[alert.id]
+        if self._open.get(alert.user_id) is alert:
+            del self._open[alert.user_id]
+        if alert.status == UNREAD:
+            self.unread -= 1
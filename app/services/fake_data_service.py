@@ -2,11 +2,64 @@
 import json
 import random
 from datetime import datetime, timedelta
+from itertools import accumulate
 from typing import List, Dict, Any
 
+# Sintetik trafik üçün lüğət (demo endpoint-in user və mesajları əsasında)
+DEMO_USERNAMES = ["Əli Hüseynov", "Ayşə Quliyeva", "Kamran Əliyev", "Leyla Məmmədova",
+                  "İbrahim Əliyev", "Nigar Həsənova", "Rəşad Məmmədov", "Günay İsmayılova"]
+
+# Risk qarışığı: (pay, mesajlar) - risk_engine-in lüğətinə uyğun mətnlər
+DEMO_MESSAGES = (
+    (0.70, ["Salam, məhsulun qiyməti nə qədərdir?",
+            "Çatdırılma Bakı daxilində pulsuzdur?",
+            "Sifarişi necə verə bilərəm?",
+            "Təşəkkür edirəm, hər şey aydındır"]),
+    (0.20, ["Sifarişim gecikir, nə baş verib?",
+            "Kömək lazımdır, problem var!",
+            "Məhsulun rəngi kataloqdan fərqlidir, dəyişdirmək istəyirəm"]),
+    (0.10, ["Məhsuldan narazıyam, qaytarmaq istəyirəm!",
+            "Pulumu geri qaytarın, rəqiblər daha ucuz satır!!!",
+            "BU NƏ XİDMƏTDİR? Şikayət edəcəyəm!"]),
+)
+
+BOT_REPLIES = ["Salam! Sizə necə kömək edə bilərəm?",
+               "Sifarişiniz yoxlanılır, bir az gözləyin.",
+               "Qiymətlər kataloqda göstərilib."]
+
 class FakeDataService:
     """Dashboard üçün fake data generator"""
     
+    @staticmethod
+    def generate_traffic(count: int, users: int = 1000, zipf_s: float = 1.1, bot_ratio: float = 0.4,
+                         seed: int = None) -> List[Dict[str, Any]]:
+        """Real trafikə bənzər mesajlar (/api/telegram/message formatında).
+        
+        User aktivliyi Zipf paylanmasıdır: k-cı user-ın payı 1/k^s - az
+        sayda user mesajların çoxunu yazır. Mətnlər DEMO_MESSAGES risk
+        qarışığından, `bot_ratio` hissəsi bot cavablarıdır.
+        """
+        rng = random.Random(seed)
+        user_weights = list(accumulate(1 / rank ** zipf_s for rank in range(1, users + 1)))
+        mix_weights = list(accumulate(share for share, _ in DEMO_MESSAGES))
+        texts = [messages for _, messages in DEMO_MESSAGES]
+        
+        picked = rng.choices(range(users), cum_weights=user_weights, k=count)
+        traffic = []
+        for user in picked:
+            is_bot = rng.random() < bot_ratio
+            if is_bot:
+                message = rng.choice(BOT_REPLIES)
+            else:
+                message = rng.choice(rng.choices(texts, cum_weights=mix_weights)[0])
+            traffic.append({
+                "user_id": f"user_{user}",
+                "username": DEMO_USERNAMES[user % len(DEMO_USERNAMES)],
+                "message": message,
+                "is_bot": is_bot
+            })
+        return traffic
+    
     @staticmethod
     def get_dashboard_stats() -> Dict[str, Any]:
         """Stats cards üçün data"""
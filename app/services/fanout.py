@@ -0,0 +1,331 @@
+# brain/app/services/fanout.py
+import asyncio
+import logging
+import time
+from collections import deque
+
+from fastapi import WebSocket
+
+from .fast_json import dumps_str
+
+logger = logging.getLogger(__name__)
+
+# Yavaş client-in növbəsi dolanda nə edilsin
+DROP_OLDEST = "drop_oldest"   # ən köhnə mesajı at
+COALESCE = "coalesce"         # yenisi olan köhnə state mesajını at (açarla), yoxdursa ən köhnəni
+DISCONNECT = "disconnect"     # client-i bağla
+POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+
+class ClientChannel:
+    """Bir WebSocket üçün məhdud göndərmə növbəsi və onu boşaldan task.
+
+    COALESCE ilə atılan topic delta-larının seq-ləri client-ə növbəti
+    həmin topic mesajından əvvəl "coalesced" frame-i ilə bildirilir -
+    client seq boşluğunu itki saymır, resync etmir.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue: int, policy: str, send_timeout: float):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self._queue = deque()  # (key, text, mark); mark = (topic, seq) topic delta-ları üçün
+        self._coalesced = {}   # topic -> əvəzlənib atılmış seq-lər
+        self._ready = asyncio.Event()
+        self.task = None
+        self.topics = set()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+    def offer(self, text: str, key=None, mark: tuple = None) -> bool:
+        """Mesajı növbəyə qoy - heç vaxt gözləmir.
+
+        `key` - eyni state-in versiyaları (COALESCE üçün), `mark` - (topic, seq).
+        """
+        if self.closed:
+            return False
+
+        if len(self._queue) >= self.max_queue:
+            if self.policy == DISCONNECT:
+                self.closed = True
+                self._ready.set()
+                return False
+            if not (self.policy == COALESCE and self._coalesce(key)):
+                self._queue.popleft()
+            self.dropped += 1
+
+        self._queue.append((key, text, mark))
+        self._ready.set()
+        return True
+
+    def _coalesce(self, key) -> bool:
+        """Növbədə (və ya gələn mesajda) yenisi olan ən köhnə açarlı delta-nı at"""
+        newer = {key} if key is not None else set()
+        oldest = None
+        for index in range(len(self._queue) - 1, -1, -1):
+            queued_key = self._queue[index][0]
+            if queued_key is None:
+                continue
+            if queued_key in newer:
+                oldest = index
+            else:
+                newer.add(queued_key)
+        if oldest is None:
+            return False
+        mark = self._queue[oldest][2]
+        del self._queue[oldest]
+        if mark is not None:
+            self._coalesced.setdefault(mark[0], []).append(mark[1])
+        return True
+
+    async def run(self):
+        """Növbəni bu client-ə göndər (hər client öz task-ında)"""
+        while not self.closed:
+            await self._ready.wait()
+            self._ready.clear()
+            while self._queue and not self.closed:
+                _, text, mark = self._queue.popleft()
+                if mark is not None and mark[0] in self._coalesced:
+                    topic = mark[0]
+                    skipped = dumps_str({"type": "coalesced", "topic": topic, "seqs": self._coalesced.pop(topic)})
+                    await asyncio.wait_for(self.websocket.send_text(skipped), self.send_timeout)
+                await asyncio.wait_for(self.websocket.send_text(text), self.send_timeout)
+                self.sent += 1
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+
+class ConnectionManager:
+    """WebSocket fan-out: payload bir dəfə serialize olunur, hər client-in
+    öz növbəsi və göndərmə task-ı var. Ingest heç vaxt socket-ləri gözləmir.
+    """
+
+    def __init__(self, max_queue: int = 256, policy: str = COALESCE, send_timeout: float = 10.0):
+        if policy not in POLICIES:
+            raise ValueError(f"Naməlum policy: {policy}")
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.channels = {}
+
+    @property
+    def active_connections(self) -> list:
+        return list(self.channels)
+
+    async def connect(self, websocket: WebSocket):
+        await websocket.accept()
+        self.attach(websocket)
+        logger.info(f"📡 Yeni WebSocket: {len(self.channels)}")
+
+    def attach(self, websocket: WebSocket) -> ClientChannel:
+        """Qəbul olunmuş socket üçün kanal və göndərmə task-ı yarat"""
+        channel = ClientChannel(websocket, self.max_queue, self.policy, self.send_timeout)
+        channel.task = asyncio.create_task(self._pump(channel))
+        self.channels[websocket] = channel
+        return channel
+
+    def disconnect(self, websocket: WebSocket):
+        channel = self.channels.pop(websocket, None)
+        if channel is not None:
+            channel.closed = True
+            if channel.task is not None and channel.task is not asyncio.current_task():
+                channel.task.cancel()
+
+    async def _pump(self, channel: ClientChannel):
+        try:
+            await channel.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"📡 WebSocket göndərmə dayandı: {type(e).__name__}")
+
+        # Göndərmə xətası, timeout və ya DISCONNECT policy - client-i bağla
+        if channel.dropped:
+            logger.info(f"📡 Yavaş client bağlandı (atılan: {channel.dropped})")
+        self.disconnect(channel.websocket)
+        try:
+            await asyncio.wait_for(channel.websocket.close(), 1.0)
+        except Exception:
+            pass
+
+    def publish(self, message: dict, key: str = None, legacy_only: bool = False) -> int:
+        """Mesajı bütün client-lərin növbəsinə at; serialize bir dəfə.
+
+        `legacy_only` - yalnız heç bir topic-ə abunə olmayan client-lərə.
+        """
+        if not self.channels:
+            return 0
+        text = dumps_str(message)
+        delivered = 0
+        for channel in list(self.channels.values()):
+            if legacy_only and channel.topics:
+                continue
+            if channel.offer(text, key):
+                delivered += 1
+        return delivered
+
+    def send(self, websocket: WebSocket, message: dict, key: str = None) -> bool:
+        """Tək client-ə mesaj (eyni növbə ilə, sıra pozulmur)"""
+        channel = self.channels.get(websocket)
+        if channel is None:
+            return False
+        return channel.offer(dumps_str(message), key)
+
+    async def broadcast(self, message: dict):
+        """Köhnə API ilə uyğunluq - gözləmədən publish edir"""
+        self.publish(message)
+
+
+class TopicHub:
+    """Topic əsaslı abunəlik: hər topic-in öz seq nömrəsi və replay buferi var.
+
+    Client `since` seq göndərib reconnect-dən sonra qaldığı yerdən davam
+    edə bilər; buferdə olmayan boşluq üçün snapshot göndərilir.
+    Topic-lər: "chats", "alerts", "user:<user_id>".
+
+    Seq və replay yalnız abunəçisi olan topic-lər üçün saxlanılır. Son
+    abunəçi çıxandan `idle_ttl` saniyə sonra topic-in state-i silinir
+    (reconnect üçün bu müddətdə bufer qalır). Yenidən yaradılan topic-in
+    seq-i hub-un ümumi sayğacından başlayır - epoch daxilində geri getmir.
+    """
+
+    def __init__(self, manager: ConnectionManager, replay_size: int = 1000, idle_ttl: float = 300.0):
+        self.manager = manager
+        self.replay_size = replay_size
+        self.idle_ttl = idle_ttl
+        self.epoch = int(time.time())  # server restart-ını ayırd etmək üçün
+        self._clock = 0         # verilmiş ən böyük seq (bütün topic-lər üzrə)
+        self._seq = {}
+        self._replay = {}
+        self._subscribers = {}  # topic -> set(websocket)
+        self._idle = {}         # topic -> son abunəçinin çıxdığı an (monotonic)
+        self._next_prune = 0.0
+        self._snapshots = {}    # topic prefix -> builder(topic)
+
+    def register_snapshot(self, prefix: str, builder):
+        """`prefix` ilə başlayan topic-lər üçün snapshot funksiyası"""
+        self._snapshots[prefix] = builder
+
+    def seq(self, topic: str) -> int:
+        return self._seq.get(topic, 0)
+
+    def has_subscribers(self, topic: str) -> bool:
+        return bool(self._subscribers.get(topic))
+
+    @property
+    def topic_count(self) -> int:
+        return len(self._seq)
+
+    def publish(self, topic: str, event_type: str, data, key=None) -> int:
+        """Delta-nı seq ilə topic-ə yaz və abunəçilərə göndər.
+
+        `data` funksiya ola bilər - yalnız topic-i izləyən varsa qurulur.
+        `key` - state tipli delta-lar üçün (məs. ("risk_changed", user_id)):
+        yavaş client-in növbəsində topic daxilində eyni açarlı köhnə delta
+        yenisi ilə əvəzlənir (COALESCE).
+        """
+        if self._idle:
+            self.prune()
+        # İzlənməyən topic (məs. baxılmayan user) üçün state saxlanmır
+        if topic not in self._seq:
+            return 0
+        seq = self._seq[topic] + 1
+        self._seq[topic] = seq
+        self._clock = max(self._clock, seq)
+        if callable(data):
+            data = data()
+
+        text = dumps_str({"type": event_type, "topic": topic, "seq": seq,
+                          "epoch": self.epoch, "data": data})
+        replay = self._replay.get(topic)
+        if replay is None:
+            replay = self._replay[topic] = deque(maxlen=self.replay_size)
+        replay.append((seq, text))
+
+        if key is not None:
+            key = (topic, key)
+        delivered = 0
+        subscribers = self._subscribers.get(topic, set())
+        for websocket in list(subscribers):
+            channel = self.manager.channels.get(websocket)
+            if channel is None:
+                self._discard(topic, websocket)
+            elif channel.offer(text, key, (topic, seq)):
+                delivered += 1
+        return delivered
+
+    def subscribe(self, websocket: WebSocket, topic: str, since: int = None, epoch: int = None):
+        """Abunə et; `since` verilibsə buraxılan delta-ları və ya snapshot göndər"""
+        channel = self.manager.channels.get(websocket)
+        if channel is None:
+            return
+        channel.topics.add(topic)
+        self._subscribers.setdefault(topic, set()).add(websocket)
+        self._idle.pop(topic, None)
+
+        current = self._seq.get(topic)
+        if current is None:
+            current = self._seq[topic] = self._clock
+        if since is not None and epoch == self.epoch and since <= current:
+            replay = self._replay.get(topic, ())
+            oldest = replay[0][0] if replay else current + 1
+            if since + 1 >= oldest or since == current:
+                for seq, text in replay:
+                    if seq > since:
+                        channel.offer(text)
+                return
+
+        channel.offer(dumps_str({
+            "type": "snapshot", "topic": topic, "seq": current,
+            "epoch": self.epoch, "data": self._build_snapshot(topic)
+        }))
+
+    def unsubscribe(self, websocket: WebSocket, topic: str = None, prefix: str = None):
+        """Topic-dən (və ya prefix-ə uyğun bütün topic-lərdən) çıx"""
+        channel = self.manager.channels.get(websocket)
+        topics = channel.topics if channel is not None else set(self._subscribers)
+        for name in [t for t in topics if t == topic or (prefix and t.startswith(prefix))]:
+            self._discard(name, websocket)
+            if channel is not None:
+                channel.topics.discard(name)
+
+    def drop(self, websocket: WebSocket):
+        """Bağlanan client-i bütün topic-lərdən sil"""
+        channel = self.manager.channels.get(websocket)
+        topics = channel.topics if channel is not None else list(self._subscribers)
+        for topic in list(topics):
+            self._discard(topic, websocket)
+
+    def _discard(self, topic: str, websocket: WebSocket):
+        subscribers = self._subscribers.get(topic)
+        if subscribers is None:
+            return
+        subscribers.discard(websocket)
+        if not subscribers:
+            # Reconnect üçün bufer `idle_ttl` müddətində saxlanılır
+            del self._subscribers[topic]
+            self._idle[topic] = time.monotonic()
+
+    def prune(self, now: float = None):
+        """`idle_ttl`-dən çox abunəçisiz qalan topic-lərin seq/replay state-ini sil"""
+        now = time.monotonic() if now is None else now
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.idle_ttl / 10
+        expired = [topic for topic, since in self._idle.items() if now - since >= self.idle_ttl]
+        for topic in expired:
+            del self._idle[topic]
+            self._seq.pop(topic, None)
+            self._replay.pop(topic, None)
+        if expired:
+            logger.info(f"🧹 {len(expired)} boş topic silindi (qalan: {len(self._seq)})")
+
+    def _build_snapshot(self, topic: str):
+        for prefix, builder in self._snapshots.items():
+            if topic.startswith(prefix):
+                return builder(topic)
+        return None
@@ -0,0 +1,53 @@
+# brain/app/services/fast_json.py
+import json
+from datetime import date, datetime
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson yoxdursa stdlib json istifadə olunur
+    orjson = None
+
+# Kiçik cavablar sıxılmır - gzip başlığı və CPU qazancdan baha başa gəlir
+GZIP_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+
+def _default(value):
+    """Hər iki encoder-in birbaşa tanımadığı tiplər"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "tolist"):  # numpy massiv / skalyar
+        return value.tolist()
+    raise TypeError(f"JSON-a çevrilmir: {type(value).__name__}")
+
+
+def dumps(value) -> bytes:
+    """Kompakt UTF-8 JSON baytları (orjson, yoxdursa stdlib)"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def dumps_str(value) -> str:
+    """WebSocket text frame-ləri üçün eyni JSON, str kimi"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """`dumps` ilə render olunan JSON cavab.
+
+    App-in default cavab sinfidir. Endpoint hazır payload-ı birbaşa
+    `FastJSONResponse(...)` kimi qaytaranda FastAPI-nin `jsonable_encoder`
+    keçidi də (bütün dict-in rekursiv surəti) atlanır.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
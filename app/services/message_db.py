@@ -0,0 +1,275 @@
+# brain/app/services/message_db.py
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ..models.chat import MessageRecord, intern_str
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id INTEGER,
+    user_id INTEGER,
+    username TEXT,
+    message_text TEXT,
+    message_date TIMESTAMP,
+    is_bot INTEGER DEFAULT 0
+)
+"""
+
+# Köhnə cədvəldə olmayan sütunlar
+EXTRA_COLUMNS = {
+    "is_admin": "INTEGER DEFAULT 0",
+    "risk_score": "INTEGER DEFAULT 0",
+    "risk_reasons": "TEXT",
+    "source": "TEXT",
+}
+
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_messages_user_date ON messages (user_id, message_date)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_date ON messages (message_date)",
+    # Söhbət tarixçəsi səhifələri (user_id, id) üzrə keyset ilə oxunur
+    "CREATE INDEX IF NOT EXISTS idx_messages_user_id ON messages (user_id, id)",
+)
+
+INSERT_SQL = """
+INSERT OR REPLACE INTO messages
+    (id, chat_id, user_id, username, message_text, message_date, is_bot, is_admin, risk_score, risk_reasons,
+     source)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_COLUMNS = ("id, user_id, username, message_text, message_date, risk_score, is_bot, is_admin, "
+                  "risk_reasons, source")
+
+# risk_reasons bir sütunda "|" ilə birləşdirilir
+REASON_SEPARATOR = "|"
+
+# Növbədə yazıcıya "qalanları yaz və dayan" siqnalı
+_STOP = None
+
+
+def row_to_record(row) -> MessageRecord:
+    """DB sətrini MessageRecord-a çevir"""
+    msg_id, user_id, username, text, ts, risk, is_bot, is_admin, reasons, source = row
+    return MessageRecord(
+        user_id=str(user_id),
+        username=username or "",
+        message=text or "",
+        ts=float(ts or 0),
+        risk_score=risk or 0,
+        is_bot=is_bot,
+        is_admin=is_admin,
+        id=msg_id,
+        risk_reasons=tuple(map(intern_str, reasons.split(REASON_SEPARATOR))) if reasons else (),
+        source=source
+    )
+
+
+class MessageDB:
+    """bot_messages.db üzərində davamlı mesaj saxlama.
+
+    Ingest yalnız növbəyə yazır; arxa fon task-ı mesajları qruplaşdırıb
+    bir `executemany` tranzaksiyası ilə thread-də yazır. WAL +
+    synchronous=NORMAL olduğu üçün hər mesaj üçün fsync edilmir.
+    """
+
+    def __init__(self, path, batch_size: int = 500, max_queue: int = 100_000):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._conn = None
+        self._reader = None
+        self._reader_lock = threading.Lock()
+        self._task = None
+        self.written = 0
+        self.dropped = 0
+
+    # ===== LIFECYCLE =====
+    def open(self):
+        """Bağlantını aç, WAL rejimini və sxemi hazırla"""
+        if self._conn is not None:
+            return
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(SCHEMA)
+
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(messages)")}
+        for column, definition in EXTRA_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE messages ADD COLUMN {column} {definition}")
+        for statement in INDEXES:
+            conn.execute(statement)
+        conn.commit()
+        self._conn = conn
+        logger.info(f"🗄️ Mesaj DB açıldı: {self.path}")
+
+    async def start(self):
+        """DB-ni aç və yazıcı task-ı başlat"""
+        await asyncio.to_thread(self.open)
+        if self._task is None:
+            self._task = asyncio.create_task(self._writer())
+
+    async def stop(self):
+        """Növbədə qalanları yaz və bağlantını bağla.
+
+        Task cancel olunmur: `to_thread`-dəki `_write_batch` cancel ilə
+        dayanmır və `close()` ilə yarışardı. Növbəyə `_STOP` qoyulur,
+        yazıcı ondan əvvəlkiləri yazıb özü çıxır.
+        """
+        if self._task is not None:
+            await self._queue.put(_STOP)
+            try:
+                await self._task
+            finally:
+                self._task = None
+
+        remaining = []
+        while not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is not _STOP:
+                remaining.append(row)
+        if remaining and self._conn is not None:
+            await asyncio.to_thread(self._write_batch, remaining)
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    # ===== YAZMA =====
+    def enqueue(self, record: MessageRecord):
+        """Mesajı yazma növbəsinə at (gözləmədən)"""
+        row = (record.id, None, record.user_id, record.username, record.message,
+               record.ts, int(record.is_bot), int(record.is_admin), record.risk_score,
+               REASON_SEPARATOR.join(record.risk_reasons) or None, record.source)
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"⚠️ DB növbəsi doludur, atılan mesajlar: {self.dropped}")
+
+    async def _writer(self):
+        stopping = False
+        while not stopping:
+            row = await self._queue.get()
+            if row is _STOP:
+                break
+            batch = [row]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                row = self._queue.get_nowait()
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                logger.error(f"❌ DB yazma xətası ({len(batch)} mesaj): {e}")
+
+    def _write_batch(self, rows):
+        with self._conn:
+            self._conn.executemany(INSERT_SQL, rows)
+        self.written += len(rows)
+
+    # ===== OXUMA =====
+    def max_id(self) -> int:
+        row = self._conn.execute("SELECT MAX(id) FROM messages").fetchone()
+        return row[0] or 0
+
+    def load_recent(self, since_ts: float, limit: int, time_budget: float = 5.0) -> list:
+        """Son mesajları yüklə (köhnədən yeniyə).
+
+        Ən yenilərdən başlayır, `limit` və ya `time_budget` saniyə
+        bitəndə dayanır - startup vaxtı məhdud qalır.
+        """
+        deadline = time.monotonic() + time_budget
+        cursor = self._conn.execute(
+            f"SELECT {SELECT_COLUMNS} FROM messages "
+            "WHERE message_date > ? ORDER BY message_date DESC LIMIT ?",
+            (since_ts, limit)
+        )
+        records = []
+        while True:
+            rows = cursor.fetchmany(5000)
+            if not rows:
+                break
+            records.extend(row_to_record(row) for row in rows)
+            if time.monotonic() > deadline:
+                logger.warning(f"⏱️ Rehydrate vaxt limiti: {len(records)} mesaj yükləndi")
+                break
+        cursor.close()
+        # User buffer-ləri id sırası ilə olmalıdır (səhifələmə bisect edir)
+        records.sort(key=lambda record: record.id)
+        return records
+
+    def read_user_page(self, user_id: str, limit: int, before_id: int = None, after_id: int = None) -> list:
+        """User tarixçəsindən bir səhifə (köhnədən yeniyə), keyset ilə.
+
+        `after_id` verilibsə cursor-dan sonrakı ilk `limit` sətir, əks halda
+        `before_id`-dən əvvəlki son `limit` sətir. (user_id, id) indeksi
+        sayəsində dərinlikdən asılı deyil - OFFSET yoxdur.
+        """
+        clauses = ["user_id = ?"]
+        params = [user_id]
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        params.append(limit)
+        order = "ASC" if after_id is not None else "DESC"
+        with self._reader_lock:
+            if self._reader is None:
+                self._reader = self.open_reader()
+            rows = self._reader.execute(
+                f"SELECT {SELECT_COLUMNS} FROM messages WHERE {' AND '.join(clauses)} ORDER BY id {order} LIMIT ?",
+                params
+            ).fetchall()
+        if order == "DESC":
+            rows.reverse()
+        return [row_to_record(row) for row in rows]
+
+    # ===== EXPORT =====
+    def open_reader(self) -> sqlite3.Connection:
+        """Export / tarixçə üçün ayrıca read-only bağlantı (WAL - yazıcını bloklamır)"""
+        uri = Path(self.path).resolve().as_uri() + "?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    @staticmethod
+    def read_chunk(conn: sqlite3.Connection, after_id: int, limit: int, user_id: str = None,
+                   since: float = None, until: float = None, min_risk: int = None) -> list:
+        """`after_id`-dən sonrakı `limit` sətir (id sırası ilə, keyset).
+
+        Hər hissə ayrıca qısa sorğudur - açıq qalan cursor və OFFSET yoxdur.
+        """
+        clauses = ["id > ?"]
+        params = [after_id]
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if since is not None:
+            clauses.append("message_date >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("message_date < ?")
+            params.append(until)
+        if min_risk is not None:
+            clauses.append("risk_score >= ?")
+            params.append(min_risk)
+        params.append(limit)
+        return conn.execute(
+            f"SELECT {SELECT_COLUMNS} FROM messages WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?",
+            params
+        ).fetchall()
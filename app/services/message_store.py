@@ -0,0 +1,208 @@
+# brain/app/services/message_store.py
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from itertools import islice
+
+from ..models.chat import MessageRecord, UserStats
+
+
+def _record_id(record: MessageRecord) -> int:
+    return record.id
+
+
+def _insert_by_ts(buffer: deque, record: MessageRecord):
+    """Record-u ts sırası ilə yerləşdir.
+
+    Adətən sona düşür (O(1)); outbox-dan gecikmiş mesaj isə özündən
+    yeni record-ların qabağına keçir ki, cutoff-da dayanan scan-lar
+    düzgün qalsın. Dolu buffer-dən də köhnə olan mesaj atılır.
+    """
+    if not buffer or buffer[-1].ts <= record.ts:
+        buffer.append(record)
+        return
+    if len(buffer) == buffer.maxlen:
+        if record.ts < buffer[0].ts:
+            return
+        buffer.popleft()
+    index = len(buffer)
+    for newer in reversed(buffer):
+        if newer.ts <= record.ts:
+            break
+        index -= 1
+    buffer.insert(index, record)
+
+
+class MessageStore:
+    """User-lara görə indekslənmiş mesaj anbarı.
+
+    - hər user üçün məhdud ring buffer (son `per_user_limit` mesaj)
+    - bütün mesajlar üçün zamana görə sıralı qlobal indeks
+    - yüksək riskli mesajlar üçün ayrıca indeks (alert-lər üçün)
+
+    Sorğuların qiyməti bütün tarixçədən yox, cavabın ölçüsündən asılıdır.
+    """
+
+    def __init__(self, per_user_limit: int = 500, max_messages: int = 200_000,
+                 alert_threshold: int = 70, max_alerts: int = 10_000):
+        self.per_user_limit = per_user_limit
+        self.max_messages = max_messages
+        self.alert_threshold = alert_threshold
+
+        # MessageRecord-lar - köhnədən yeniyə
+        self._timeline = deque(maxlen=max_messages)
+        self._alerts = deque(maxlen=max_alerts)
+        self._by_user = {}
+
+        # user_id -> son mesaj vaxtı; ən son aktiv user sonda olur
+        self._recent_users = OrderedDict()
+        self._user_stats = {}
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._timeline)
+
+    def __contains__(self, user_id):
+        return user_id in self._user_stats
+
+    @property
+    def user_count(self) -> int:
+        return len(self._user_stats)
+
+    def add(self, record: MessageRecord) -> MessageRecord:
+        """Mesajı bütün indekslərə əlavə et (id yoxdursa təyin olunur)"""
+        if not record.id:
+            record.id = self._next_id
+        self._next_id = max(self._next_id, record.id + 1)
+
+        user_id = record.user_id
+        _insert_by_ts(self._timeline, record)
+
+        # User buffer-i id sırası ilə qalır (səhifələmə bisect edir)
+        user_buffer = self._by_user.get(user_id)
+        if user_buffer is None:
+            user_buffer = self._by_user[user_id] = deque(maxlen=self.per_user_limit)
+        user_buffer.append(record)
+
+        if record.risk_score > self.alert_threshold and not record.is_bot:
+            _insert_by_ts(self._alerts, record)
+
+        last_ts = self._recent_users.get(user_id)
+        if last_ts is None or record.ts > last_ts:
+            self._touch_user(user_id, record.ts)
+
+        stats = self._user_stats.get(user_id)
+        if stats is None:
+            stats = self._user_stats[user_id] = UserStats(record.username)
+        stats.total += 1
+        if stats.last is None or record.ts >= stats.last.ts:
+            stats.last = record
+        elif stats.last.ts - record.ts > stats.lag:
+            stats.lag = stats.last.ts - record.ts
+        if record.risk_score > stats.max_risk:
+            stats.max_risk = record.risk_score
+
+        return record
+
+    def _touch_user(self, user_id: str, ts: float):
+        """Son aktivliyi yenilə; sıra son aktivliyə görə artan qalır.
+
+        Gecikmiş mesajın ts-i sondakı user-lardan köhnə ola bilər - o
+        zaman ondan yeni user-lar yenidən sona keçirilir (yalnız onlar).
+        """
+        recent = self._recent_users
+        newer = []
+        for other in reversed(recent):
+            if recent[other] <= ts:
+                break
+            if other != user_id:
+                newer.append(other)
+        recent[user_id] = ts
+        recent.move_to_end(user_id)
+        for other in reversed(newer):
+            recent.move_to_end(other)
+
+    def reserve_ids(self, last_id: int):
+        """Yeni id-lər `last_id`-dən sonra başlasın (məs. DB-dəki son id)"""
+        self._next_id = max(self._next_id, last_id + 1)
+
+    # ===== USER SORĞULARI =====
+    def user_messages(self, user_id: str, limit: int = None) -> list:
+        """User-ın son `limit` mesajı (köhnədən yeniyə)"""
+        user_buffer = self._by_user.get(user_id)
+        if not user_buffer:
+            return []
+        if limit is None or limit >= len(user_buffer):
+            return list(user_buffer)
+        recent = list(islice(reversed(user_buffer), limit))
+        recent.reverse()
+        return recent
+
+    def user_page(self, user_id: str, limit: int, before: int = None, after: int = None) -> list:
+        """User-ın bir səhifə mesajı id cursor-u ilə (köhnədən yeniyə).
+
+        `before` - bu id-dən köhnə son `limit` mesaj, `after` - bu id-dən
+        yeni ilk `limit` mesaj, heç biri - ən son `limit` mesaj. Buffer id
+        sırası ilə olduğu üçün yer bisect ilə tapılır - dərin səhifə də
+        birinci səhifə qədər ucuzdur.
+        """
+        user_buffer = self._by_user.get(user_id)
+        if not user_buffer:
+            return []
+        if after is not None:
+            start = bisect_right(user_buffer, after, key=_record_id)
+            return list(islice(user_buffer, start, start + limit))
+        end = len(user_buffer) if before is None else bisect_left(user_buffer, before, key=_record_id)
+        return list(islice(user_buffer, max(0, end - limit), end))
+
+    def oldest_id(self, user_id: str) -> int:
+        """Yaddaşdakı ən köhnə mesajın id-si (bundan köhnələri yalnız DB-dədir)"""
+        user_buffer = self._by_user.get(user_id)
+        return user_buffer[0].id if user_buffer else None
+
+    def user_messages_since(self, user_id: str, cutoff: float):
+        """User-ın `cutoff`-dan sonrakı mesajları (id sırası ilə, yenidən köhnəyə).
+
+        Buffer id sırasındadır; gecikmiş mesajlar ts sırasını `lag` saniyə
+        qədər poza bilər, ona görə scan `cutoff - lag`-da dayanır.
+        """
+        stats = self._user_stats.get(user_id)
+        stop = cutoff - stats.lag if stats else cutoff
+        for record in reversed(self._by_user.get(user_id, ())):
+            if record.ts <= stop:
+                break
+            if record.ts > cutoff:
+                yield record
+
+    def user_stats(self, user_id: str) -> UserStats:
+        """User üzrə ümumi statistikalar (total, max_risk, username, last)"""
+        return self._user_stats.get(user_id)
+
+    def user_total(self, user_id: str) -> int:
+        stats = self._user_stats.get(user_id)
+        return stats.total if stats else 0
+
+    def last_activity(self, user_id: str) -> float:
+        return self._recent_users.get(user_id)
+
+    def recent_users(self, cutoff: float):
+        """`cutoff`-dan sonra aktiv olan user-lar (son aktiv əvvəl)"""
+        for user_id in reversed(self._recent_users):
+            ts = self._recent_users[user_id]
+            if ts <= cutoff:
+                break
+            yield user_id, ts
+
+    # ===== QLOBAL SORĞULAR =====
+    def since(self, cutoff: float):
+        """`cutoff`-dan sonrakı bütün mesajlar (yenidən köhnəyə)"""
+        for record in reversed(self._timeline):
+            if record.ts <= cutoff:
+                break
+            yield record
+
+    def high_risk_since(self, cutoff: float):
+        """`cutoff`-dan sonrakı yüksək riskli user mesajları (yenidən köhnəyə)"""
+        for record in reversed(self._alerts):
+            if record.ts <= cutoff:
+                break
+            yield record
@@ -0,0 +1,280 @@
+# brain/app/services/outbox.py
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """Bot -> monitorinq API: diskə yazılan növbə + arxa fon göndərici.
+
+    `put()` heç vaxt şəbəkəni gözləmir - mesaj yaddaşdakı növbəyə düşür.
+    Spool task-ı onu `spool_delay` saniyə ərzində spool fayla (JSONL) yazır
+    və fsync edir (göndərmədən asılı olmayaraq, API əlçatmaz olanda da);
+    göndərici task isə partiyalarla pool-lu session üzərindən bulk endpoint-ə
+    (JSON massiv) göndərir. API əlçatmazdırsa jitter-li eksponensial backoff
+    ilə təkrar cəhd edilir; mesajlar spool-da qalır və restart-dan sonra da
+    göndərilir (at-least-once).
+
+    Göndərilən (və ya növbə dolanda atılan) son mesajın `seq`-i ayrıca
+    `.ack` faylında saxlanılır; növbə boşalanda spool sıfırlanır, ölü
+    sətirlər `max_pending`-i keçəndə spool növbənin özü ilə yenidən yazılır -
+    fayl növbədən uzağa böyümür.
+    """
+
+    def __init__(self, url: str, spool_path, batch_size: int = 100,
+                 flush_interval: float = 0.5, spool_delay: float = 0.05, max_pending: int = 100_000,
+                 backoff_base: float = 1.0, backoff_cap: float = 60.0, timeout: float = 10.0):
+        self.url = url
+        self.spool_path = Path(spool_path)
+        self.ack_path = self.spool_path.with_name(self.spool_path.name + ".ack")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_delay = spool_delay
+        self.max_pending = max_pending
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+
+        self._queue = deque()      # (seq, payload) - göndərilməyi gözləyən
+        self._unspooled = []       # hələ fayla yazılmamış sətirlər
+        self._spooled = 0          # spool fayldakı sətir sayı
+        self._seq = 0
+        self._acked = 0
+        self._ack_written = 0
+        self._wake = None
+        self._spool_wake = None
+        self._spool_lock = None
+        self._io_lock = threading.Lock()  # ləğv olunmuş to_thread yazısı ilə yenisi üst-üstə düşməsin
+        self._closing = False
+        self._task = None
+        self._spool_task = None
+        self._session = None
+        self._failures = 0
+        self.sent = 0
+        self.dropped = 0
+
+    # ===== NÖVBƏ =====
+    def put(self, user_id: str, username: str, message: str, is_bot: bool = False,
+            is_admin: bool = False, risk_score: int = 0, source: str = None):
+        """Mesajı növbəyə at - O(1), gözləmir"""
+        self._seq += 1
+        payload = {
+            "user_id": user_id,
+            "username": username,
+            "message": message,
+            "is_bot": is_bot,
+            "is_admin": is_admin,
+            "risk_score": risk_score,
+            "source": source,
+            "ts": time.time()
+        }
+        if len(self._queue) >= self.max_pending:
+            # Ən köhnə atılır; ack onun seq-inə çəkilir ki, restart-dan sonra qayıtmasın
+            self._acked, _ = self._queue.popleft()
+            self.dropped += 1
+        self._queue.append((self._seq, payload))
+        self._unspooled.append(self._line(self._seq, payload))
+        if self._spool_wake is not None:
+            self._spool_wake.set()
+        if self._wake is not None and len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    # ===== LIFECYCLE =====
+    async def start(self):
+        """Spool-dan göndərilməmişləri yüklə və göndərici task-ı başlat"""
+        if self._task is not None:
+            return
+        await asyncio.to_thread(self._load_spool)
+        self._wake = asyncio.Event()
+        self._spool_wake = asyncio.Event()
+        self._spool_lock = asyncio.Lock()
+        self._closing = False
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=4, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self._task = asyncio.create_task(self._run())
+        self._spool_task = asyncio.create_task(self._spool_loop())
+        if self._unspooled:
+            self._spool_wake.set()
+        logger.info(f"📮 Outbox başladı: {self.pending} göndərilməmiş mesaj")
+
+    async def stop(self, drain_timeout: float = 5.0):
+        """Qalanları göndərməyə cəhd et, spool-u yaz və bağla"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Spool task-ı ləğv olunmur - yarımçıq yazını bitirib çıxır
+        self._closing = True
+        self._spool_wake.set()
+        await self._spool_task
+        self._spool_task = None
+        try:
+            await asyncio.wait_for(self._flush(), drain_timeout)
+        except Exception as e:
+            logger.warning(f"⚠️ Outbox tam boşalmadı ({self.pending} qaldı): {e}")
+        await self._spool()
+        await self._session.close()
+        logger.info(f"📮 Outbox dayandı: {self.sent} göndərildi, {self.pending} spool-da")
+
+    def _load_spool(self):
+        if self.ack_path.exists():
+            self._acked = int(self.ack_path.read_text() or 0)
+        if not self.spool_path.exists():
+            return
+        with open(self.spool_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # yarımçıq son sətir
+                self._spooled += 1
+                seq = entry.pop("seq")
+                self._seq = max(self._seq, seq)
+                if seq > self._acked:
+                    self._queue.append((seq, entry))
+        # seq-lər ack-dan geri qayıtmamalıdır
+        self._seq = max(self._seq, self._acked)
+        self._ack_written = self._acked
+
+    # ===== GÖNDƏRMƏ =====
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not self._queue:
+                continue
+            try:
+                await self._flush()
+                self._failures = 0
+            except Exception as e:
+                # API əlçatmazdır - backoff, mesajlar növbədə qalır
+                self._failures += 1
+                delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** self._failures))
+                logger.warning(f"⚠️ Outbox göndərə bilmədi ({self.pending} gözləyir), "
+                               f"{delay:.1f}s sonra: {e}")
+                await asyncio.sleep(delay)
+
+    async def _flush(self):
+        await self._spool()
+        while self._queue:
+            batch = [self._queue[i] for i in range(min(self.batch_size, len(self._queue)))]
+            sent = await self._send(batch)
+            if sent:
+                # Göndərmə zamanı put() növbənin başını atmış ola bilər - seq ilə çıxarılır
+                last_seq = batch[sent - 1][0]
+                while self._queue and self._queue[0][0] <= last_seq:
+                    self._queue.popleft()
+                self._acked = max(self._acked, last_seq)
+                self.sent += sent
+            await self._spool()
+            if sent < len(batch):
+                raise ConnectionError("partiya tam göndərilmədi")
+
+    async def _send(self, batch: list) -> int:
+        """Partiyanı bulk endpoint-ə bir sorğu ilə göndər; göndərilən sayı qaytarır"""
+        try:
+            async with self._session.post(self.url, json=[payload for _, payload in batch]) as response:
+                if response.status >= 500:
+                    return 0
+                if response.status >= 400:
+                    # Təkrar cəhd kömək etməz - partiya atılır
+                    logger.error(f"❌ Outbox partiyası rədd edildi: {response.status}")
+                    self.dropped += len(batch)
+                else:
+                    result = await response.json()
+                    if result.get("rejected"):
+                        logger.error(f"❌ Outbox: {len(result['rejected'])} mesaj rədd edildi")
+                        self.dropped += len(result["rejected"])
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return 0
+        return len(batch)
+
+    # ===== SPOOL =====
+    @staticmethod
+    def _line(seq: int, payload: dict) -> str:
+        return json.dumps({"seq": seq, **payload}, ensure_ascii=False) + "\n"
+
+    async def _spool_loop(self):
+        """put()-dan sonra `spool_delay` ərzində spool-a yaz (qrup fsync)"""
+        while True:
+            await self._spool_wake.wait()
+            if self._closing:
+                return
+            await asyncio.sleep(self.spool_delay)
+            self._spool_wake.clear()
+            try:
+                await self._spool()
+            except OSError as e:
+                logger.warning(f"⚠️ Outbox spool-a yaza bilmədi: {e}")
+
+    async def _spool(self):
+        """Yeni sətirləri və ack-ı diskə yaz; lazım olsa spool-u sıfırla və ya yenidən yaz"""
+        async with self._spool_lock:
+            lines, self._unspooled = self._unspooled, []
+            if not self._queue:
+                # Hamısı göndərilib - yazılmamış sətirlər də artıq lazım deyil
+                if self._spooled or self._acked:
+                    self._spooled = self._acked = 0
+                    await asyncio.to_thread(self._truncate_spool)
+            elif self._spooled + len(lines) - len(self._queue) > self.max_pending:
+                # API çoxdan əlçatmazdır - spool-da yalnız növbədəkilər saxlanılır
+                entries = list(self._queue)
+                self._spooled = len(entries)
+                await asyncio.to_thread(self._rewrite_spool, entries)
+            elif lines:
+                self._spooled += len(lines)
+                await asyncio.to_thread(self._write_spool, lines)
+            if self._acked != self._ack_written:
+                await asyncio.to_thread(self._write_ack, self._acked)
+
+    def _write_spool(self, lines: list):
+        with self._io_lock, open(self.spool_path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _rewrite_spool(self, entries: list):
+        tmp_path = self.spool_path.with_name(self.spool_path.name + ".tmp")
+        with self._io_lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(self._line(seq, payload) for seq, payload in entries)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.spool_path)
+
+    def _truncate_spool(self):
+        # Əvvəlcə ack sıfırlanır: arada crash olsa mesajlar təkrar göndərilir, itmir
+        self._write_ack(0)
+        with self._io_lock:
+            if self.spool_path.exists():
+                open(self.spool_path, "w").close()
+
+    def _write_ack(self, acked: int):
+        tmp_path = self.ack_path.with_name(self.ack_path.name + ".tmp")
+        with self._io_lock:
+            tmp_path.write_text(str(acked))
+            os.replace(tmp_path, self.ack_path)
+        self._ack_written = acked
@@ -0,0 +1,161 @@
+# brain/app/services/risk_engine.py
+import unicodedata
+from collections import deque
+from typing import NamedTuple
+
+from ..memory.normalize import normalize_text
+
+# Kateqoriya -> (ifadə, çəki 0-100). İfadələr söz əvvəlindən uyğunlaşır
+# (kök kimi): "qaytar" -> "qaytarın", "qaytarmaq"; normalize_text ilə
+# ə/e, ş/s, ё/е və s. fərq yaratmır.
+LEXICON = {
+    "complaint": [
+        ("şikayət", 35), ("narazı", 35), ("problem", 20), ("gecik", 25),
+        ("xarab", 35), ("işləmir", 30), ("keyfiyyətsiz", 40), ("zay", 35),
+        ("cavab vermirsiniz", 40), ("aldat", 60), ("aldad", 60), ("fırıldaq", 70),
+        ("жалоб", 35), ("недовол", 35), ("проблем", 20), ("задерж", 25),
+        ("сломан", 35), ("не работает", 30), ("брак", 35), ("не отвечаете", 40),
+        ("обман", 60), ("мошенн", 70),
+    ],
+    "refund": [
+        ("geri qaytar", 45), ("qaytarmaq", 40), ("pulumu", 40), ("pulu qaytar", 55),
+        ("ləğv", 35), ("imtina", 30),
+        ("вернуть деньги", 55), ("верните", 45), ("возврат", 45), ("отмен", 35),
+    ],
+    "competitor": [
+        ("başqa mağaza", 35), ("rəqib", 30), ("daha ucuz", 30), ("trendyol", 30),
+        ("temu", 30), ("aliexpress", 30), ("wildberries", 30), ("ozon", 25),
+        ("другой магазин", 35), ("дешевле", 30), ("конкурент", 30),
+    ],
+    "anger": [
+        ("biabır", 50), ("rəzalət", 60), ("axmaq", 55), ("utanmaz", 55),
+        ("məhkəmə", 60), ("polis", 50), ("şikayət edəcəm", 60),
+        ("позор", 55), ("ужас", 45), ("безобраз", 55), ("в суд", 60),
+        ("полици", 50), ("идиот", 60),
+    ],
+}
+
+# Xam mətndən intonasiya siqnalları
+EXCLAMATION_REASON = "anger: !!!"
+CAPS_REASON = "anger: BÖYÜK HƏRFLƏR"
+
+
+class _FoldTable(dict):
+    """str.translate cədvəli: simvol -> normalize_text forması (tələb olunanda doldurulur).
+
+    Hər mesajda bütün mətn üçün NFKC/NFD etmək əvəzinə hər simvol bir dəfə
+    normallaşdırılır; nəticə normalize_text ilə eynidir (boşluqlar sonra birləşir).
+    """
+
+    def __missing__(self, code: int) -> str:
+        ch = chr(code)
+        value = "" if unicodedata.combining(ch) else (normalize_text(ch) or " ")
+        self[code] = value
+        return value
+
+
+class RiskResult(NamedTuple):
+    score: int      # 0-100
+    reasons: tuple  # ("refund: geri qaytar", ...) - çəkiyə görə azalan
+
+
+NO_RISK = RiskResult(0, ())
+
+
+class RiskEngine:
+    """Çəkili leksikon üzrə risk qiyməti (Aho-Corasick avtomatı).
+
+    Bütün ifadələr normallaşdırılıb bir avtomata yığılır; fail keçidləri
+    əvvəlcədən tam keçid cədvəlinə açılır, ona görə mətn bir keçiddə,
+    simvol başına bir dict axtarışı ilə skan olunur. Tapılan ifadələrin
+    çəkiləri noisy-OR ilə birləşir: 1 - Π(1 - w).
+    """
+
+    def __init__(self, lexicon: dict = LEXICON):
+        self._patterns = []     # id -> (çəki 0-1, səbəb)
+        self._goto = [{}]
+        self._out = [()]
+        self._fold = _FoldTable()
+        for category, phrases in lexicon.items():
+            for phrase, weight in phrases:
+                key = normalize_text(phrase)
+                if key:
+                    # Qabaqdakı boşluq - yalnız söz əvvəlindən uyğunlaşma
+                    self._insert(" " + key, len(self._patterns))
+                    self._patterns.append((weight / 100, f"{category}: {phrase}"))
+        self._delta = self._build()
+
+    def _insert(self, key: str, pattern_id: int):
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = self._goto[state][ch] = len(self._goto)
+                self._goto.append({})
+                self._out.append(())
+            state = nxt
+        self._out[state] += (pattern_id,)
+
+    def _build(self) -> list:
+        """Fail keçidlərini hesabla və tam keçid cədvəli qur (BFS)"""
+        fail = [0] * len(self._goto)
+        delta = [dict(self._goto[0])]
+        delta.extend({} for _ in range(len(self._goto) - 1))
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # Valideynin fail-indən miras keçidlər + öz keçidləri
+            delta[state] = dict(delta[fail[state]])
+            for ch, nxt in self._goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                delta[state][ch] = nxt
+                queue.append(nxt)
+            self._out[state] += self._out[fail[state]]
+        # Kökə qayıdan keçidləri saxlamağa ehtiyac yoxdur (.get(ch, 0))
+        return [{ch: nxt for ch, nxt in row.items() if nxt} for row in delta]
+
+    def score(self, text: str) -> RiskResult:
+        """Bir mesajın riski və səbəbləri"""
+        if not text:
+            return NO_RISK
+        delta = self._delta
+        out = self._out
+        state = 0
+        matched = None
+        for ch in " " + " ".join(text.translate(self._fold).split()):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                if matched is None:
+                    matched = set()
+                matched.update(out[state])
+
+        signals = []
+        if matched:
+            signals = [self._patterns[i] for i in matched]
+        if text.count("!") >= 3:
+            signals.append((0.15, EXCLAMATION_REASON))
+        letters = [ch for ch in text if ch.isalpha()]
+        if len(letters) >= 8 and sum(ch.isupper() for ch in letters) > 0.7 * len(letters):
+            signals.append((0.2, CAPS_REASON))
+        if not signals:
+            return NO_RISK
+
+        safe = 1.0
+        for weight, _ in signals:
+            safe *= 1.0 - weight
+        signals.sort(reverse=True)
+        return RiskResult(round((1.0 - safe) * 100), tuple(reason for _, reason in signals))
+
+    def score_many(self, texts) -> list:
+        """Partiya üçün - eyni mətnlər bir dəfə hesablanır"""
+        seen = {}
+        results = []
+        for text in texts:
+            result = seen.get(text)
+            if result is None:
+                result = seen[text] = self.score(text)
+            results.append(result)
+        return results
+
+
+risk_engine = RiskEngine()
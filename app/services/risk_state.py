@@ -0,0 +1,201 @@
+# brain/app/services/risk_state.py
+import heapq
+import math
+import time
+
+LEVELS = ("normal", "warning", "danger")
+_RANK = {level: rank for rank, level in enumerate(LEVELS)}
+
+NO_EVENTS = ()
+
+
+class UserRiskState:
+    """Bir user-ın cari (sönən) riski"""
+
+    __slots__ = ("score", "velocity", "streak", "level", "updated", "surging", "counted", "due", "gen")
+
+    def __init__(self, ts: float):
+        self.score = 0.0      # eksponensial sönən risk, 0-100
+        self.velocity = 0.0   # skorun dəyişmə sürəti, bal/dəqiqə (hamarlanmış)
+        self.streak = 0       # ardıcıl yüksək riskli mesaj sayı
+        self.level = "normal" # son yenilənmədəki səviyyə (risk_changed üçün)
+        self.updated = ts
+        self.surging = False
+        self.counted = None   # level_counts-da hansı səviyyədə sayılır
+        self.due = 0.0        # növbəti sönmə sərhədi (və ya retention sonu)
+        self.gen = 0          # timer-in aktual olub-olmadığını yoxlamaq üçün
+
+
+class RiskTracker:
+    """User başına inkremental risk vəziyyəti - hər mesajda O(1).
+
+    Skor zamanla yarımömür `half_life` ilə sönür, yeni mesaj isə onu
+    asimmetrik EWMA ilə çəkir (risk artanda `alpha_up`, azalanda
+    `alpha_down`) - tək bir köhnə qəzəbli mesaj user-ı saatlarla "danger"
+    saxlamır, ardıcıl riskli mesajlar isə tez yüksəldir.
+
+    Yeni user-ın vəziyyəti ilk mesajın öz skoru ilə başlayır - ilk
+    mesajı qəzəbli olan müştəri dərhal öz səviyyəsində görünür.
+
+    Səviyyə sayları (`level_counts`) inkremental saxlanılır: hər
+    vəziyyət üçün skorun növbəti həddən aşağı düşəcəyi an hesablanıb
+    heap-ə qoyulur, sorğu yalnız vaxtı çatmış timer-ləri emal edir.
+
+    `update()` eskalasiya hadisələrini qaytarır:
+    - level_up / level_down - səviyyə (normal/warning/danger) dəyişdi
+    - streak - `streak_threshold` ardıcıl mesaj warning həddindən yuxarı
+    - surge  - skor `surge_velocity` bal/dəqiqədən sürətlə artır (ardıcıl riskli mesajlarla)
+    """
+
+    def __init__(self, half_life: float = 1800.0, alpha_up: float = 0.6, alpha_down: float = 0.3,
+                 warning_threshold: int = 60, danger_threshold: int = 80,
+                 streak_threshold: int = 3, surge_velocity: float = 20.0,
+                 retention: float = 24 * 3600):
+        self.half_life = half_life
+        self.alpha_up = alpha_up
+        self.alpha_down = alpha_down
+        self.warning_threshold = warning_threshold
+        self.danger_threshold = danger_threshold
+        self.streak_threshold = streak_threshold
+        self.surge_velocity = surge_velocity
+        self.retention = retention
+        self._states = {}  # user_id -> UserRiskState
+        self._counts = dict.fromkeys(LEVELS, 0)
+        self._timers = []  # (due, gen, user_id) - min-heap
+
+    def __contains__(self, user_id):
+        return user_id in self._states
+
+    def level_for(self, score: float) -> str:
+        if score > self.danger_threshold:
+            return "danger"
+        if score > self.warning_threshold:
+            return "warning"
+        return "normal"
+
+    def _decay(self, value: float, elapsed: float) -> float:
+        return value * 0.5 ** (elapsed / self.half_life) if elapsed > 0 else value
+
+    # ===== INGEST =====
+    def update(self, user_id: str, risk_score: int, ts: float = None) -> tuple:
+        """Müştəri mesajını vəziyyətə qat; eskalasiya hadisələrini qaytar"""
+        ts = time.time() if ts is None else ts
+        state = self._states.get(user_id)
+        if state is None:
+            state = self._states[user_id] = UserRiskState(ts)
+            # İlk mesaj EWMA ilə 0-dan çəkilmir - skor mesajın özüdür
+            previous = score = float(risk_score)
+            elapsed = 0.0
+        else:
+            # Gecikmiş (köhnə ts-li) mesaj vaxtı geri çəkmir
+            elapsed = ts - state.updated
+            previous = self._decay(state.score, elapsed)
+            alpha = self.alpha_up if risk_score > previous else self.alpha_down
+            score = previous + alpha * (risk_score - previous)
+
+        # Sürət: bal/dəqiqə, dəqiqədən tez gələn mesajlar bir dəqiqə sayılır
+        instant = (score - previous) / max(elapsed / 60, 1.0)
+        state.velocity = 0.5 * self._decay(state.velocity, elapsed) + 0.5 * instant
+        state.score = score
+        state.updated = max(state.updated, ts)
+        state.streak = state.streak + 1 if risk_score > self.warning_threshold else 0
+
+        events = None
+        level = self.level_for(score)
+        if level != state.level:
+            events = [self._event(user_id, state, "level_up" if _RANK[level] > _RANK[state.level]
+                                  else "level_down", ts, previous_level=state.level, level=level)]
+            state.level = level
+        if state.streak == self.streak_threshold:
+            events = events or []
+            events.append(self._event(user_id, state, "streak", ts))
+        # Tək mesaj sıçrayış sayılmır - ən azı iki ardıcıl riskli mesaj
+        surging = state.velocity >= self.surge_velocity and state.streak >= 2
+        if surging and not state.surging:
+            events = events or []
+            events.append(self._event(user_id, state, "surge", ts))
+        state.surging = surging
+
+        self._recount(user_id, state, level)
+        return tuple(events) if events else NO_EVENTS
+
+    # ===== SƏVİYYƏ SAYLARI =====
+    def _recount(self, user_id: str, state: UserRiskState, level: str):
+        """Vəziyyəti yeni səviyyədə say və növbəti sərhəd üçün timer qur"""
+        if state.counted is not None:
+            self._counts[state.counted] -= 1
+        state.counted = level
+        self._counts[level] += 1
+        state.gen += 1
+        self._schedule(user_id, state)
+
+        # Köhnəlmiş timer-lər yığılmasın - heap vəziyyətlərdən yenidən qurulur
+        if len(self._timers) > 4 * len(self._states) + 1024:
+            self._timers = [(s.due, s.gen, uid) for uid, s in self._states.items()]
+            heapq.heapify(self._timers)
+
+    def _schedule(self, user_id: str, state: UserRiskState):
+        if state.counted == "danger":
+            threshold = self.danger_threshold
+        elif state.counted == "warning":
+            threshold = self.warning_threshold
+        else:
+            threshold = None
+
+        if threshold is None or state.score <= threshold:
+            state.due = state.updated + self.retention
+        else:
+            # Skor həddə bərabər olanda səviyyə düşür (level_for ">" ilə müqayisə edir)
+            state.due = state.updated + self.half_life * math.log2(state.score / threshold) + 1e-3
+        heapq.heappush(self._timers, (state.due, state.gen, user_id))
+
+    def _event(self, user_id: str, state: UserRiskState, kind: str, ts: float, **extra) -> dict:
+        event = {
+            "user_id": user_id,
+            "type": kind,
+            "risk_score": round(state.score),
+            "level": state.level,
+            "velocity": round(state.velocity, 1),
+            "streak": state.streak,
+            "ts": ts
+        }
+        event.update(extra)
+        return event
+
+    # ===== OXUMA =====
+    def get(self, user_id: str, now: float = None) -> dict:
+        """Cari vaxta sönmüş vəziyyət (user yoxdursa normal)"""
+        state = self._states.get(user_id)
+        if state is None:
+            return {"risk_score": 0, "level": "normal", "velocity": 0.0, "streak": 0}
+        elapsed = (time.time() if now is None else now) - state.updated
+        score = self._decay(state.score, elapsed)
+        return {
+            "risk_score": round(score),
+            "level": self.level_for(score),
+            "velocity": round(self._decay(state.velocity, elapsed), 1),
+            "streak": state.streak
+        }
+
+    def level_counts(self, now: float = None) -> dict:
+        """Hazırda hər səviyyədə olan user sayı.
+
+        Yalnız vaxtı çatmış timer-lər emal olunur (səviyyəsi sönən və ya
+        `retention`-u bitən vəziyyətlər) - user sayından asılı deyil.
+        """
+        now = time.time() if now is None else now
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            due, gen, user_id = heapq.heappop(timers)
+            state = self._states.get(user_id)
+            if state is None or state.gen != gen:
+                continue
+            self._counts[state.counted] -= 1
+            if state.counted == "normal":
+                # Retention bitdi - skor artıq ~0
+                del self._states[user_id]
+                continue
+            state.counted = self.level_for(self._decay(state.score, due - state.updated))
+            self._counts[state.counted] += 1
+            self._schedule(user_id, state)
+        return dict(self._counts)
@@ -0,0 +1,133 @@
+# brain/app/services/rolling_stats.py
+import time
+
+
+class RollingStats:
+    """Son 24 saat üçün dəqiqəlik bucket-lərlə inkremental sayğaclar.
+
+    Hər mesaj qəbul olunanda bucket yenilənir, sorğu isə yalnız hazır
+    cəmləri qaytarır - qiymət gündəlik mesaj sayından asılı deyil.
+
+    Unikal user-lar üçün hər user yalnız *son* aktivliyinin düşdüyü
+    bucket-də sayılır; user yenidən yazanda köhnə bucket-dən çıxarılır,
+    son bucket-i pəncərədən çıxanda isə `_user_last`-dan silinir (yaddaş
+    24 saatda aktiv olan user sayı ilə məhduddur).
+    Warning/danger user-lar risk_state.RiskTracker-dən gəlir.
+    """
+
+    DAY_MINUTES = 24 * 60
+    HOUR_MINUTES = 60
+
+    def __init__(self):
+        size = self.DAY_MINUTES
+        # Hər slot hansı dəqiqəyə aiddir (-1 = boş)
+        self._minute = [-1] * size
+        self._messages = [0] * size
+        self._users = [0] * size
+
+        # user_id -> son aktivlik dəqiqəsi; slot -> həmin dəqiqədə yazan user-lar
+        self._user_last = {}
+        self._slot_users = [[] for _ in range(size)]
+
+        # Pəncərə cəmləri
+        self.messages_day = 0
+        self.messages_hour = 0
+        self.users_day = 0
+
+        self._current = None
+
+    # ===== INGEST =====
+    def add(self, user_id: str, ts: float = None):
+        """Yeni mesajı sayğaclara əlavə et"""
+        now_minute = int(time.time() // 60)
+        minute = now_minute if ts is None else int(ts // 60)
+        self._advance(max(now_minute, minute))
+
+        if minute <= self._current - self.DAY_MINUTES:
+            return  # pəncərədən kənar (köhnə) mesaj
+
+        slot = self._slot(minute)
+        self._messages[slot] += 1
+        self.messages_day += 1
+        if minute > self._current - self.HOUR_MINUTES:
+            self.messages_hour += 1
+
+        self._track(self._user_last, self._users, user_id, minute, "users_day")
+
+    def snapshot(self) -> dict:
+        """Pəncərələri cari vaxta sürüşdür və cəmləri qaytar"""
+        self._advance(int(time.time() // 60))
+        return {
+            "messages_today": self.messages_day,
+            "messages_hour": self.messages_hour,
+            "unique_users": self.users_day
+        }
+
+    # ===== DAXİLİ =====
+    def _slot(self, minute: int) -> int:
+        """Dəqiqənin slotunu qaytar, lazım olsa slotu təmizlə"""
+        slot = minute % self.DAY_MINUTES
+        if self._minute[slot] != minute:
+            self._minute[slot] = minute
+            self._messages[slot] = 0
+            self._users[slot] = 0
+            self._slot_users[slot] = []
+        return slot
+
+    def _track(self, last_map: dict, counts: list, user_id: str, minute: int, total_attr: str):
+        """User-ı yalnız son aktivlik bucket-ində saxla"""
+        previous = last_map.get(user_id)
+        if previous is not None and previous >= minute:
+            return
+
+        if previous is not None and previous > self._current - self.DAY_MINUTES:
+            old_slot = previous % self.DAY_MINUTES
+            if self._minute[old_slot] == previous:
+                counts[old_slot] -= 1
+                setattr(self, total_attr, getattr(self, total_attr) - 1)
+
+        last_map[user_id] = minute
+        slot = self._slot(minute)
+        counts[slot] += 1
+        self._slot_users[slot].append(user_id)
+        setattr(self, total_attr, getattr(self, total_attr) + 1)
+
+    def _advance(self, now_minute: int):
+        """Pəncərədən çıxan dəqiqələri cəmlərdən çıx"""
+        if self._current is None:
+            self._current = now_minute
+            return
+        if now_minute <= self._current:
+            return
+
+        if now_minute - self._current >= self.DAY_MINUTES:
+            # Bütün pəncərə köhnəlib - sıfırla
+            self._minute = [-1] * self.DAY_MINUTES
+            self._slot_users = [[] for _ in range(self.DAY_MINUTES)]
+            self.messages_day = self.messages_hour = 0
+            self.users_day = 0
+            self._user_last.clear()
+            self._current = now_minute
+            return
+
+        for minute in range(self._current + 1, now_minute + 1):
+            # Saatlıq pəncərədən çıxan dəqiqə
+            hour_expired = minute - self.HOUR_MINUTES
+            slot = hour_expired % self.DAY_MINUTES
+            if self._minute[slot] == hour_expired:
+                self.messages_hour -= self._messages[slot]
+
+            # Günlük pəncərədən çıxan dəqiqə
+            day_expired = minute - self.DAY_MINUTES
+            slot = day_expired % self.DAY_MINUTES
+            if self._minute[slot] == day_expired:
+                self.messages_day -= self._messages[slot]
+                self.users_day -= self._users[slot]
+                self._minute[slot] = -1
+                # Son aktivliyi bu dəqiqədə olan user-lar pəncərədən çıxdı
+                for user_id in self._slot_users[slot]:
+                    if self._user_last.get(user_id) == day_expired:
+                        del self._user_last[user_id]
+                self._slot_users[slot] = []
+
+        self._current = now_minute
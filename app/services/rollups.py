@@ -0,0 +1,288 @@
+# brain/app/services/rollups.py
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from ..models.chat import MessageRecord
+
+try:
+    import numpy as np
+except ImportError:  # numpy yoxdursa analitika söndürülür
+    np = None
+
+# Hər bucket üçün sayğaclar (sütun sırası)
+COUNT_FIELDS = ("messages", "customer", "bot", "admin", "memory", "deepseek", "risky")
+MESSAGES, CUSTOMER, BOT, ADMIN, MEMORY, DEEPSEEK, RISKY = range(len(COUNT_FIELDS))
+
+# Risk histoqramı: 0-9, 10-19, ..., 90-100 (yalnız müştəri mesajları)
+RISK_BINS = 10
+RISKY_THRESHOLD = 60
+
+# Bot cavabının mənbəyi -> sütun
+SOURCE_FIELDS = {"memory": MEMORY, "semantic": MEMORY, "deepseek": DEEPSEEK}
+
+
+class Series:
+    """Bir rezolyusiyada (dəqiqə/saat/gün) ring buffer NumPy massivləri.
+
+    Cari ("isti") bucket Python siyahılarında yığılır və bucket dəyişəndə
+    (və ya sorğu/persist-dən əvvəl) bir vektor əməliyyatı ilə massivə
+    yazılır - mesaj başına NumPy skalyar əməliyyatı yoxdur. Gecikmiş
+    mesajlar birbaşa öz bucket-inə yazılır.
+    """
+
+    def __init__(self, name: str, step: int, slots: int, seen_buckets: int = 64):
+        self.name = name
+        self.step = step
+        self.slots = slots
+        self.seen_buckets = seen_buckets
+        self.stamp = np.full(slots, -1, dtype=np.int64)   # slot hansı bucket-ə aiddir
+        self.counts = np.zeros((slots, len(COUNT_FIELDS)), dtype=np.int64)
+        self.risk = np.zeros((slots, RISK_BINS), dtype=np.int64)
+        self.users = np.zeros(slots, dtype=np.int64)      # bucket-də unikal user
+
+        self._hot = None
+        self._hot_counts = [0] * len(COUNT_FIELDS)
+        self._hot_risk = [0] * RISK_BINS
+        self._hot_users = 0
+        self._seen = OrderedDict()  # bucket -> user_id-lər (son `seen_buckets` bucket)
+
+    @property
+    def span(self) -> int:
+        return self.step * self.slots
+
+    def add(self, ts: float, user_id: str, fields: tuple, risk_bin: int = None):
+        bucket = int(ts // self.step)
+        seen = self._seen.get(bucket)
+        if seen is None:
+            seen = self._seen[bucket] = set()
+            if len(self._seen) > self.seen_buckets:
+                self._seen.popitem(last=False)
+        new_user = user_id not in seen
+        if new_user:
+            seen.add(user_id)
+
+        if bucket != self._hot:
+            if self._hot is not None and bucket < self._hot:
+                self._add_cold(bucket, fields, risk_bin, new_user)
+                return
+            self.commit()
+            self._hot = bucket
+
+        counts = self._hot_counts
+        for field in fields:
+            counts[field] += 1
+        if risk_bin is not None:
+            self._hot_risk[risk_bin] += 1
+        if new_user:
+            self._hot_users += 1
+
+    def _slot(self, bucket: int) -> int:
+        """Bucket-in slotu; slot köhnə bucket-dəndirsə təmizlənir, -1 = ring-dən kənar"""
+        slot = bucket % self.slots
+        if self.stamp[slot] != bucket:
+            if self.stamp[slot] > bucket:
+                return -1
+            self.stamp[slot] = bucket
+            self.counts[slot] = 0
+            self.risk[slot] = 0
+            self.users[slot] = 0
+        return slot
+
+    def _add_cold(self, bucket: int, fields: tuple, risk_bin: int, new_user: bool):
+        slot = self._slot(bucket)
+        if slot < 0:
+            return
+        for field in fields:
+            self.counts[slot, field] += 1
+        if risk_bin is not None:
+            self.risk[slot, risk_bin] += 1
+        if new_user:
+            self.users[slot] += 1
+
+    def commit(self):
+        """İsti bucket-i massivlərə yaz"""
+        if self._hot is None:
+            return
+        slot = self._slot(self._hot)
+        if slot >= 0:
+            self.counts[slot] += self._hot_counts
+            self.risk[slot] += self._hot_risk
+            self.users[slot] += self._hot_users
+        self._hot_counts = [0] * len(COUNT_FIELDS)
+        self._hot_risk = [0] * RISK_BINS
+        self._hot_users = 0
+
+    def window(self, start: float, end: float):
+        """[start, end] aralığının bucket-ləri: (bucket-lər, counts, risk, users)"""
+        self.commit()
+        buckets = np.arange(int(start // self.step), int(end // self.step) + 1, dtype=np.int64)
+        slots = buckets % self.slots
+        valid = self.stamp[slots] == buckets
+        return (
+            buckets,
+            np.where(valid[:, None], self.counts[slots], 0),
+            np.where(valid[:, None], self.risk[slots], 0),
+            np.where(valid, self.users[slots], 0)
+        )
+
+    def arrays(self) -> dict:
+        self.commit()
+        return {
+            f"{self.name}_stamp": self.stamp.copy(),
+            f"{self.name}_counts": self.counts.copy(),
+            f"{self.name}_risk": self.risk.copy(),
+            f"{self.name}_users": self.users.copy()
+        }
+
+    def compatible(self, data: dict) -> bool:
+        """Faylda bu seriyanın massivləri eyni formada varmı"""
+        current = self.arrays()
+        return all(key in data and data[key].shape == array.shape for key, array in current.items())
+
+    def restore(self, data: dict):
+        self.stamp, self.counts, self.risk, self.users = (
+            data[f"{self.name}_{part}"].astype(np.int64) for part in ("stamp", "counts", "risk", "users")
+        )
+
+
+class Rollups:
+    """Mesaj axınının əvvəlcədən aqreqasiya olunmuş zaman sıraları.
+
+    Dəqiqə (2 gün), saat (120 gün) və gün (400 gün) seriyaları ingest-də
+    inkremental yenilənir; aralıq sorğusu aralığı əhatə edən ən incə
+    seriyanı seçir və nöqtə sayı `max_points`-i keçməsin deyə bucket-ləri
+    qruplaşdırır (downsampling). Qiymət mesaj sayından yox, bucket
+    sayından asılıdır.
+
+    Qruplaşdırılmış nöqtələrdə `unique_users` qrupdakı bucket-lərin
+    maksimumudur (aşağı sərhəd) - user-lar bucket-lər arasında təkrarlanır.
+
+    `last_id` - sayılmış son mesajın id-si: persist-dən yüklənəndən sonra
+    DB-dən rehydrate olunan mesajlar ikinci dəfə sayılmır.
+    """
+
+    def __init__(self, path=None):
+        if np is None:
+            raise RuntimeError("Rollups üçün numpy lazımdır")
+        self.path = Path(path) if path else None
+        self.series = (
+            Series("minute", 60, 2 * 24 * 60),
+            Series("hour", 3600, 120 * 24),
+            Series("day", 86400, 400),
+        )
+        self.last_id = 0
+        self.saved_at = None
+
+    # ===== INGEST =====
+    def add(self, record: MessageRecord):
+        """Mesajı bütün seriyalara əlavə et - O(1)"""
+        if record.id and record.id <= self.last_id:
+            return  # persist olunmuş rollup-da artıq var
+        self.last_id = max(self.last_id, record.id)
+
+        risk_bin = None
+        if record.is_bot:
+            fields = (MESSAGES, BOT)
+            source = SOURCE_FIELDS.get(record.source)
+            if source is not None:
+                fields += (source,)
+        elif record.is_admin:
+            fields = (MESSAGES, ADMIN)
+        else:
+            fields = (MESSAGES, CUSTOMER, RISKY) if record.risk_score > RISKY_THRESHOLD else (MESSAGES, CUSTOMER)
+            risk_bin = min(max(record.risk_score, 0) // 10, RISK_BINS - 1)
+
+        for series in self.series:
+            series.add(record.ts, record.user_id, fields, risk_bin)
+
+    # ===== SORĞU =====
+    def pick(self, start: float, now: float) -> Series:
+        """Aralığı əhatə edən ən incə seriya"""
+        for series in self.series:
+            if now - start <= series.span - series.step:
+                return series
+        return self.series[-1]
+
+    def query(self, start: float, end: float = None, max_points: int = 300) -> dict:
+        """Aralığın zaman sırası (sütunlar şəklində), ən çox `max_points` nöqtə"""
+        end = time.time() if end is None else end
+        series = self.pick(start, end)
+        buckets, counts, risk, users = series.window(start, end)
+
+        group = max(1, -(-len(buckets) // max_points))
+        if group > 1:
+            # Sonuncu qrup natamam ola bilər - sıfırla doldurulur
+            pad = -len(buckets) % group
+            if pad:
+                buckets = np.concatenate([buckets, buckets[-1] + 1 + np.arange(pad)])
+                counts = np.vstack([counts, np.zeros((pad, counts.shape[1]), dtype=counts.dtype)])
+                risk = np.vstack([risk, np.zeros((pad, risk.shape[1]), dtype=risk.dtype)])
+                users = np.concatenate([users, np.zeros(pad, dtype=users.dtype)])
+            buckets = buckets[::group]
+            counts = counts.reshape(-1, group, counts.shape[1]).sum(axis=1)
+            risk = risk.reshape(-1, group, risk.shape[1]).sum(axis=1)
+            users = users.reshape(-1, group).max(axis=1)
+
+        result = {
+            "resolution": series.name,
+            "step": series.step * group,
+            "t": (buckets * series.step).tolist(),
+            "unique_users": users.tolist(),
+            "risk_histogram": risk.tolist()
+        }
+        for i, field in enumerate(COUNT_FIELDS):
+            result[field] = counts[:, i].tolist()
+        return result
+
+    def summary(self, start: float, end: float = None) -> dict:
+        """Aralığın cəmləri, risk histoqramı və paylar"""
+        end = time.time() if end is None else end
+        series = self.pick(start, end)
+        _, counts, risk, users = series.window(start, end)
+        totals = dict(zip(COUNT_FIELDS, counts.sum(axis=0).tolist()))
+        replies = totals["memory"] + totals["deepseek"]
+        conversation = totals["customer"] + totals["bot"]
+        return {
+            "resolution": series.name,
+            "totals": totals,
+            "risk_histogram": risk.sum(axis=0).tolist(),
+            "peak_unique_users": int(users.max()) if len(users) else 0,
+            "bot_share": round(totals["bot"] / conversation, 4) if conversation else 0.0,
+            "memory_share": round(totals["memory"] / replies, 4) if replies else 0.0,
+            "deepseek_share": round(totals["deepseek"] / replies, 4) if replies else 0.0
+        }
+
+    # ===== PERSIST =====
+    def snapshot(self) -> dict:
+        """Massivlərin surəti (event loop-da götürülür, diskə thread-də yazılır)"""
+        arrays = {"last_id": np.array([self.last_id], dtype=np.int64)}
+        for series in self.series:
+            arrays.update(series.arrays())
+        return arrays
+
+    def save(self, arrays: dict = None):
+        """Atomik yazı: müvəqqəti fayl + os.replace"""
+        if self.path is None:
+            return
+        arrays = self.snapshot() if arrays is None else arrays
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, self.path)
+        self.saved_at = time.time()
+
+    def load(self) -> bool:
+        """Persist olunmuş rollup-ları yüklə (fayl yoxdursa və ya uyğun deyilsə False)"""
+        if self.path is None or not self.path.exists():
+            return False
+        with np.load(self.path) as data:
+            data = {key: data[key] for key in data.files}
+        if "last_id" not in data or not all(series.compatible(data) for series in self.series):
+            return False
+        for series in self.series:
+            series.restore(data)
+        self.last_id = int(data["last_id"][0])
+        return True
@@ -0,0 +1,97 @@
+# brain/app/services/view_cache.py
+import gzip
+import hashlib
+import time
+
+from fastapi import Request, Response
+
+from .fast_json import GZIP_LEVEL, GZIP_MIN_SIZE, dumps
+
+# Build anını göstərən sahələr - ETag-ə daxil deyil
+VOLATILE_KEYS = frozenset(("timestamp", "last_check"))
+
+
+class ViewCache:
+    """Data versiyasına bağlı hazır (serialize olunmuş) view keşi.
+
+    `version` hər ingest və ya state dəyişikliyində artır. View versiya
+    dəyişəndə və ya `max_age` saniyə keçəndə yenidən hesablanır (vaxt
+    pəncərələri üçün), amma `min_age`-dən tez yox - ingest axını zamanı
+    hər poll rebuild etmir, eyni pəncərədəki bütün poll-lar bir build-i
+    paylaşır. `bump(immediate=True)` (məs. alert təsdiqi) bu limiti keçir.
+
+    Build, serialize və gzip event loop-da bir dəfə olur (orjson GIL-i
+    buraxmır, thread-ə keçid SQLite yazıcısı ilə GIL üstündə gözləyir);
+    GZipMiddleware hər hit-i yenidən sıxmır. ETag məzmundan (build
+    vaxtı sahələri çıxılmaqla) hesablanır: rebuild eyni məzmunu verəndə
+    köhnə body və ETag saxlanılır - boş dashboard-un poll-u 304 almağa
+    davam edir.
+    """
+
+    def __init__(self, max_age: float = 5.0, min_age: float = 1.0):
+        self.max_age = max_age
+        self.min_age = min_age
+        self.version = 0
+        self._floor = 0     # bu versiyadan köhnə entry-lər min_age-dən asılı olmayaraq köhnədir
+        self._entries = {}  # name -> (version, built_at, etag, body, gzip body)
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def bump(self, immediate: bool = False):
+        """Data dəyişdi - bütün view-lar köhnəlir"""
+        self.version += 1
+        if immediate:
+            self._floor = self.version
+
+    def _fresh(self, entry, now: float) -> bool:
+        if entry is None or entry[0] < self._floor:
+            return False
+        age = now - entry[1]
+        return age < self.min_age or (entry[0] == self.version and age < self.max_age)
+
+    def get(self, name: str, build) -> tuple:
+        """(version, built_at, etag, body, gzip body); lazım olsa `build()` ilə yenidən qur"""
+        now = time.monotonic()
+        entry = self._entries.get(name)
+        if self._fresh(entry, now):
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        payload = build()
+        etag = f'"{name}-{hashlib.blake2b(dumps(_stable(payload)), digest_size=8).hexdigest()}"'
+        if entry is not None and entry[2] == etag:
+            # Məzmun dəyişməyib - body (və gzip) təkrar qurulmur
+            entry = self._entries[name] = (self.version, now, *entry[2:])
+            return entry
+
+        body = dumps(payload)
+        packed = gzip.compress(body, GZIP_LEVEL, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+        entry = self._entries[name] = (self.version, now, etag, body, packed)
+        return entry
+
+    def respond(self, request: Request, name: str, build) -> Response:
+        """ETag / If-None-Match və Accept-Encoding nəzərə alınmaqla JSON cavab"""
+        _, _, etag, body, packed = self.get(name, build)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        if packed is not None:
+            headers["Vary"] = "Accept-Encoding"
+            if "gzip" in request.headers.get("accept-encoding", ""):
+                # Content-Encoding olan cavabı GZipMiddleware yenidən sıxmır
+                headers["Content-Encoding"] = "gzip"
+                body = packed
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _stable(node):
+    """Payload-un build vaxtı sahələri olmadan surəti (yalnız dict-lər, siyahılara girmir)"""
+    if isinstance(node, dict):
+        return {key: _stable(value) for key, value in node.items() if key not in VOLATILE_KEYS}
+    return node
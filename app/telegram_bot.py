@@ -1,14 +1,24 @@
 # brain/app/telegram_bot.py
+import asyncio
 import logging
-import json
 import os
-import aiohttp
+import time
 from datetime import datetime
 from pathlib import Path
 from telegram import Update
+from telegram.error import BadRequest, RetryAfter
 from telegram.ext import ApplicationBuilder, ContextTypes, MessageHandler, filters, CommandHandler
 from dotenv import load_dotenv
 
+from app.ai.llm_client import LLMError, post_init, post_shutdown
+from app.ai.resilience import CircuitOpenError, resilient_client
+from app.ai.single_flight import SingleFlight, prompt_key
+from app.memory.context import ConversationContext, is_follow_up
+from app.memory.normalize import normalize_text
+from app.memory.similarity import SemanticIndex, np
+from app.memory.storage import get_store
+from app.services.outbox import Outbox
+
 # .env faylını yüklə
 load_dotenv()
 
@@ -36,39 +46,89 @@ logger.info(f"📁 Memory path: {memory_path}")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000/api")
+SEMANTIC_THRESHOLD = float(os.getenv("SEMANTIC_THRESHOLD", "0.65"))
+# Semantik matris hər entry üçün ~1 KB (dim=256, float32) - 200k ~200 MB
+SEMANTIC_MAX_ENTRIES = int(os.getenv("SEMANTIC_MAX_ENTRIES", "200000"))
+# Cavabı SSE ilə hissə-hissə göstər; Telegram bir mesajın tez-tez redaktəsini limitləyir
+DEEPSEEK_STREAM = os.getenv("DEEPSEEK_STREAM", "1") == "1"
+STREAM_EDIT_INTERVAL = float(os.getenv("STREAM_EDIT_INTERVAL", "1.0"))
+# Söhbət konteksti: bir DeepSeek prompt-unun maksimum ölçüsü (token)
+CONTEXT_BUDGET = int(os.getenv("CONTEXT_BUDGET", "1500"))
+SUMMARY_MAX_TOKENS = int(os.getenv("SUMMARY_MAX_TOKENS", "200"))
+
+# Satış köməkçisi kimi davran
+SYSTEM_PROMPT = """Sən bir satış köməkçisi botsan. Müştərilərə məhsullar, qiymətlər, çatdırılma, zəmanət, 
+geri qaytarma və digər satış məsələlərində kömək edirsən. Cavablarını qısa, aydın və faydalı ver. 
+Rəsmi və mehriban üslubdan istifadə et."""
 
 logger.info(f"🔑 TELEGRAM_TOKEN: {'TAPILDI' if TELEGRAM_TOKEN else 'YOX'}")
 logger.info(f"🤖 DEEPSEEK_API_KEY: {'TAPILDI' if DEEPSEEK_API_KEY else 'YOX'}")
 
 class MemoryManager:
-    def __init__(self):
-        self.memory_path = memory_path
+    def __init__(self, path: Path = memory_path):
+        self.memory_path = Path(path)
+        # Yazılar journal-a gedir, əsas fayl periodik kompaksiya olunur
+        self.store = get_store(self.memory_path)
+        # normallaşdırılmış pattern -> item (O(1) axtarış və dublikat yoxlaması)
+        self.index = {}
+        self.semantic = None
+        self.hits = 0            # exact indeksdən cavablar
+        self.semantic_hits = 0   # parafraz kimi tapılanlar
         self.memory_data = self.load_memory()
+        self.rebuild_index()
+    
+    def rebuild_index(self):
+        """Hash və semantik indeksləri memory_data-dan yenidən qur"""
+        self.index = {}
+        self.semantic = (SemanticIndex(threshold=SEMANTIC_THRESHOLD, max_entries=SEMANTIC_MAX_ENTRIES)
+                         if np is not None else None)
+        entries, keys = [], []
+        for item in self.memory_data.get("exact_matches", []):
+            item_keys = self._index_item(item)
+            # Semantik vektorlar sonda bir partiya ilə, eyni açarlardan
+            entries.extend((pattern, item) for pattern in item.get("patterns", []))
+            keys.extend(item_keys)
+        for item in self.memory_data.get("partial_matches", []):
+            self._index_item(item)
+        if self.semantic is not None:
+            self.semantic.add_many(entries, keys)
+            logger.info(f"🔎 Memory indeksi: {len(self.index)} pattern, "
+                        f"semantik {len(self.semantic)} ({self.semantic.nbytes / 2 ** 20:.1f} MB)")
+        else:
+            logger.info(f"🔎 Memory indeksi: {len(self.index)} pattern")
+    
+    def _index_semantic(self, item: dict):
+        if self.semantic is not None:
+            for pattern in item.get("patterns", []):
+                self.semantic.add(pattern, item)
+    
+    def _index_item(self, item: dict) -> list:
+        keys = [normalize_text(pattern) for pattern in item.get("patterns", [])]
+        for key in keys:
+            if key:
+                # Eyni açarlı köhnə item üstün qalır (əvvəlki ardıcıl axtarış kimi)
+                self.index.setdefault(key, item)
+        return keys
     
     def load_memory(self):
         """memory.json faylını yüklə"""
         try:
-            if self.memory_path.exists():
-                with open(self.memory_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                logger.info(f"✅ Memory yükləndi: {len(data.get('exact_matches', []))} sual")
-                return data
-            else:
-                # Əgər fayl yoxdursa, BOŞ yaradaq
-                empty_data = {"exact_matches": [], "partial_matches": []}
-                self.save_memory(empty_data)
-                logger.info("✅ Yeni boş memory.json yaradıldı")
-                return empty_data
+            # Fayl yoxdursa BOŞ yaradılır; journal-dakı yazılmamış entry-lər bərpa olunur
+            data = self.store.load({"exact_matches": [], "partial_matches": []})
+            logger.info(f"✅ Memory yükləndi: {len(data.get('exact_matches', []))} sual")
+            return data
                 
         except Exception as e:
             logger.error(f"❌ Memory yükləmə xətası: {e}")
             return {"exact_matches": [], "partial_matches": []}
     
-    def save_memory(self):
-        """memory.json faylına yaz"""
+    def save_memory(self, data=None):
+        """memory.json faylını tam yenidən yaz (kompaksiya)"""
         try:
-            with open(self.memory_path, 'w', encoding='utf-8') as f:
-                json.dump(self.memory_data, f, indent=2, ensure_ascii=False)
+            if data is not None:
+                self.store.reset(data)
+            else:
+                self.store.compact()
             logger.info(f"💾 Memory saxlandı: {len(self.memory_data.get('exact_matches', []))} sual")
             return True
         except Exception as e:
@@ -76,27 +136,54 @@ class MemoryManager:
             return False
     
     def find_response(self, message: str):
-        """Mesajı memory-də axtar - SADƏCƏ EXACT MATCH"""
-        message = message.strip()
-        
-        for item in self.memory_data.get("exact_matches", []):
-            for pattern in item.get("patterns", []):
-                if message == pattern:
-                    logger.info(f"✅ Exact match tapıldı: '{pattern}'")
-                    return item.get("response")
+        """Mesajı memory-də axtar - normallaşdırılmış EXACT MATCH, O(1)"""
+        item = self.index.get(normalize_text(message))
+        if item is not None:
+            self.hits += 1
+            logger.info(f"✅ Exact match tapıldı: '{message[:30]}'")
+            return item.get("response")
         return None
     
+    def find_similar(self, message: str):
+        """Yaxın-dublikat (parafraz) sualı tap: (score, pattern, item) və ya None.
+        
+        Yalnız oxuyur - thread-də çağırmaq olar (NumPy GIL-i buraxır).
+        """
+        if self.semantic is None:
+            return None
+        return self.semantic.best(message)
+    
+    def remember_paraphrase(self, message: str, match) -> str:
+        """Tapılan parafrazı partial_matches-ə yaz və cavabı qaytar.
+        
+        Növbəti dəfə eyni parafraz exact indeksdən O(1) tapılır.
+        """
+        score, pattern, item = match
+        self.semantic_hits += 1
+        logger.info(f"🧩 Oxşar sual tapıldı ({score:.2f}): '{pattern[:30]}'")
+        
+        paraphrase = {
+            "patterns": [message.strip()],
+            "response": item.get("response"),
+            "matched": pattern,
+            "score": round(score, 3),
+            "added": datetime.now().isoformat(),
+            "source": "semantic"
+        }
+        self.store.append(["partial_matches"], paraphrase)
+        self._index_item(paraphrase)
+        return item.get("response")
+    
     def add_question(self, question: str, answer: str):
         """Yeni sual-cavabı memory-ə əlavə et"""
         try:
             question = question.strip()
             answer = answer.strip()
             
-            # Əvvəlcə yoxla ki, artıq var
-            for item in self.memory_data.get("exact_matches", []):
-                if question in item.get("patterns", []):
-                    logger.info(f"ℹ️ Bu sual artıq var: '{question[:30]}...'")
-                    return False
+            # Əvvəlcə yoxla ki, artıq var (normallaşdırılmış açarla)
+            if normalize_text(question) in self.index:
+                logger.info(f"ℹ️ Bu sual artıq var: '{question[:30]}...'")
+                return False
             
             # Yeni sual əlavə et
             new_item = {
@@ -106,18 +193,24 @@ class MemoryManager:
                 "source": "deepseek_learned"
             }
             
-            self.memory_data["exact_matches"].append(new_item)
+            # Journal-a yaz (bütün fayl yenidən yazılmır)
+            self.store.append(["exact_matches"], new_item)
+            self._index_item(new_item)
+            self._index_semantic(new_item)
             
-            # Fayla yaz
-            if self.save_memory():
-                logger.info(f"🧠 Yeni sual əlavə edildi: '{question[:30]}...'")
-                return True
-            return False
+            logger.info(f"🧠 Yeni sual əlavə edildi: '{question[:30]}...'")
+            return True
             
         except Exception as e:
             logger.error(f"❌ Sual əlavə etmə xətası: {e}")
             return False
     
+    def clear(self):
+        """Bütün yaddaşı təmizlə"""
+        saved = self.save_memory({"exact_matches": [], "partial_matches": []})
+        self.rebuild_index()
+        return saved
+    
     def get_stats(self):
         """Memory statistikaları"""
         exact = len(self.memory_data.get("exact_matches", []))
@@ -125,100 +218,226 @@ class MemoryManager:
         return {"total": exact + partial, "exact": exact, "partial": partial}
 
 class DeepSeekClient:
-    def __init__(self):
-        self.api_key = DEEPSEEK_API_KEY
-        self.base_url = "https://api.deepseek.com/v1/chat/completions"
+    def __init__(self, client=resilient_client, system_prompt: str = SYSTEM_PROMPT):
+        # Paylaşılan pool-lu client, limit/retry/circuit breaker qatı ilə
+        self.client = client
+        self.system_prompt = system_prompt
     
-    async def ask(self, question: str):
-        """DeepSeek API-dan cavab al"""
-        if not self.api_key:
+    def _messages(self, question: str):
+        return [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": question}
+        ]
+    
+    async def ask(self, question: str, on_text=None, messages: list = None):
+        """DeepSeek API-dan cavab al.
+        
+        `messages` - hazır prompt (söhbət konteksti ilə); verilməyibsə
+        yalnız system + sual göndərilir.
+        `on_text` verilibsə cavab SSE ilə axır və hər parçadan sonra
+        indiyə qədərki mətnlə `await on_text(text)` çağırılır.
+        """
+        messages = messages or self._messages(question)
+        if not self.client.api_key:
             logger.error("❌ DeepSeek API KEY yoxdur!")
             return None
         
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Satış köməkçisi kimi davran
-            system_prompt = """Sən bir satış köməkçisi botsan. Müştərilərə məhsullar, qiymətlər, çatdırılma, zəmanət, 
-            geri qaytarma və digər satış məsələlərində kömək edirsən. Cavablarını qısa, aydın və faydalı ver. 
-            Rəsmi və mehriban üslubdan istifadə et."""
-            
-            payload = {
-                "model": "deepseek-chat",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": question}
-                ],
-                "max_tokens": 300,
-                "temperature": 0.7
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.base_url, 
-                    json=payload, 
-                    headers=headers, 
-                    timeout=30
-                ) as response:
-                    
-                    if response.status == 200:
-                        result = await response.json()
-                        reply = result["choices"][0]["message"]["content"]
-                        logger.info("✅ DeepSeek cavabı alındı")
-                        return reply
-                    else:
-                        error = await response.text()
-                        logger.error(f"❌ DeepSeek xətası: {response.status}")
-                        return None
+            if on_text is None:
+                reply = await self.client.chat(messages, max_tokens=300, temperature=0.7)
+            else:
+                parts = []
+                async for delta in self.client.stream_chat(messages, max_tokens=300, temperature=0.7):
+                    parts.append(delta)
+                    await on_text("".join(parts))
+                reply = "".join(parts)
+            logger.info("✅ DeepSeek cavabı alındı")
+            return reply or None
                         
+        except CircuitOpenError:
+            # Upstream sağlam deyil - 30s timeout gözləmədən fallback cavab
+            logger.warning("⚡ DeepSeek circuit açıqdır - fallback cavab")
+            return None
+        except LLMError as e:
+            logger.error(f"❌ DeepSeek xətası: {e}")
+            return None
         except Exception as e:
             logger.error(f"🔥 DeepSeek xətası: {e}")
             return None
 
+class StreamingReply:
+    """Axan cavabı bir Telegram mesajında göstər.
+    
+    İlk parça gələn kimi mesaj göndərilir, sonra ən çoxu `interval`
+    saniyədə bir `edit_message_text` ilə yenilənir (RetryAfter-də gözlənilir).
+    Son mətn `finish()`-də mütləq göstərilir.
+    """
+    
+    def __init__(self, message, interval: float = STREAM_EDIT_INTERVAL):
+        self.message = message
+        self.interval = interval
+        self.sent = None
+        self.shown = ""
+        self.next_edit = 0.0
+        self.started = time.monotonic()
+        self.first_text_at = None
+    
+    async def update(self, text: str):
+        """Axından yeni mətn - throttling ilə göstər"""
+        if self.sent is None:
+            self.first_text_at = time.monotonic() - self.started
+            try:
+                self.sent = await self.message.reply_text(text)
+                self.shown = text
+            except Exception as e:
+                logger.warning(f"⚠️ Axın mesajı göndərilmədi: {e}")
+            self.next_edit = time.monotonic() + self.interval
+        elif time.monotonic() >= self.next_edit:
+            await self._edit(text)
+    
+    async def finish(self, text: str):
+        """Son mətni göstər"""
+        if self.sent is None:
+            self.sent = await self.message.reply_text(text)
+            self.shown = text
+            return
+        while text != self.shown:
+            # Limitdə olsaq belə son mətn itməməlidir
+            delay = self.next_edit - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if not await self._edit(text):
+                break
+    
+    async def _edit(self, text: str) -> bool:
+        if text == self.shown:
+            return True
+        try:
+            await self.sent.edit_text(text)
+            self.shown = text
+        except RetryAfter as e:
+            retry_after = e.retry_after
+            seconds = retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else retry_after
+            self.next_edit = time.monotonic() + seconds
+            return True
+        except BadRequest as e:
+            # "Message is not modified" və s. - təkrar cəhd mənasızdır
+            logger.debug(f"Edit alınmadı: {e}")
+            self.shown = text
+        except Exception as e:
+            logger.warning(f"⚠️ Axın mesajı redaktə olunmadı: {e}")
+            return False
+        self.next_edit = time.monotonic() + self.interval
+        return True
+
 # Global instance'lar
 memory = MemoryManager()
 deepseek = DeepSeekClient()
+# Eyni anda gələn eyni suallar üçün bir DeepSeek çağırışı
+deepseek_flight = SingleFlight()
+# Monitorinq API-a mesajlar (cavab gözləmədən, diskə yazılan növbə ilə)
+outbox = Outbox(f"{API_BASE_URL}/telegram/messages/bulk", data_dir / "outbox.jsonl")
+
+async def summarize_turns(previous: str, turns: list) -> str:
+    """Köhnə replikaların xülasəsi (ConversationContext arxa fonda çağırır)"""
+    dialog = "\n".join(
+        f"{'Müştəri' if turn['role'] == 'user' else 'Bot'}: {turn['content']}" for turn in turns
+    )
+    return await deepseek.client.chat([
+        {"role": "system", "content": "Satış söhbətinin qısa xülasəsini yaz: müştərinin "
+                                      "maraqlandığı məhsullar, verilən əsas məlumatlar, açıq suallar. "
+                                      "3-4 cümlə."},
+        {"role": "user", "content": f"Əvvəlki xülasə: {previous or '-'}\n\nYeni hissə:\n{dialog}"}
+    ], max_tokens=SUMMARY_MAX_TOKENS, temperature=0.2)
+
+conversation = ConversationContext(
+    summarize=summarize_turns,
+    budget=CONTEXT_BUDGET,
+    summary_tokens=SUMMARY_MAX_TOKENS
+)
+
+async def ask_and_learn(question: str, stream: StreamingReply = None, messages: list = None,
+                        learn: bool = True):
+    """DeepSeek-dən cavab al və bir dəfə yaddaşa yaz (single-flight leader).
+    
+    `learn=False` - sual əvvəlki söhbətə istinad edir, cavab ümumi yaddaşa yazılmır.
+    """
+    reply = await deepseek.ask(question, on_text=stream.update if stream else None, messages=messages)
+    if reply and learn:
+        # Gözləyənlər oyanmamış yaz - sonrakı suallar artıq memory-dən tapılır
+        if memory.add_question(question, reply):
+            logger.info(f"💾 Yeni sual memory-ə əlavə edildi: '{question[:30]}...'")
+        else:
+            logger.error("❌ Sual memory-ə əlavə edilə bilmədi!")
+    return reply
 
 # ƏSAS MESAJ HANDLER - SADƏ VERSİYA
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     user_message = update.message.text
+    user_id = str(user.id)
+    username = user.username or user.first_name
     
     logger.info(f"📨 {user.first_name}: {user_message[:50]}...")
+    outbox.put(user_id, username, user_message)
     
     # 1. ƏVVƏLCƏ MEMORY-DƏ AXTAR
     memory_response = memory.find_response(user_message)
     
+    if not memory_response:
+        # Parafraz ola bilər - semantik axtarış (event loop-u bloklamasın deyə thread-də)
+        match = await asyncio.to_thread(memory.find_similar, user_message)
+        if match:
+            memory_response = memory.remember_paraphrase(user_message, match)
+    
     if memory_response:
         # MEMORY-DƏ TAPDI - CAVAB VER
         logger.info("✅ Memory-dən cavab tapıldı")
         await update.message.reply_text(memory_response)
+        outbox.put(user_id, username, memory_response, is_bot=True, source="memory")
+        conversation.add_turn(user_id, "user", user_message)
+        conversation.add_turn(user_id, "assistant", memory_response)
         return
     
     # 2. MEMORY-DƏ YOXDURSA - DEEPSEEK ÇAĞIR
     logger.info("❌ Memory-də yox, DeepSeek çağırılır...")
     
-    # API-dan cavab al
-    deepseek_response = await deepseek.ask(user_message)
+    # Prompt: son söhbət + xülasə, CONTEXT_BUDGET token-ə sığdırılmış
+    messages = conversation.build_messages(user_id, deepseek.system_prompt, user_message)
+    
+    # API-dan cavab al - eyni prompt (söhbət konteksti daxil) artıq soruşulursa onu gözlə.
+    # Fərqli tarixçəli user-ların cavabı paylaşılmır. Söhbətə istinad edən sual
+    # ("bəs onun qiyməti?") öyrənilmir. Axın yalnız leader-in söhbətində
+    # göstərilir, gözləyənlər son cavabı alır.
+    stream = StreamingReply(update.message) if DEEPSEEK_STREAM else None
+    follow_up = is_follow_up(user_message)
+    deepseek_response, shared = await deepseek_flight.do(
+        prompt_key(messages), lambda: ask_and_learn(user_message, stream, messages, learn=not follow_up)
+    )
+    if shared:
+        logger.info("🔗 Eyni sual artıq soruşulurdu - cavab paylaşıldı")
+        stream = None
     
     if not deepseek_response:
-        # DeepSeek xətası
-        await update.message.reply_text("Üzr istəyirəm, texniki problem yaşandı. Bir az sonra yenidən cəhd edin.")
+        # DeepSeek xətası (axın yarımçıq kəsilibsə göstərilən mətn əvəz olunur)
+        error_text = "Üzr istəyirəm, texniki problem yaşandı. Bir az sonra yenidən cəhd edin."
+        if stream is not None and stream.sent is not None:
+            await stream.finish(error_text)
+        else:
+            await update.message.reply_text(error_text)
+        outbox.put(user_id, username, error_text, is_bot=True, source="error")
         return
     
-    # 3. CAVABI GÖNDƏR
-    await update.message.reply_text(deepseek_response)
-    
-    # 4. YENİ SUALI MEMORY-Ə ƏLAVƏ ET (HƏR ŞEYDƏN ƏVVƏL!)
-    success = memory.add_question(user_message, deepseek_response)
-    
-    if success:
-        logger.info(f"💾 Yeni sual memory-ə əlavə edildi: '{user_message[:30]}...'")
+    # 3. CAVABI GÖNDƏR (yaddaşa ask_and_learn-də yazılıb)
+    if stream is not None:
+        await stream.finish(deepseek_response)
+        logger.info(f"⏱️ İlk mətn {stream.first_text_at or 0:.2f}s-də göstərildi")
     else:
-        logger.error("❌ Sual memory-ə əlavə edilə bilmədi!")
+        await update.message.reply_text(deepseek_response)
+    outbox.put(user_id, username, deepseek_response, is_bot=True, source="deepseek")
+    
+    conversation.add_turn(user_id, "user", user_message)
+    conversation.add_turn(user_id, "assistant", deepseek_response)
 
 # COMMAND HANDLERS
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -253,6 +472,8 @@ Məhsullar, qiymətlər, çatdırılma və digər satış məsələlərində kö
 async def memory_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Memory statusunu göstər"""
     stats = memory.get_stats()
+    flight = deepseek_flight.stats()
+    llm = resilient_client.stats()
     
     # Son 5 sualı göstər
     recent = memory.memory_data.get("exact_matches", [])[-5:]
@@ -268,6 +489,14 @@ async def memory_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 • Exact matches: {stats['exact']}
 • Partial matches: {stats['partial']}
 
+⚡ **CAVAB MƏNBƏLƏRİ**
+
+• Memory hit: {memory.hits}
+• Oxşar sual hit: {memory.semantic_hits}
+• DeepSeek çağırışı: {flight['leaders']}
+• Birləşdirilən sual: {flight['coalesced']}
+• DeepSeek limiti: {llm['limit']} (aktiv {llm['in_flight']}), circuit: {llm['circuit']}
+
 📁 Fayl: {memory_path}
 
 📈 **Son 5 sual:**
@@ -281,11 +510,19 @@ async def memory_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def clear_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Memory-i təmizlə (sadəcə test üçün)"""
     # Yalnız admin üçün
-    memory.memory_data = {"exact_matches": [], "partial_matches": []}
-    memory.save_memory()
+    memory.clear()
+    conversation.reset(str(update.effective_user.id))
     
     await update.message.reply_text("✅ Memory təmizləndi!")
 
+async def on_startup(application):
+    await post_init(application)
+    await outbox.start()
+
+async def on_shutdown(application):
+    await outbox.stop()
+    await post_shutdown(application)
+
 # MAIN
 def main():
     # Token yoxla
@@ -297,7 +534,13 @@ def main():
     
     try:
         # Botu qur
-        app = ApplicationBuilder().token(TELEGRAM_TOKEN).build()
+        app = (
+            ApplicationBuilder()
+            .token(TELEGRAM_TOKEN)
+            .post_init(on_startup)         # LLM HTTP pool-u və outbox-u aç
+            .post_shutdown(on_shutdown)    # və bağla
+            .build()
+        )
         
         # Əmrlər
         app.add_handler(CommandHandler("start", start_command))
@@ -0,0 +1,59 @@
+# brain/benchmarks/alert_index.py
+"""Alert siyahısının qiyməti mesaj sayından asılı olmamalıdır.
+
+Köhnə üsul (son 1 saatın yüksək riskli mesajlarını siyahıya yığıb kəsmək)
+AlertIndex.page() ilə müqayisə olunur - hər ölçüdə eyni user sayı (dedupe
+sayəsində alert sayı user sayı ilə məhdudlaşır).
+
+İşə salmaq:  python -m benchmarks.alert_index [--users 500]
+"""
+import argparse
+import random
+import time
+
+from app.models.chat import MessageRecord
+from app.services.alert_index import AlertIndex
+from app.services.message_store import MessageStore
+
+
+def old_alerts(store: MessageStore, now: float) -> list:
+    high_risk_msgs = list(store.high_risk_since(now - 3600))
+    high_risk_msgs.reverse()
+    return high_risk_msgs[:10]
+
+
+def measure(fn, repeat: int = 200) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    print(f"{'mesaj':>8} {'alert':>6} {'köhnə µs':>10} {'top-10 µs':>10} {'səhifə 3 µs':>12}")
+    for count in (1_000, 10_000, 100_000):
+        store = MessageStore(max_messages=count, max_alerts=count)
+        index = AlertIndex()
+        now = time.time()
+        for i in range(count):
+            record = MessageRecord(str(rng.randrange(args.users)), "user", "mesaj",
+                                   now - 3000 + i * 3000 / count,
+                                   risk_score=rng.choice((0, 10, 40, 75, 90)))
+            store.add(record)
+            index.observe(record)
+
+        _, cursor = index.page(20)
+        _, cursor = index.page(20, cursor)
+        old_us = measure(lambda: old_alerts(store, now))
+        top_us = measure(lambda: index.top(10))
+        page_us = measure(lambda: index.page(20, cursor))
+        print(f"{count:>8} {len(index):>6} {old_us:>10.1f} {top_us:>10.1f} {page_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
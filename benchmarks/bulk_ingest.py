@@ -0,0 +1,87 @@
+# brain/benchmarks/bulk_ingest.py
+"""Ingest sürəti: /api/telegram/message (mesaj başına sorğu) vs bulk endpoint.
+
+App prosesdaxili işə salınır (httpx ASGITransport, şəbəkə yoxdur) - fərq
+sorğu başına xərcdir: validasiya, log, keş versiyası, broadcast.
+DB müvəqqəti faylda yaradılır.
+
+İşə salmaq:  python -m benchmarks.bulk_ingest [--messages 20000 --batch 1000]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+_tmp_dir = tempfile.mkdtemp()
+os.environ.setdefault("MESSAGES_DB_PATH", os.path.join(_tmp_dir, "bench.db"))
+os.environ.setdefault("ROLLUPS_PATH", os.path.join(_tmp_dir, "rollups.npz"))
+
+import httpx
+
+from app import main as app_main
+
+
+def make_messages(count: int, users: int, rng: random.Random) -> list:
+    return [
+        {
+            "user_id": str(rng.randrange(users)),
+            "username": f"user{i % users}",
+            "message": f"Salam, sifariş {i} haqqında sual",
+            "risk_score": rng.choice((0, 10, 30, 65, 85)),
+            "is_bot": i % 2 == 1
+        }
+        for i in range(count)
+    ]
+
+
+async def run(args):
+    rng = random.Random(11)
+    messages = make_messages(args.messages, args.users, rng)
+    transport = httpx.ASGITransport(app=app_main.app)
+
+    await app_main.startup_event()
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            single = messages[:args.single]
+            started = time.perf_counter()
+            for message in single:
+                await client.post("/api/telegram/message", json=message)
+            elapsed = time.perf_counter() - started
+            print(f"tək mesaj:     {len(single) / elapsed:9.0f} mesaj/s ({len(single)} mesaj)")
+
+            started = time.perf_counter()
+            for start in range(0, len(messages), args.batch):
+                response = await client.post("/api/telegram/messages/bulk",
+                                             json=messages[start:start + args.batch])
+                assert response.json()["accepted"] == len(messages[start:start + args.batch])
+            elapsed = time.perf_counter() - started
+            print(f"bulk JSON:     {len(messages) / elapsed:9.0f} mesaj/s (partiya {args.batch})")
+
+            body = "\n".join(json.dumps(message, ensure_ascii=False) for message in messages).encode()
+            started = time.perf_counter()
+            response = await client.post("/api/telegram/messages/bulk", content=body,
+                                         headers={"Content-Type": "application/x-ndjson"})
+            elapsed = time.perf_counter() - started
+            assert response.json()["accepted"] == len(messages)
+            print(f"bulk NDJSON:   {len(messages) / elapsed:9.0f} mesaj/s (tək axın)")
+    finally:
+        await app_main.shutdown_event()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--single", type=int, default=2_000, help="tək endpoint üçün mesaj sayı")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
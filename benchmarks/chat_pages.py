@@ -0,0 +1,91 @@
+# brain/benchmarks/chat_pages.py
+"""Söhbət tarixçəsi: birinci və dərin səhifələrin gecikməsi eyni olmalıdır.
+
+Bir user-ın böyük tarixçəsi müvəqqəti DB-yə yazılır, sonra
+MessageStore.user_page (yaddaş) və MessageDB.read_user_page (keyset)
+ilk, orta və ən dərin cursor-larla ölçülür. Dərin səhifə birincidən
+`--max-ratio` dəfədən çox yavaşdırsa FAIL.
+
+İşə salmaq:  python -m benchmarks.chat_pages [--messages 300000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from app.models.chat import MessageRecord
+from app.services.message_db import EXTRA_COLUMNS, INDEXES, INSERT_SQL, SCHEMA, MessageDB
+from app.services.message_store import MessageStore
+
+PAGE = 50
+
+
+def fill_db(path: str, messages: int, users: int):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute(SCHEMA)
+    for column, definition in EXTRA_COLUMNS.items():
+        conn.execute(f"ALTER TABLE messages ADD COLUMN {column} {definition}")
+    for statement in INDEXES:
+        conn.execute(statement)
+    start = time.time() - messages
+    # Hər `users` mesajdan biri ölçülən user-ındır (id-lər səpələnmiş olur)
+    conn.executemany(INSERT_SQL, (
+        (i + 1, None, 1 if i % users == 0 else 2 + i % 997, "user", f"mesaj {i}", start + i,
+         0, 0, 0, None, None)
+        for i in range(messages)
+    ))
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, repeat: int = 200) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=300_000)
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--max-ratio", type=float, default=3.0)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "pages.db")
+    fill_db(path, args.messages, args.users)
+    db = MessageDB(path)
+    db.open()
+    ids = [row[0] for row in db._conn.execute("SELECT id FROM messages WHERE user_id = 1 ORDER BY id")]
+    print(f"DB: {args.messages} sətir, user 1: {len(ids)} mesaj")
+
+    store = MessageStore()
+    for msg_id in ids[-store.per_user_limit:]:
+        store.add(MessageRecord("1", "user", "", 0.0, id=msg_id))
+    buffered = ids[-store.per_user_limit:]
+
+    ok = True
+    cases = {
+        "yaddaş": (lambda cursor: store.user_page("1", PAGE, before=cursor),
+                   (None, buffered[len(buffered) // 2], buffered[PAGE])),
+        "DB": (lambda cursor: db.read_user_page("1", PAGE, before_id=cursor),
+               (None, ids[len(ids) // 2], ids[PAGE])),
+    }
+    for name, (fetch, cursors) in cases.items():
+        first, middle, deep = (timed(lambda: fetch(cursor)) for cursor in cursors)
+        passed = deep < first * args.max_ratio and len(fetch(cursors[2])) == PAGE
+        ok = ok and passed
+        print(f"  [{'OK' if passed else 'FAIL'}] {name:<7} ilk {first:7.1f} µs, orta {middle:7.1f} µs, "
+              f"dərin {deep:7.1f} µs")
+
+    db._conn.close()
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# brain/benchmarks/export_rss.py
+"""Export sabit yaddaşla işləməlidir: 5M sətirlik DB ixrac olunarkən RSS ölçülür.
+
+Müvəqqəti DB sintetik mesajlarla doldurulur, sonra /api/export/messages
+ASGI app-ə birbaşa çağırılır (httpx ASGITransport cavabı yaddaşa yığır,
+ona görə `send` özümüz yazırıq - body hissələri sayılıb atılır). RSS
+hər 50 ms /proc/self/status-dan oxunur; artım limitdən çoxdursa FAIL.
+
+İşə salmaq:  python -m benchmarks.export_rss [--rows 5000000 --limit-mb 64]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+_tmp_dir = tempfile.mkdtemp()
+os.environ.setdefault("MESSAGES_DB_PATH", os.path.join(_tmp_dir, "export.db"))
+os.environ.setdefault("ROLLUPS_PATH", os.path.join(_tmp_dir, "rollups.npz"))
+
+from app import main as app_main
+from app.services.message_db import EXTRA_COLUMNS, INSERT_SQL, SCHEMA
+
+TEXTS = [
+    "Salam, məhsulun qiyməti nə qədərdir?",
+    "Sifarişim gecikir, nə baş verib?",
+    "Məhsuldan narazıyam, qaytarmaq istəyirəm!",
+    "Çatdırılma Bakı daxilində pulsuzdur? Ünvanım Nərimanov rayonudur.",
+]
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def fill_db(path: str, rows: int):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute(SCHEMA)
+    for column, definition in EXTRA_COLUMNS.items():
+        conn.execute(f"ALTER TABLE messages ADD COLUMN {column} {definition}")
+    rng = random.Random(22)
+    start = time.time() - 30 * 86400   # rehydrate pəncərəsindən kənarda
+    batch = 100_000
+    for offset in range(0, rows, batch):
+        conn.executemany(INSERT_SQL, (
+            (i + 1, None, rng.randrange(10_000), "user", TEXTS[i % len(TEXTS)], start + i * 0.1,
+             i % 2, 0, rng.choice((0, 20, 75, 90)), "refund: qaytarmaq" if i % 4 == 2 else None,
+             "memory" if i % 2 else None)
+            for i in range(offset, min(rows, offset + batch))
+        ))
+        conn.commit()
+    conn.close()
+
+
+async def export(query: str) -> tuple:
+    """ASGI app-i birbaşa çağır; (status, body baytları, pik RSS) qaytar"""
+    result = {"status": None, "bytes": 0}
+    peak = rss_mb()
+    done = asyncio.Event()
+
+    requested = False
+
+    async def receive():
+        # Sorğu bir dəfə verilir, sonra client "bağlı qalır" (disconnect export bitəndə)
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            result["bytes"] += len(message.get("body", b""))
+
+    async def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, rss_mb())
+            await asyncio.sleep(0.05)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/export/messages", "raw_path": b"/api/export/messages",
+        "query_string": query.encode(), "headers": [], "client": ("bench", 1), "server": ("bench", 80),
+    }
+    sampler = asyncio.create_task(sample())
+    await app_main.app(scope, receive, send)
+    done.set()
+    await sampler
+    return result["status"], result["bytes"], peak
+
+
+async def run(args) -> bool:
+    await app_main.message_db.start()
+    ok = True
+    try:
+        for query in ("format=csv", "format=ndjson&gzip=true", "format=csv&min_risk=70"):
+            before = rss_mb()
+            started = time.perf_counter()
+            status, size, peak = await export(query)
+            elapsed = time.perf_counter() - started
+            growth = peak - before
+            passed = status == 200 and growth < args.limit_mb
+            ok = ok and passed
+            print(f"  [{'OK' if passed else 'FAIL'}] {query:<24} {size / 1e6:8.1f} MB, {elapsed:5.1f}s, "
+                  f"RSS {before:.0f} -> pik {peak:.0f} MB (+{growth:.1f})")
+    finally:
+        await app_main.message_db.stop()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--limit-mb", type=float, default=64)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    started = time.perf_counter()
+    fill_db(os.environ["MESSAGES_DB_PATH"], args.rows)
+    print(f"DB: {args.rows} sətir ({time.perf_counter() - started:.1f}s)")
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# brain/benchmarks/json_responses.py
+"""JSON cavab qatı: serialize CPU-su və şəbəkəyə gedən baytlar (əvvəl / sonra).
+
+Yaddaş sintetik mesajlarla doldurulur, sonra ən çox poll olunan
+payload-lar üçün ölçülür:
+  - əvvəl: FastAPI default yolu - jsonable_encoder + stdlib json.dumps
+  - sonra: fast_json.dumps (orjson, yoxdursa stdlib), encoder atlanır
+  - baytlar: xam JSON və GZipMiddleware-in göndərdiyi (Accept-Encoding: gzip)
+
+İşə salmaq:  python -m benchmarks.json_responses [--messages 50000 --users 2000]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import zlib
+
+_tmp_dir = tempfile.mkdtemp()
+os.environ.setdefault("MESSAGES_DB_PATH", os.path.join(_tmp_dir, "bench.db"))
+os.environ.setdefault("ROLLUPS_PATH", os.path.join(_tmp_dir, "rollups.npz"))
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+
+from app import main as app_main
+from app.api.dashboard import build_dashboard_overview, get_real_active_chats
+from app.models.chat import MessageRecord
+from app.services import fast_json
+
+TEXTS = [
+    "Salam, məhsulun qiyməti nə qədərdir?",
+    "Sifarişim gecikir, nə baş verib?",
+    "Məhsuldan narazıyam, pulumu geri qaytarın!",
+    "Çatdırılma Bakı daxilində pulsuzdur?",
+]
+
+
+def fill(messages: int, users: int):
+    rng = random.Random(24)
+    now = time.time()
+    for i in range(messages):
+        user = rng.randrange(users)
+        text = TEXTS[i % len(TEXTS)]
+        app_main.ingest_record(MessageRecord(
+            str(user), f"user{user}", text, now - (messages - i) * 0.05,
+            risk_score=rng.choice((0, 10, 30, 65, 85)), is_bot=i % 2 == 1
+        ), persist=False)
+
+
+def per_call_us(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def stdlib_render(payload) -> bytes:
+    """FastAPI/Starlette-in default yolu (jsonable_encoder + JSONResponse.render)"""
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+async def wire_bytes(client: httpx.AsyncClient, path: str, gzip: bool) -> tuple:
+    response = await client.get(path, headers={"Accept-Encoding": "gzip" if gzip else "identity"})
+    return response.num_bytes_downloaded, response.headers.get("content-encoding", "-")
+
+
+async def main_async(args):
+    fill(args.messages, args.users)
+    user_id, _ = next(app_main.message_store.recent_users(0))
+    payloads = {
+        "overview": build_dashboard_overview,
+        "active-chats": get_real_active_chats,
+        "chats/active": app_main.build_active_chats,
+        "chat full": lambda: app_main.build_full_chat(user_id),
+    }
+    encoder = "orjson" if fast_json.orjson is not None else "stdlib json"
+    print(f"{args.messages} mesaj, {app_main.message_store.user_count} user; encoder: {encoder}")
+    print(f"{'payload':<14}{'əvvəl µs':>10}{'sonra µs':>10}{'sürət':>8}{'JSON KB':>10}{'gzip KB':>10}")
+    for name, build in payloads.items():
+        payload = build()
+        before = per_call_us(lambda: stdlib_render(payload), args.repeat)
+        after = per_call_us(lambda: fast_json.dumps(payload), args.repeat)
+        raw = fast_json.dumps(payload)
+        compressed = len(zlib.compress(raw, fast_json.GZIP_LEVEL))
+        print(f"{name:<14}{before:>10.1f}{after:>10.1f}{before / after:>7.1f}x"
+              f"{len(raw) / 1024:>10.1f}{compressed / 1024:>10.1f}")
+
+    # Şəbəkədə: eyni endpoint gzip ilə və gzip-siz
+    transport = httpx.ASGITransport(app=app_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"\n{'endpoint':<34}{'identity B':>12}{'gzip B':>10}{'encoding':>10}")
+        for path in ("/api/dashboard/overview", "/api/chats/active", "/api/dashboard/active-chats",
+                     f"/api/chats/{user_id}/full", "/health"):
+            plain, _ = await wire_bytes(client, path, gzip=False)
+            packed, encoding = await wire_bytes(client, path, gzip=True)
+            print(f"{path:<34}{plain:>12}{packed:>10}{encoding:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# brain/benchmarks/llm_client.py
+"""DeepSeek çağırışı: hər sual üçün yeni ClientSession vs paylaşılan LLMClient pool-u.
+
+Lokal aiohttp stub server chat completion cavabını təqlid edir (--delay ilə
+model gecikməsi). Hər iki variant "localhost" ünvanına eyni sorğunu göndərir;
+fərq bağlantı qurma + DNS qiymətidir. Real API-da TLS handshake bu fərqi
+xeyli artırır.
+
+İşə salmaq:  python -m benchmarks.llm_client [--requests 300 --concurrency 8]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+from aiohttp import web
+
+from app.ai.llm_client import LLMClient
+
+MESSAGES = [{"role": "user", "content": "Çatdırılma neçə gün çəkir?"}]
+
+
+async def start_stub(port: int, delay: float):
+    async def completions(request):
+        await request.json()
+        if delay:
+            await asyncio.sleep(delay)
+        return web.json_response({"choices": [{"message": {"content": "2-3 iş günü"}}]})
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", port)
+    await site.start()
+    return runner
+
+
+async def ask_new_session(url: str):
+    """Köhnə DeepSeekClient.ask davranışı"""
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json={"model": "deepseek-chat", "messages": MESSAGES},
+                                headers={"Authorization": "Bearer test"}, timeout=30) as response:
+            result = await response.json()
+            return result["choices"][0]["message"]["content"]
+
+
+async def measure(call, total: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies, time.perf_counter() - started
+
+
+def report(name, latencies, elapsed):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<22} mean={statistics.mean(latencies) * 1e3:6.2f}ms "
+          f"p50={statistics.median(latencies) * 1e3:6.2f}ms p99={p99 * 1e3:6.2f}ms "
+          f"{len(latencies) / elapsed:7.0f} req/s")
+
+
+async def run(args):
+    runner = await start_stub(args.port, args.delay)
+    url = f"http://localhost:{args.port}/v1/chat/completions"
+    client = LLMClient(url=url, api_key="test")
+    try:
+        # İsinmə
+        await ask_new_session(url)
+        await client.chat(MESSAGES)
+
+        latencies, elapsed = await measure(lambda: ask_new_session(url), args.requests, args.concurrency)
+        report("yeni session/sorğu", latencies, elapsed)
+
+        latencies, elapsed = await measure(lambda: client.chat(MESSAGES), args.requests, args.concurrency)
+        report("paylaşılan pool", latencies, elapsed)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.0, help="stub cavab gecikməsi (s)")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
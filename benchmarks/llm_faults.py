@@ -0,0 +1,171 @@
+# brain/benchmarks/llm_faults.py
+"""ResilientClient üçün fault injection: lokal stub yavaşladılır / xəta verir.
+
+Ssenarilər:
+- flaky:    sorğuların bir hissəsi 503 - retry ilə uğur faizi
+- slow:     gecikmə latency_target-dən yuxarı - AIMD limiti azalır
+- outage:   hamısı 503 - circuit açılır, sonrakılar dərhal imtina alır
+- recovery: stub sağalır - reset_timeout-dan sonra circuit bağlanır
+- quota:    token bucket sorğuları kvota sürətinə yayır
+
+Hər yoxlama OK/FAIL çap edir; FAIL olarsa exit code 1.
+
+İşə salmaq:  python -m benchmarks.llm_faults
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from aiohttp import web
+
+from app.ai.llm_client import LLMClient, LLMError
+from app.ai.resilience import AdaptiveLimiter, CircuitBreaker, ResilientClient, TokenBucket
+
+MESSAGES = [{"role": "user", "content": "Endirim var?"}]
+PORT = 8768
+
+# Stub-un davranışı (ssenarilər dəyişir)
+mode = {"fail_rate": 0.0, "status": 503, "delay": 0.0}
+hits = {"count": 0}
+failures = []
+
+
+async def start_stub():
+    rng = random.Random(3)
+
+    async def completions(request):
+        hits["count"] += 1
+        await request.json()
+        if mode["delay"]:
+            await asyncio.sleep(mode["delay"])
+        if rng.random() < mode["fail_rate"]:
+            return web.Response(status=mode["status"], text="upstream xətası")
+        return web.json_response({"choices": [{"message": {"content": "Bəli, 10%"}}]})
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "localhost", PORT).start()
+    return runner
+
+
+def check(name: str, ok: bool, detail: str):
+    print(f"  [{'OK' if ok else 'FAIL'}] {name}: {detail}")
+    if not ok:
+        failures.append(name)
+
+
+def make_client(base: LLMClient, **kwargs) -> ResilientClient:
+    defaults = dict(
+        limiter=AdaptiveLimiter(initial=8, latency_target=0.1),
+        bucket=TokenBucket(rate=10_000, capacity=10_000),
+        breaker=CircuitBreaker(failure_threshold=1_000, reset_timeout=0.5),
+        retries=2, backoff_base=0.01, backoff_cap=0.05
+    )
+    defaults.update(kwargs)
+    return ResilientClient(base, **defaults)
+
+
+async def call_many(client, count: int, concurrency: int = 16):
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await client.chat(MESSAGES)
+                ok = True
+            except LLMError:
+                ok = False
+            results.append((ok, time.perf_counter() - started))
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return results
+
+
+async def flaky(base):
+    print("flaky (30% 503):")
+    mode.update(fail_rate=0.3, delay=0.0)
+    plain = await call_many(make_client(base, retries=0), 400)
+    retried = await call_many(make_client(base, retries=2), 400)
+    plain_rate = sum(ok for ok, _ in plain) / len(plain)
+    retried_rate = sum(ok for ok, _ in retried) / len(retried)
+    check("retry uğur faizini artırır", retried_rate > 0.93 and retried_rate > plain_rate,
+          f"retry-siz {plain_rate:.0%}, retry ilə {retried_rate:.0%}")
+
+
+async def slow(base):
+    print("slow (0.3s, hədəf 0.1s):")
+    mode.update(fail_rate=0.0, delay=0.3)
+    client = make_client(base, limiter=AdaptiveLimiter(initial=16, latency_target=0.1))
+    await call_many(client, 120, concurrency=32)
+    check("AIMD limiti azalır", client.limiter.limit < 16,
+          f"limit 16 -> {client.limiter.limit:.1f}")
+
+    mode.update(delay=0.0)
+    before = client.limiter.limit
+    await call_many(client, 400, concurrency=32)
+    check("sağlam gecikmədə limit artır", client.limiter.limit > before,
+          f"limit {before:.1f} -> {client.limiter.limit:.1f}")
+
+
+async def outage_and_recovery(base):
+    print("outage (100% 503, upstream 0.2s cavab verir):")
+    mode.update(fail_rate=1.0, delay=0.2)
+    client = make_client(base, breaker=CircuitBreaker(failure_threshold=5, reset_timeout=0.5), retries=0)
+    await call_many(client, 5, concurrency=1)
+    check("circuit açılır", client.breaker.state == CircuitBreaker.OPEN, client.breaker.state)
+
+    before = hits["count"]
+    fast = await call_many(client, 50)
+    latency = statistics.median(t for _, t in fast)
+    check("açıq circuit dərhal imtina edir", latency < 0.005 and hits["count"] == before,
+          f"median {latency * 1e3:.2f}ms, upstream-ə {hits['count'] - before} sorğu")
+
+    print("recovery:")
+    mode.update(fail_rate=0.0, delay=0.0)
+    await asyncio.sleep(0.6)
+    results = await call_many(client, 20, concurrency=1)
+    check("half-open sınaqdan sonra bağlanır",
+          client.breaker.state == CircuitBreaker.CLOSED and all(ok for ok, _ in results),
+          f"{client.breaker.state}, {sum(ok for ok, _ in results)}/20 uğurlu")
+
+
+async def quota(base):
+    print("quota (20 req/s, burst 5):")
+    mode.update(fail_rate=0.0, delay=0.0)
+    client = make_client(base, bucket=TokenBucket(rate=20, capacity=5))
+    started = time.perf_counter()
+    await call_many(client, 45, concurrency=45)
+    elapsed = time.perf_counter() - started
+    check("sorğular kvota sürətinə yayılır", 1.8 < elapsed < 2.6,
+          f"45 sorğu {elapsed:.2f}s (gözlənilən ~2.0s)")
+
+
+async def run():
+    runner = await start_stub()
+    base = LLMClient(url=f"http://localhost:{PORT}/v1/chat/completions", api_key="test")
+    try:
+        await flaky(base)
+        await slow(base)
+        await outage_and_recovery(base)
+        await quota(base)
+    finally:
+        await base.close()
+        await runner.cleanup()
+
+
+def main():
+    asyncio.run(run())
+    if failures:
+        print(f"FAIL: {', '.join(failures)}")
+        sys.exit(1)
+    print("Bütün yoxlamalar keçdi")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# brain/benchmarks/llm_stream.py
+"""DeepSeek cavabı: tam cavab gözləmək vs SSE axını (ilk mətnə qədər vaxt).
+
+Lokal SSE stub hər token-i `--token-delay` saniyə ara ilə göndərir.
+Ölçülür:
+- chat(): istifadəçi ilk mətni cavab tam bitəndə görür
+- stream_chat(): ilk parçaya qədər vaxt (TTFB) və ümumi müddət
+- StreamingReply: Telegram-a neçə göndərmə/redaktə edildi (throttling)
+
+İşə salmaq:  python -m benchmarks.llm_stream [--tokens 80 --token-delay 0.03]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from aiohttp import web
+
+from app.ai.llm_client import LLMClient
+from app.telegram_bot import StreamingReply
+
+MESSAGES = [{"role": "user", "content": "Zəmanət şərtləri necədir?"}]
+
+
+async def start_stub(port: int, tokens: int, token_delay: float):
+    words = [f"söz{i} " for i in range(tokens)]
+
+    async def completions(request):
+        payload = await request.json()
+        if not payload.get("stream"):
+            await asyncio.sleep(token_delay * tokens)
+            return web.json_response({"choices": [{"message": {"content": "".join(words)}}]})
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for word in words:
+            await asyncio.sleep(token_delay)
+            chunk = {"choices": [{"delta": {"content": word}}]}
+            await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode())
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "localhost", port).start()
+    return runner
+
+
+class FakeSentMessage:
+    def __init__(self, counter):
+        self.counter = counter
+
+    async def edit_text(self, text):
+        self.counter["edits"] += 1
+
+
+class FakeMessage:
+    """Telegram Message - yalnız çağırışları sayır"""
+
+    def __init__(self):
+        self.counter = {"sends": 0, "edits": 0}
+
+    async def reply_text(self, text):
+        self.counter["sends"] += 1
+        return FakeSentMessage(self.counter)
+
+
+async def run(args):
+    runner = await start_stub(args.port, args.tokens, args.token_delay)
+    client = LLMClient(url=f"http://localhost:{args.port}/v1/chat/completions", api_key="test")
+    try:
+        await client.start()
+
+        started = time.perf_counter()
+        await client.chat(MESSAGES)
+        full = time.perf_counter() - started
+        print(f"chat():        ilk mətn {full * 1e3:7.1f}ms (tam cavab)")
+
+        started = time.perf_counter()
+        first = None
+        async for _ in client.stream_chat(MESSAGES):
+            if first is None:
+                first = time.perf_counter() - started
+        total = time.perf_counter() - started
+        print(f"stream_chat(): ilk mətn {first * 1e3:7.1f}ms, tam {total * 1e3:7.1f}ms")
+
+        message = FakeMessage()
+        reply = StreamingReply(message, interval=args.edit_interval)
+        parts = []
+        async for delta in client.stream_chat(MESSAGES):
+            parts.append(delta)
+            await reply.update("".join(parts))
+        await reply.finish("".join(parts))
+        print(f"StreamingReply: {message.counter['sends']} göndərmə, "
+              f"{message.counter['edits']} redaktə ({args.tokens} token, "
+              f"interval {args.edit_interval}s), ilk mətn {reply.first_text_at * 1e3:.1f}ms")
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=80)
+    parser.add_argument("--token-delay", type=float, default=0.03)
+    parser.add_argument("--edit-interval", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
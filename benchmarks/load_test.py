@@ -0,0 +1,353 @@
+# brain/benchmarks/load_test.py
+"""Prosesdaxili yük testi: ingest, oxuma endpoint-ləri və /ws fan-out.
+
+Trafik FakeDataService.generate_traffic ilə qurulur (N user, Zipf
+aktivlik, risk qarışığı). App httpx ASGITransport ilə, WebSocket-lər
+isə ASGI səviyyəsində birbaşa (şəbəkəsiz) çağırılır. Mərhələlər:
+
+  1. ingest  - bulk partiyalar və paralel tək mesajlar
+  2. oxuma   - /api/chats/active, /api/chats/{id}/full, dashboard,
+               alert-lər; fonda ingest davam edir (keşlər köhnəlir)
+  3. ws      - K client chats/alerts/user topic-lərinə abunə olur;
+               POST-dan client-ə çatana qədər gecikmə ölçülür
+
+Hər mərhələ üçün throughput, p50/p95/p99 gecikmə və RSS artımı
+çap olunur, sonra benchmarks/load_baseline.json-dakı hədlərlə
+müqayisə edilir - hədd aşılırsa FAIL və exit 1.
+
+İşə salmaq:  python -m benchmarks.load_test [--users 2000 --messages 20000]
+Baseline:    python -m benchmarks.load_test --update-baseline [--headroom 2]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import cycle
+
+_tmp_dir = tempfile.mkdtemp()
+os.environ.setdefault("MESSAGES_DB_PATH", os.path.join(_tmp_dir, "load.db"))
+os.environ.setdefault("ROLLUPS_PATH", os.path.join(_tmp_dir, "rollups.npz"))
+
+import httpx
+
+from app import main as app_main
+from app.services.fake_data_service import FakeDataService
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_baseline.json")
+# Max hədlərə əlavə mütləq ehtiyat (ms / MB)
+BASELINE_SLACK = {"_ms": 2.0, "_mb": 5.0}
+
+# Oxuma mərhələsində endpoint-lərin payı (admin panelin poll qarışığı)
+READ_MIX = (
+    ("/api/chats/active", 0.30),
+    ("/api/chats/{user_id}/full", 0.30),
+    ("/api/dashboard/overview", 0.15),
+    ("/api/dashboard/stats", 0.10),
+    ("/api/alerts", 0.10),
+    ("/api/analytics/summary", 0.05),
+)
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def summarize(latencies: list, elapsed: float = None, units: int = None) -> dict:
+    """Gecikmələr (s) -> ms percentilləri; `elapsed` verilibsə saniyədə iş"""
+    stats = {
+        "count": len(latencies),
+        "p50_ms": _percentile(latencies, 50) * 1e3,
+        "p95_ms": _percentile(latencies, 95) * 1e3,
+        "p99_ms": _percentile(latencies, 99) * 1e3,
+    }
+    if elapsed:
+        stats["per_s"] = (units if units is not None else len(latencies)) / elapsed
+    return stats
+
+
+async def run_workers(concurrency: int, jobs, handle) -> float:
+    """`jobs`-u `concurrency` paralel worker ilə icra et; keçən vaxtı qaytar"""
+    jobs = iter(jobs)
+
+    async def worker():
+        for job in jobs:
+            await handle(job)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+class AsgiWebSocket:
+    """/ws-ə ASGI səviyyəsində qoşulan client (şəbəkə və thread yoxdur)"""
+
+    def __init__(self, app, sent_at: dict):
+        self.app = app
+        self.sent_at = sent_at
+        self.inbox = asyncio.Queue()
+        self.accepted = asyncio.Event()
+        self.latencies = []
+        self.received = 0
+        self.task = None
+
+    async def connect(self, topics):
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "path": "/ws",
+            "raw_path": b"/ws", "query_string": b"", "headers": [], "subprotocols": [],
+            "client": ("bench", 1), "server": ("bench", 80),
+        }
+        self.task = asyncio.create_task(self.app(scope, self.inbox.get, self._send))
+        await self.inbox.put({"type": "websocket.connect"})
+        await self.accepted.wait()
+        for topic in topics:
+            await self.inbox.put({"type": "websocket.receive",
+                                  "text": json.dumps({"type": "subscribe", "topic": topic})})
+
+    async def close(self):
+        await self.inbox.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+    async def _send(self, message):
+        if message["type"] == "websocket.accept":
+            self.accepted.set()
+        elif message["type"] == "websocket.send":
+            self.received += 1
+            text = message["text"]
+            # Yalnız ölçülən frame-lər parse olunur - client xərci nəticəyə qarışmasın
+            if '"message_appended"' not in text:
+                return
+            event = json.loads(text)
+            if event["type"] == "message_appended":
+                sent = self.sent_at.get(event["data"]["message"]["message"])
+                if sent is not None:
+                    self.latencies.append(time.perf_counter() - sent)
+
+
+async def phase_ingest(client, traffic: list, args) -> dict:
+    """Bulk partiyalar, sonra paralel tək mesajlar"""
+    bulk, single = traffic[:-args.single], traffic[-args.single:]
+
+    batches = [bulk[start:start + args.batch] for start in range(0, len(bulk), args.batch)]
+    batch_latencies = []
+
+    async def post_batch(batch):
+        started = time.perf_counter()
+        response = await client.post("/api/telegram/messages/bulk", json=batch)
+        batch_latencies.append(time.perf_counter() - started)
+        assert response.json()["accepted"] == len(batch)
+
+    elapsed = await run_workers(4, batches, post_batch)
+    results = {"ingest.bulk": summarize(batch_latencies, elapsed, units=len(bulk))}
+
+    latencies = []
+
+    async def post_single(message):
+        started = time.perf_counter()
+        response = await client.post("/api/telegram/message", json=message)
+        latencies.append(time.perf_counter() - started)
+        assert response.json()["success"]
+
+    elapsed = await run_workers(args.concurrency, single, post_single)
+    results["ingest.single"] = summarize(latencies, elapsed)
+    return results
+
+
+async def phase_reads(client, traffic: list, args) -> dict:
+    """Zipf seçilmiş user-larla oxuma qarışığı; fonda ingest davam edir"""
+    rng = random.Random(25)
+    hot_users = [message["user_id"] for message in traffic]   # Zipf paylanmış
+    paths = [path for path, _ in READ_MIX]
+    weights = [share for _, share in READ_MIX]
+    jobs = []
+    for path in rng.choices(paths, weights=weights, k=args.requests):
+        jobs.append((path, path.format(user_id=rng.choice(hot_users))))
+
+    latencies = {path: [] for path in paths}
+
+    async def get(job):
+        name, url = job
+        started = time.perf_counter()
+        response = await client.get(url)
+        latencies[name].append(time.perf_counter() - started)
+        assert response.status_code == 200, (url, response.status_code)
+
+    stop = asyncio.Event()
+
+    async def trickle():
+        # Yazı davam edir: view keşi köhnəlir, cavablar yenidən qurulur
+        background = cycle(FakeDataService.generate_traffic(5_000, args.users, seed=26))
+        while not stop.is_set():
+            await client.post("/api/telegram/message", json=next(background))
+            await asyncio.sleep(0.002)
+
+    writer = asyncio.create_task(trickle())
+    elapsed = await run_workers(args.concurrency, jobs, get)
+    stop.set()
+    await writer
+
+    # Endpoint-lər eyni vaxtda gedir - throughput yalnız cəm üçün mənalıdır
+    results = {f"GET {path}": summarize(values) for path, values in latencies.items()}
+    results["reads.total"] = summarize([v for values in latencies.values() for v in values], elapsed)
+    return results
+
+
+async def phase_ws(client, traffic: list, args) -> dict:
+    """K client abunə olur; hər POST-un user topic-inə çatma gecikməsi"""
+    sent_at = {}
+    hot_user = traffic[0]["user_id"]
+    sockets = [AsgiWebSocket(app_main.app, sent_at) for _ in range(args.ws_clients)]
+    for socket in sockets:
+        await socket.connect(("chats", "alerts", f"user:{hot_user}"))
+    await asyncio.sleep(0.05)
+
+    async def post(index):
+        text = f"Sifarişim gecikir, nə baş verib? #{index}"
+        message = {"user_id": hot_user, "username": traffic[0]["username"], "message": text}
+        sent_at[text] = time.perf_counter()
+        await client.post("/api/telegram/message", json=message)
+        await asyncio.sleep(args.ws_interval)
+
+    elapsed = await run_workers(1, range(args.ws_messages), post)
+    # Növbələrin boşalmasını gözlə
+    deadline = time.perf_counter() + 5
+    while time.perf_counter() < deadline and sum(len(s.latencies) for s in sockets) < len(sockets) * args.ws_messages:
+        await asyncio.sleep(0.01)
+
+    for socket in sockets:
+        await socket.close()
+
+    latencies = [value for socket in sockets for value in socket.latencies]
+    delivered = len(latencies) / (len(sockets) * args.ws_messages)
+    result = summarize(latencies, elapsed)
+    result["delivered"] = delivered
+    result["frames"] = sum(socket.received for socket in sockets)
+    return {"ws.delivery": result}
+
+
+def check_baseline(metrics: dict, baseline: dict) -> list:
+    """Hədləri yoxla: min - aşağı düşməməli, max - keçməməli"""
+    failures = []
+    for name, limit in baseline.get("min", {}).items():
+        if name in metrics and metrics[name] < limit:
+            failures.append(f"{name} = {metrics[name]:.2f} < {limit:.2f}")
+    for name, limit in baseline.get("max", {}).items():
+        if name in metrics and metrics[name] > limit:
+            failures.append(f"{name} = {metrics[name]:.2f} > {limit:.2f}")
+    return failures
+
+
+def make_baseline(metrics: dict, headroom: float) -> dict:
+    """Ölçülənlərdən hədlər: throughput / headroom, gecikmə və yaddaş * headroom.
+
+    Max hədlərə mütləq ehtiyat da əlavə olunur (BASELINE_SLACK) - sıfıra
+    yaxın dəyərlər (0 MB artım, 1 ms) səs-küydən FAIL olmasın.
+    """
+    limits = {"min": {}, "max": {}}
+    for name, value in metrics.items():
+        if name.endswith(".per_s"):
+            limits["min"][name] = round(value / headroom, 1)
+        for suffix, slack in BASELINE_SLACK.items():
+            if name.endswith(suffix):
+                limits["max"][name] = round(max(value, 0) * headroom + slack, 1)
+    return limits
+
+
+async def run(args) -> dict:
+    traffic = FakeDataService.generate_traffic(args.messages + args.single, args.users, seed=25)
+    transport = httpx.ASGITransport(app=app_main.app)
+    results = {}
+
+    await app_main.startup_event()
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            rss_start = rss_mb()
+            for phase in (phase_ingest, phase_reads, phase_ws):
+                before = rss_mb()
+                results.update(await phase(client, traffic, args))
+                results[f"{phase.__name__[6:]}.rss"] = {"growth_mb": rss_mb() - before}
+            results["total.rss"] = {"growth_mb": rss_mb() - rss_start}
+    finally:
+        await app_main.shutdown_event()
+    return results
+
+
+def print_report(results: dict):
+    print(f"{'mərhələ':<36}{'say':>7}{'iş/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, stats in results.items():
+        if "count" in stats:
+            per_s = f"{stats['per_s']:>10.0f}" if "per_s" in stats else f"{'-':>10}"
+            print(f"{name:<36}{stats['count']:>7}{per_s}"
+                  f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}")
+    ws = results["ws.delivery"]
+    print(f"ws: {ws['delivered'] * 100:.1f}% çatdırıldı, {ws['frames']} frame")
+    print("RSS artımı: " + ", ".join(
+        f"{name[:-4]} +{stats['growth_mb']:.1f} MB" for name, stats in results.items() if name.endswith(".rss")
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--messages", type=int, default=20_000, help="bulk ingest mesajları")
+    parser.add_argument("--single", type=int, default=2_000, help="tək endpoint mesajları")
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=2_000, help="oxuma sorğuları")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--ws-clients", type=int, default=50)
+    parser.add_argument("--ws-messages", type=int, default=200)
+    parser.add_argument("--ws-interval", type=float, default=0.005, help="POST-lar arası fasilə (s)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--headroom", type=float, default=2.0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    results = asyncio.run(run(args))
+    print_report(results)
+
+    # Tək endpoint-lərin p99-u az nümunədən hesablanır (səs-küylü) - yalnız p95 yoxlanılır
+    metrics = {
+        f"{name}.{key}": value
+        for name, stats in results.items() for key, value in stats.items()
+        if key in ("per_s", "p95_ms", "growth_mb") or (key == "p99_ms" and not name.startswith("GET "))
+    }
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(make_baseline(metrics, args.headroom), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Baseline yazıldı: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"Baseline yoxdur ({args.baseline}) - --update-baseline ilə yaradın")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        failures = check_baseline(metrics, json.load(f))
+    for failure in failures:
+        print(f"  [FAIL] {failure}")
+    if failures:
+        sys.exit(1)
+    print("  [OK] bütün hədlər daxilində")
+
+
+if __name__ == "__main__":
+    main()
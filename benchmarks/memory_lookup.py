@@ -0,0 +1,76 @@
+# brain/benchmarks/memory_lookup.py
+"""MemoryManager.find_response: köhnə ardıcıl axtarış vs hash indeks.
+
+İşə salmaq:  python -m benchmarks.memory_lookup [--questions 100000]
+"""
+import argparse
+import json
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+logging.disable(logging.INFO)
+
+from app.memory.normalize import normalize_text
+from app.memory.storage import release_store
+from app.telegram_bot import MemoryManager
+
+
+def legacy_find(memory_data, message):
+    """Əvvəlki find_response (strict ==, bütün item-lər üzrə)"""
+    message = message.strip()
+    for item in memory_data.get("exact_matches", []):
+        for pattern in item.get("patterns", []):
+            if message == pattern:
+                return item.get("response")
+    return None
+
+
+def timed(fn, queries):
+    started = time.perf_counter()
+    hits = sum(1 for q in queries if fn(q) is not None)
+    return (time.perf_counter() - started) / len(queries), hits
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    items = [{"patterns": [f"Məhsul #{i} qiyməti nədir?"], "response": f"cavab {i}"}
+             for i in range(args.questions)]
+    data = {"exact_matches": items, "partial_matches": []}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "memory.json"
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        started = time.perf_counter()
+        memory = MemoryManager(path)
+        load_time = time.perf_counter() - started
+        # Qovluq silinməzdən əvvəl - atexit kompaksiyası artıq bu fayla yazmır
+        release_store(path)
+
+    rng = random.Random(1)
+    exact = [f"Məhsul #{rng.randrange(args.questions)} qiyməti nədir?" for _ in range(args.queries)]
+    # Eyni suallar - fərqli yazılışla (kiçik hərf, durğu, ə/e)
+    variants = [f"mehsul {rng.randrange(args.questions)} qiymeti nedir" for _ in range(args.queries)]
+
+    legacy_exact, legacy_exact_hits = timed(lambda q: legacy_find(data, q), exact)
+    legacy_var, legacy_var_hits = timed(lambda q: legacy_find(data, q), variants)
+    index_exact, index_exact_hits = timed(memory.find_response, exact)
+    index_var, index_var_hits = timed(memory.find_response, variants)
+    dup_check, _ = timed(lambda q: normalize_text(q) in memory.index or None, exact)
+
+    print(f"Sual sayı: {args.questions:,} (yükləmə + indeks: {load_time * 1e3:.0f}ms)")
+    print(f"köhnə  exact:    {legacy_exact * 1e6:10.1f}µs/sorğu  hit {legacy_exact_hits}/{args.queries}")
+    print(f"köhnə  variant:  {legacy_var * 1e6:10.1f}µs/sorğu  hit {legacy_var_hits}/{args.queries}")
+    print(f"indeks exact:    {index_exact * 1e6:10.1f}µs/sorğu  hit {index_exact_hits}/{args.queries}")
+    print(f"indeks variant:  {index_var * 1e6:10.1f}µs/sorğu  hit {index_var_hits}/{args.queries}")
+    print(f"dublikat yoxla:  {dup_check * 1e6:10.1f}µs/sual")
+
+
+if __name__ == "__main__":
+    main()
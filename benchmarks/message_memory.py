@@ -0,0 +1,91 @@
+# brain/benchmarks/message_memory.py
+"""Mesaj başına yaddaş: köhnə dict modeli vs MessageRecord.
+
+İşə salmaq:  python -m benchmarks.message_memory [--count 1000000]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+from app.models.chat import MessageRecord
+from app.services.message_store import MessageStore
+
+USERS = 5_000
+
+
+def _inputs(count):
+    """Hər iki model üçün eyni giriş (mətn ayrıca yaradılır)"""
+    base = time.time() - count
+    for i in range(count):
+        uid = i % USERS
+        yield f"user_{uid}", f"Müştəri {uid}", f"Sifarişim gecikir #{i}", base + i, i % 100
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    holder = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, holder
+
+
+def build_dicts(count):
+    """Əvvəlki model: dict + ISO string + hər user üçün active_users dict"""
+    chat_messages = []
+    active_users = {}
+    for user_id, username, text, ts, risk in _inputs(count):
+        timestamp = datetime.fromtimestamp(ts).isoformat()
+        chat_messages.append({
+            "user_id": user_id,
+            "username": username,
+            "message": text,
+            "is_bot": False,
+            "is_admin": False,
+            "risk_score": risk,
+            "timestamp": timestamp
+        })
+        active_users[user_id] = {
+            "username": username,
+            "last_message": text[:100],
+            "last_time": timestamp,
+            "risk_score": risk
+        }
+    return chat_messages, active_users
+
+
+def build_records(count):
+    """Yeni model: MessageRecord + MessageStore indeksləri"""
+    store = MessageStore(max_messages=count)
+    for user_id, username, text, ts, risk in _inputs(count):
+        store.add(MessageRecord(user_id, username, text, ts, risk))
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    # Mətnlərin öz yaddaşı hər iki modeldə eynidir - ayrıca ölçülür
+    text_bytes, texts = measure(lambda: [text for _, _, text, _, _ in _inputs(args.count)])
+    del texts
+
+    dict_bytes, holder = measure(lambda: build_dicts(args.count))
+    del holder
+    record_bytes, holder = measure(lambda: build_records(args.count))
+    del holder
+
+    print(f"Mesaj sayı:        {args.count:,}")
+    print(f"Mətnlər:           {text_bytes / args.count:8.1f} B/mesaj")
+    print(f"dict modeli:       {dict_bytes / args.count:8.1f} B/mesaj "
+          f"(mətnsiz {(dict_bytes - text_bytes) / args.count:.1f})")
+    print(f"MessageRecord:     {record_bytes / args.count:8.1f} B/mesaj "
+          f"(mətnsiz {(record_bytes - text_bytes) / args.count:.1f})")
+    print(f"Qənaət:            {100 * (1 - record_bytes / dict_bytes):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
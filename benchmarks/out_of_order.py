@@ -0,0 +1,76 @@
+# brain/benchmarks/out_of_order.py
+"""Regressiya yoxlaması: gecikmiş (köhnə ts-li) mesaj aktiv söhbətləri gizlətməməlidir.
+
+Outbox mesajı `ts` ilə gecikdirib göndərə bilər. Canlı mesajdan sonra
+2 saat köhnə bulk mesaj gələndə də /api/chats/active və
+/api/dashboard/active-chats canlı user-ı göstərməli, cutoff scan-ları
+(recent_users, since, user_messages_since) düzgün qalmalıdır.
+
+İşə salmaq:  python -m benchmarks.out_of_order
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+_tmp_dir = tempfile.mkdtemp()
+os.environ.setdefault("MESSAGES_DB_PATH", os.path.join(_tmp_dir, "order.db"))
+os.environ.setdefault("ROLLUPS_PATH", os.path.join(_tmp_dir, "rollups.npz"))
+
+import httpx
+
+from app import main as app_main
+
+
+def check(name: str, passed: bool) -> bool:
+    print(f"  [{'OK' if passed else 'FAIL'}] {name}")
+    return passed
+
+
+async def run() -> bool:
+    transport = httpx.ASGITransport(app=app_main.app)
+    store = app_main.message_store
+    now = time.time()
+    ok = True
+    async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+        await client.post("/api/telegram/message", json={
+            "user_id": "live", "username": "Canlı", "message": "Salam, sifarişim haradadır?"
+        })
+        await client.post("/api/telegram/message", json={
+            "user_id": "other", "username": "Digər", "message": "Qiymət nə qədərdir?", "ts": now - 60
+        })
+        response = await client.post("/api/telegram/messages/bulk", json=[
+            {"user_id": "late", "username": "Gecikmiş", "message": "Köhnə sual", "ts": now - 7200},
+            {"user_id": "live", "username": "Canlı", "message": "Əvvəlki mesajım", "ts": now - 3000},
+        ])
+        ok &= check("bulk qəbul olundu", response.json()["accepted"] == 2)
+
+        active = (await client.get("/api/chats/active")).json()
+        users = [chat["user_id"] for chat in active["chats"]]
+        ok &= check(f"/api/chats/active: {users}", users == ["live", "other"])
+
+        dashboard = (await client.get("/api/dashboard/active-chats")).json()
+        users = [chat["user_id"] for chat in dashboard["chats"]]
+        ok &= check(f"/api/dashboard/active-chats: {users}", users == ["live", "other"])
+
+        live = next(chat for chat in dashboard["chats"] if chat["user_id"] == "live")
+        ok &= check("canlı user-ın son mesajı dəyişmədi", live["last_message"] == "Salam, sifarişim haradadır?")
+        ok &= check("2 saat pəncərəsində hər iki mesaj sayılır", live["message_count"] == 2)
+
+    ok &= check("since(): gecikmiş mesaj pəncərədən kənarda",
+                [r.user_id for r in store.since(now - 3600)] == ["live", "other", "live"])
+    timeline = [record.ts for record in store.since(0)]
+    ok &= check("timeline ts sırası ilə", timeline == sorted(timeline, reverse=True))
+    return ok
+
+
+def main():
+    logging.disable(logging.INFO)
+    if not asyncio.run(run()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
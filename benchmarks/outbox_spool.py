@@ -0,0 +1,107 @@
+# brain/benchmarks/outbox_spool.py
+"""Regressiya yoxlaması: Outbox spool-u göndərmədən asılı olmayaraq diskdədir.
+
+- API əlçatmazdır: put()-dan `spool_delay` sonra mesaj spool faylda olmalıdır
+- növbə dolanda atılan mesajlar restart-dan sonra qayıtmamalıdır
+- API uzun müddət düşəndə spool fayl `max_pending`-dən uzağa böyüməməlidir
+- API qalxanda hamısı göndərilir, spool sıfırlanır
+
+İşə salmaq:  python -m benchmarks.outbox_spool
+"""
+import asyncio
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from aiohttp import web
+
+from app.services.outbox import Outbox
+
+PORT = 8769
+URL = f"http://localhost:{PORT}/api/telegram/messages/bulk"
+
+
+def check(name: str, passed: bool) -> bool:
+    print(f"  [{'OK' if passed else 'FAIL'}] {name}")
+    return passed
+
+
+def spool_lines(path: Path) -> int:
+    return len(path.read_text(encoding="utf-8").splitlines()) if path.exists() else 0
+
+
+def make_outbox(path: Path) -> Outbox:
+    return Outbox(URL, path, batch_size=50, flush_interval=0.05, max_pending=100,
+                  backoff_base=0.01, backoff_cap=0.05, timeout=1.0)
+
+
+async def start_stub(received: list):
+    async def bulk(request):
+        received.extend(await request.json())
+        return web.json_response({"accepted": len(received)})
+
+    app = web.Application()
+    app.router.add_post("/api/telegram/messages/bulk", bulk)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "localhost", PORT).start()
+    return runner
+
+
+async def run(path: Path) -> bool:
+    ok = True
+
+    # API düşüb: spool göndərmə yolunu gözləmir
+    outbox = make_outbox(path)
+    await outbox.start()
+    for i in range(10):
+        outbox.put("u1", "user", f"mesaj {i}")
+    await asyncio.sleep(0.2)
+    ok &= check(f"API düşükkən 10 mesaj spool-da ({spool_lines(path)} sətir)", spool_lines(path) == 10)
+
+    # Növbə dolur: ən köhnələr atılır, spool sıxlaşdırılır
+    for i in range(10, 350):
+        outbox.put("u1", "user", f"mesaj {i}")
+        if i % 25 == 0:
+            await asyncio.sleep(0.06)
+    await asyncio.sleep(0.2)
+    lines = spool_lines(path)
+    ok &= check(f"spool məhduddur ({lines} sətir <= 200)", lines <= 2 * outbox.max_pending)
+    ok &= check(f"atılan mesajlar sayılır ({outbox.dropped})", outbox.dropped == 250)
+    await outbox.stop(drain_timeout=0.2)
+
+    # Restart: yalnız növbədəkilər qayıdır
+    outbox = make_outbox(path)
+    await asyncio.to_thread(outbox._load_spool)
+    messages = [payload["message"] for _, payload in outbox._queue]
+    ok &= check(f"restart-dan sonra {len(messages)} mesaj, atılanlar qayıtmır",
+                messages == [f"mesaj {i}" for i in range(250, 350)])
+
+    # API qalxır: hamısı göndərilir, spool sıfırlanır
+    received = []
+    runner = await start_stub(received)
+    outbox = make_outbox(path)
+    await outbox.start()
+    outbox.put("u1", "user", "mesaj 350")  # növbə doludur - "mesaj 250" atılır
+    for _ in range(100):
+        await asyncio.sleep(0.05)
+        if not outbox.pending:
+            break
+    await outbox.stop()
+    await runner.cleanup()
+    ok &= check(f"API qalxanda {len(received)} mesaj göndərildi",
+                [payload["message"] for payload in received] == [f"mesaj {i}" for i in range(251, 351)])
+    ok &= check("göndərildikdən sonra spool boşdur", spool_lines(path) == 0)
+    return ok
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if not asyncio.run(run(Path(tmp_dir) / "outbox.jsonl")):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
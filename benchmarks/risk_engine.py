@@ -0,0 +1,74 @@
+# brain/benchmarks/risk_engine.py
+"""risk_engine mikrobenchmark: mesaj başına µs (hədəf < 50 µs).
+
+Müqayisə üçün sadə üsul da ölçülür - hər ifadə üçün ayrıca `in` yoxlaması
+(leksikon böyüdükcə xətti yavaşlayır, avtomat isə mətn uzunluğundan asılıdır).
+
+İşə salmaq:  python -m benchmarks.risk_engine [--messages 20000]
+"""
+import argparse
+import random
+import sys
+import time
+
+from app.memory.normalize import normalize_text
+from app.services.risk_engine import LEXICON, RiskEngine
+
+TARGET_US = 50
+
+SAMPLES = [
+    "Salam, məhsulun qiyməti nə qədərdir?",
+    "Sifarişim gecikir, nə baş verib?",
+    "Məhsuldan narazıyam, qaytarmaq istəyirəm!",
+    "Kömək lazımdır, problem var!",
+    "Pulumu geri qaytarın, bu rəzalətdir!!!",
+    "Trendyol-da daha ucuzdur, niyə sizdən alım?",
+    "Добрый день, когда будет доставка?",
+    "Верните деньги, это обман, пойду в суд",
+    "Çatdırılma Bakı daxilində pulsuzdur?",
+    "BU NƏ BİABIRÇILIQDIR, CAVAB VERMİRSİNİZ",
+]
+
+
+def naive_score(phrases: list, text: str) -> int:
+    normalized = " " + normalize_text(text)
+    return sum(weight for key, weight in phrases if key in normalized)
+
+
+def measure(fn, messages: list) -> float:
+    started = time.perf_counter()
+    for text in messages:
+        fn(text)
+    return (time.perf_counter() - started) / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    # Unikal mətnlər: sonuna sifariş nömrəsi əlavə olunur (score_many keşi kömək etməsin)
+    messages = [f"{rng.choice(SAMPLES)} #{i}" for i in range(args.messages)]
+    engine = RiskEngine()
+    phrases = [(" " + normalize_text(phrase), weight)
+               for items in LEXICON.values() for phrase, weight in items]
+
+    naive_us = measure(lambda text: naive_score(phrases, text), messages)
+    single_us = measure(engine.score, messages)
+    started = time.perf_counter()
+    engine.score_many(messages)
+    batch_us = (time.perf_counter() - started) / len(messages) * 1e6
+
+    print(f"leksikon: {len(phrases)} ifadə, {len(engine._delta)} vəziyyət")
+    print(f"sadə `in`:       {naive_us:7.1f} µs/mesaj")
+    print(f"avtomat score:   {single_us:7.1f} µs/mesaj")
+    print(f"avtomat partiya: {batch_us:7.1f} µs/mesaj")
+    ok = single_us < TARGET_US
+    print(f"[{'OK' if ok else 'FAIL'}] hədəf < {TARGET_US} µs/mesaj")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
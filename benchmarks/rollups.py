@@ -0,0 +1,56 @@
+# brain/benchmarks/rollups.py
+"""Rollup-lar: ingest xərci (µs/mesaj) və aralıq sorğularının gecikməsi.
+
+90 günə yayılmış sintetik mesajlar yazılır, sonra hər aralıq üçün
+query()/summary() ölçülür - gecikmə mesaj sayından asılı olmamalıdır.
+
+İşə salmaq:  python -m benchmarks.rollups [--messages 500000]
+"""
+import argparse
+import random
+import time
+
+from app.models.chat import MessageRecord
+from app.services.rollups import Rollups
+
+RANGES = {"1h": 3600, "24h": 86400, "7d": 7 * 86400, "30d": 30 * 86400, "90d": 90 * 86400}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    args = parser.parse_args()
+
+    rng = random.Random(21)
+    now = time.time()
+    span = 90 * 86400
+    records = [
+        MessageRecord(str(rng.randrange(args.users)), "user", "", now - span + i * span / args.messages,
+                      risk_score=rng.choice((0, 10, 35, 65, 90)), is_bot=i % 2 == 1,
+                      id=i + 1, source=rng.choice(("memory", "deepseek")))
+        for i in range(args.messages)
+    ]
+
+    rollups = Rollups()
+    started = time.perf_counter()
+    for record in records:
+        rollups.add(record)
+    elapsed = time.perf_counter() - started
+    print(f"ingest: {elapsed / len(records) * 1e6:.2f} µs/mesaj ({len(records)} mesaj)")
+
+    for name, seconds in RANGES.items():
+        started = time.perf_counter()
+        for _ in range(50):
+            series = rollups.query(now - seconds, now, 300)
+        query_ms = (time.perf_counter() - started) / 50 * 1e3
+        started = time.perf_counter()
+        for _ in range(50):
+            rollups.summary(now - seconds, now)
+        summary_ms = (time.perf_counter() - started) / 50 * 1e3
+        print(f"{name:>4}: {series['resolution']:>6} x{series['step']:>6}s, {len(series['t']):>3} nöqtə, "
+              f"query {query_ms:.2f} ms, summary {summary_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# brain/benchmarks/semantic_lookup.py
+"""SemanticIndex: böyük bilik bazasında qurma vaxtı, yaddaş və top-k axtarış gecikməsi.
+
+Qurma iki yolla ölçülür: tək-tək `add` (canlı əlavə) və `add_many`
+(yükləmədə rebuild_index-in istifadə etdiyi toplu yol).
+
+İşə salmaq:  python -m benchmarks.semantic_lookup [--entries 200000]
+"""
+import argparse
+import random
+import time
+
+from app.memory.similarity import SemanticIndex
+
+TOPICS = ["qiyməti", "çatdırılması", "zəmanəti", "rəngi", "ölçüsü", "endirimi", "qaytarılması"]
+PRODUCTS = ["telefon", "noutbuk", "soyuducu", "paltaryuyan", "televizor", "qulaqlıq", "saat"]
+
+
+def question(rng, i):
+    return f"{rng.choice(PRODUCTS)} {rng.choice(TOPICS)} nədir? model {i}"
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--single", type=int, default=20_000, help="tək-tək add ilə ölçülən entry sayı")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    entries = [(question(rng, i), {"response": i}) for i in range(args.entries)]
+
+    single = SemanticIndex(dim=args.dim, max_entries=args.entries)
+    started = time.perf_counter()
+    for pattern, item in entries[:args.single]:
+        single.add(pattern, item)
+    single_us = (time.perf_counter() - started) / max(args.single, 1) * 1e6
+
+    index = SemanticIndex(dim=args.dim, max_entries=args.entries)
+    started = time.perf_counter()
+    index.add_many(entries)
+    build = time.perf_counter() - started
+
+    queries = [question(rng, rng.randrange(args.entries)).lower().rstrip("?")
+               for _ in range(args.queries)]
+    latencies = []
+    for q in queries:
+        started = time.perf_counter()
+        index.search(q, top_k=5)
+        latencies.append(time.perf_counter() - started)
+
+    matrix_mb = index.nbytes / 2 ** 20
+    print(f"Entry: {args.entries:,}, dim={args.dim}, matris {matrix_mb:.0f} MB")
+    print(f"Qurma: add_many {build:.1f}s ({build / args.entries * 1e6:.0f}µs/entry), "
+          f"tək add {single_us:.0f}µs/entry (~{single_us * args.entries / 1e6:.1f}s)")
+    print(f"Axtarış p50={percentile(latencies, 50) * 1e3:.2f}ms "
+          f"p95={percentile(latencies, 95) * 1e3:.2f}ms "
+          f"p99={percentile(latencies, 99) * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# brain/benchmarks/topic_state.py
+"""Regressiya yoxlaması: TopicHub state-i və yavaş client-in COALESCE növbəsi.
+
+Hər user üçün "user:<id>" topic-i var; baxılmayan user-ların seq və
+replay buferi saxlanmamalı, son abunəçi çıxandan `idle_ttl` sonra
+topic-in state-i silinməli, yenidən yaradılan topic-in seq-i isə geri
+getməməlidir.
+
+Yavaş client-in növbəsi dolanda açarlı (state) delta-ların köhnə
+versiyaları atılmalı, açarsız delta-lar qalmalı, seq boşluqları isə
+"coalesced" frame-i ilə örtülməlidir (client resync etmir).
+
+İşə salmaq:  python -m benchmarks.topic_state
+"""
+import asyncio
+import json
+import logging
+import sys
+import time
+
+from app.services.fanout import COALESCE, ConnectionManager, TopicHub
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.frames.append(text)
+
+
+def check(name: str, passed: bool) -> bool:
+    print(f"  [{'OK' if passed else 'FAIL'}] {name}")
+    return passed
+
+
+async def run() -> bool:
+    manager = ConnectionManager()
+    hub = TopicHub(manager, replay_size=100, idle_ttl=60.0)
+    ok = True
+
+    for i in range(10_000):
+        hub.publish(f"user:{i}", "message_appended", {"i": i})
+    ok &= check(f"izlənməyən 10k topic: state {hub.topic_count}", hub.topic_count == 0)
+
+    socket = FakeWebSocket()
+    await manager.connect(socket)
+    hub.subscribe(socket, "user:1")
+    for i in range(5):
+        hub.publish("user:1", "message_appended", {"i": i})
+    last_seq = hub.seq("user:1")
+    hub.unsubscribe(socket, "user:1")
+    hub.publish("user:1", "message_appended", {"i": 5})
+    ok &= check("TTL daxilində bufer qalır", hub.topic_count == 1 and len(hub._replay["user:1"]) == 6)
+
+    hub.prune(time.monotonic() + 61)
+    ok &= check("TTL keçəndən sonra state silindi", hub.topic_count == 0 and not hub._replay)
+
+    hub.subscribe(socket, "user:1", since=last_seq, epoch=hub.epoch)
+    hub.publish("user:1", "message_appended", {"i": 6})
+    ok &= check(f"yenidən yaranan topic-in seq-i geri getmir ({hub.seq('user:1')} > {last_seq + 1})",
+                hub.seq("user:1") > last_seq + 1)
+
+    hub.drop(socket)
+    manager.disconnect(socket)
+    ok &= check("drop-dan sonra abunəçi qalmadı", not hub._subscribers and "user:1" in hub._idle)
+    return ok
+
+
+def accepted_seqs(frames: list, topic: str) -> tuple:
+    """Admin panelin acceptSequence məntiqi: (qəbul olunan seq-lər, resync lazımdırmı)"""
+    last, coalesced, seqs = None, set(), []
+    for frame in map(json.loads, frames):
+        if frame["topic"] != topic:
+            continue
+        if frame["type"] == "coalesced":
+            coalesced.update(frame["seqs"])
+            continue
+        if frame["type"] != "snapshot" and last is not None:
+            expected = last + 1
+            while expected in coalesced:
+                coalesced.discard(expected)
+                expected += 1
+            if frame["seq"] != expected:
+                return seqs, True
+        last = frame["seq"]
+        seqs.append((frame["type"], last))
+    return seqs, False
+
+
+async def run_coalesce() -> bool:
+    manager = ConnectionManager(max_queue=8, policy=COALESCE)
+    hub = TopicHub(manager)
+    ok = True
+
+    socket = FakeWebSocket()
+    await manager.connect(socket)
+    hub.subscribe(socket, "chats")
+    await asyncio.sleep(0)
+    # Client göndərməyə çatmır: 50 risk dəyişikliyi (2 user) və 5 açarsız delta
+    for i in range(50):
+        hub.publish("chats", "risk_changed", {"user_id": f"u{i % 2}", "risk_score": i},
+                    key=("risk_changed", f"u{i % 2}"))
+        if i % 10 == 0:
+            hub.publish("chats", "chats_updated", {"i": i})
+    await asyncio.sleep(0.05)
+
+    seqs, resync = accepted_seqs(socket.frames, "chats")
+    types = [event for event, _ in seqs]
+    risks = [json.loads(frame)["data"]["risk_score"] for frame in socket.frames
+             if json.loads(frame)["type"] == "risk_changed"]
+    ok &= check(f"açarsız delta-lar qaldı ({types.count('chats_updated')}/5)", types.count("chats_updated") == 5)
+    ok &= check(f"köhnə risk versiyaları atıldı ({len(risks)} göndərildi)", len(risks) < 50)
+    ok &= check(f"hər user-ın son risk-i çatdı ({risks[-2:]})", sorted(risks[-2:]) == [48, 49])
+    ok &= check("seq boşluqları coalesced ilə örtülür, resync yoxdur", not resync and seqs[-1][1] == hub.seq("chats"))
+    manager.disconnect(socket)
+    return ok
+
+
+def main():
+    logging.disable(logging.INFO)
+    if not asyncio.run(run()) or not asyncio.run(run_coalesce()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
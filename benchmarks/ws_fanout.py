@@ -0,0 +1,117 @@
+# brain/benchmarks/ws_fanout.py
+"""WebSocket fan-out gecikməsi: köhnə ardıcıl broadcast vs ConnectionManager.
+
+200 client (bir hissəsi yavaş) simulyasiya olunur. Ölçülür:
+- ingest tərəfinin broadcast-də gözlədiyi vaxt
+- sürətli client-lərin mesajı alma gecikməsi (p50/p99)
+
+İşə salmaq:  python -m benchmarks.ws_fanout [--clients 200 --slow 10]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from app.services.fanout import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.latencies = []
+
+    async def accept(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.latencies.append(time.perf_counter() - json.loads(text)["sent_at"])
+
+    async def send_json(self, message: dict):
+        await self.send_text(json.dumps(message))
+
+
+class LegacyManager:
+    """Əvvəlki ConnectionManager.broadcast davranışı"""
+
+    def __init__(self, sockets):
+        self.active_connections = list(sockets)
+
+    async def broadcast(self, message: dict):
+        for connection in self.active_connections:
+            try:
+                await connection.send_json(message)
+            except Exception:
+                self.active_connections.remove(connection)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def _sockets(clients, slow, slow_delay):
+    return [FakeWebSocket(slow_delay if i < slow else 0.0) for i in range(clients)]
+
+
+async def run_legacy(args):
+    sockets = _sockets(args.clients, args.slow, args.slow_delay)
+    manager = LegacyManager(sockets)
+    ingest = []
+    for i in range(args.messages):
+        started = time.perf_counter()
+        await manager.broadcast({"type": "new_message", "sent_at": started, "n": i})
+        ingest.append(time.perf_counter() - started)
+        await asyncio.sleep(args.interval)
+    return ingest, [lat for ws in sockets if not ws.delay for lat in ws.latencies]
+
+
+async def run_fanout(args):
+    sockets = _sockets(args.clients, args.slow, args.slow_delay)
+    manager = ConnectionManager(max_queue=64)
+    for ws in sockets:
+        await manager.connect(ws)
+    ingest = []
+    for i in range(args.messages):
+        started = time.perf_counter()
+        manager.publish({"type": "new_message", "sent_at": started, "n": i})
+        ingest.append(time.perf_counter() - started)
+        await asyncio.sleep(args.interval)
+    await asyncio.sleep(0.2)
+    for ws in sockets:
+        manager.disconnect(ws)
+    return ingest, [lat for ws in sockets if not ws.delay for lat in ws.latencies]
+
+
+def report(name, ingest, delivery):
+    print(f"{name:<10} ingest p50={_percentile(ingest, 50) * 1e3:8.3f}ms "
+          f"p99={_percentile(ingest, 99) * 1e3:8.3f}ms | "
+          f"çatdırılma p50={_percentile(delivery, 50) * 1e3:8.3f}ms "
+          f"p99={_percentile(delivery, 99) * 1e3:8.3f}ms "
+          f"(orta {statistics.fmean(delivery) * 1e3 if delivery else 0:.3f}ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--slow", type=int, default=10)
+    parser.add_argument("--slow-delay", type=float, default=0.01)
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=0.005)
+    args = parser.parse_args()
+
+    print(f"{args.clients} client ({args.slow} yavaş, {args.slow_delay * 1e3:.0f}ms/send), "
+          f"{args.messages} mesaj, {args.interval * 1e3:.0f}ms aralıqla")
+    report("köhnə", *asyncio.run(run_legacy(args)))
+    report("fan-out", *asyncio.run(run_fanout(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,20 @@ class TelegramDashboard {
         this.reconnectAttempts = 0;
         this.maxReconnectAttempts = 5;
         
+        // Söhbət tarixçəsi: köhnə mesajlar scroll yuxarı çatanda yüklənir
+        this.historyCursor = null;
+        this.historyHasMore = false;
+        this.historyLoading = false;
+        
+        // Topic abunəlikləri: topic -> son alınan seq
+        this.topicSeq = {};
+        this.epoch = null;
+        // Server-in yavaş növbədə yenisi ilə əvəzlədiyi seq-lər: topic -> Set
+        this.coalescedSeq = {};
+        
+        // Açıq alert-lər: id -> son alınan alert (yenilənmə və təsdiq üçün)
+        this.alerts = {};
+        
         // Template messages
         this.templates = {
             uzr: "Üzr istəyirik narazılığınıza görə. Problem dərhal araşdırılır və həll ediləcək.",
@@ -46,8 +60,12 @@ class TelegramDashboard {
         // Load initial data
         await this.loadActiveChats();
         
-        // Auto refresh every 3 seconds
-        setInterval(() => this.loadActiveChats(), 3000);
+        // Yeniləmələr WebSocket delta-ları ilə gəlir; poll yalnız bağlantı yoxdursa
+        setInterval(() => {
+            if (!this.isSocketOpen()) {
+                this.loadActiveChats();
+            }
+        }, 3000);
     }
     
     // ===== REAL-TIME FUNCTIONS =====
@@ -90,6 +108,9 @@ class TelegramDashboard {
                 this.reconnectAttempts = 0;
                 this.updateConnectionStatus(true);
                 
+                // Qaldığımız seq-dən davam et (reconnect-də yalnız buraxılanlar gəlir)
+                this.subscribeTopic('chats');
+                this.subscribeTopic('alerts');
                 if (this.currentChat) {
                     this.subscribeToChat(this.currentChat);
                 }
@@ -149,27 +170,121 @@ class TelegramDashboard {
         }
     }
     
-    subscribeToChat(userId) {
-        if (this.websocket && this.websocket.readyState === WebSocket.OPEN) {
+    isSocketOpen() {
+        return this.websocket && this.websocket.readyState === WebSocket.OPEN;
+    }
+    
+    subscribeTopic(topic) {
+        if (this.isSocketOpen()) {
             this.websocket.send(JSON.stringify({
                 type: 'subscribe',
-                user_id: userId
+                topic: topic,
+                since: this.topicSeq[topic],
+                epoch: this.epoch
             }));
         }
     }
     
+    subscribeToChat(userId) {
+        this.subscribeTopic(`user:${userId}`);
+    }
+    
     unsubscribeFromChat() {
-        if (this.websocket && this.websocket.readyState === WebSocket.OPEN) {
+        const topic = `user:${this.currentChat}`;
+        delete this.topicSeq[topic];
+        
+        if (this.isSocketOpen()) {
             this.websocket.send(JSON.stringify({
-                type: 'unsubscribe'
+                type: 'unsubscribe',
+                topic: topic
             }));
         }
     }
     
+    // Seq ardıcıllığını yoxla; boşluq olsa buraxılanları yenidən istə
+    acceptSequence(data) {
+        if (data.epoch !== this.epoch) {
+            this.epoch = data.epoch;
+            this.topicSeq = {};
+            this.coalescedSeq = {};
+        }
+        
+        const last = this.topicSeq[data.topic];
+        if (data.type !== 'snapshot' && last !== undefined) {
+            if (data.seq <= last) return false;
+            // Əvəzlənmiş (coalesced) delta-lar itki deyil - üstündən keç
+            let expected = last + 1;
+            const coalesced = this.coalescedSeq[data.topic];
+            while (coalesced && coalesced.delete(expected)) {
+                expected++;
+            }
+            if (data.seq !== expected) {
+                this.subscribeTopic(data.topic);
+                return false;
+            }
+        }
+        
+        this.topicSeq[data.topic] = data.seq;
+        return true;
+    }
+    
     handleWebSocketMessage(data) {
         console.log('[WEBSOCKET]', data.type);
         
+        if (data.type === 'coalesced') {
+            const coalesced = this.coalescedSeq[data.topic] || (this.coalescedSeq[data.topic] = new Set());
+            data.seqs.forEach(seq => coalesced.add(seq));
+            return;
+        }
+        
+        if (data.topic && !this.acceptSequence(data)) {
+            return;
+        }
+        
         switch (data.type) {
+            case 'snapshot':
+                this.handleSnapshot(data.topic, data.data);
+                break;
+            case 'chat_added':
+            case 'chat_updated':
+                this.upsertChat(data.data);
+                break;
+            case 'message_appended':
+                this.handleMessageAppended(data.topic, data.data);
+                break;
+            case 'messages_appended':
+                this.handleMessagesAppended(data.topic, data.data);
+                break;
+            case 'chats_updated':
+                this.mergeChats(data.data.chats);
+                break;
+            case 'alerts':
+                data.data.forEach(alert => this.handleHighRiskAlert(alert));
+                break;
+            case 'new_messages':
+                data.data.forEach(message => this.handleNewMessage(message));
+                break;
+            case 'risk_changed':
+                this.handleRiskChanged(data.data);
+                break;
+            case 'escalation':
+                this.handleEscalation(data.data);
+                break;
+            case 'escalations':
+                data.data.forEach(escalation => this.handleEscalation(escalation));
+                break;
+            case 'alert':
+                this.handleHighRiskAlert(data.data);
+                break;
+            case 'alert_updated':
+                this.handleAlertUpdated(data.data);
+                break;
+            case 'alerts_updated':
+                data.data.forEach(alert => this.handleAlertUpdated(alert));
+                break;
+            case 'alert_acknowledged':
+                this.handleAlertAcknowledged(data.data);
+                break;
             case 'new_message':
                 this.handleNewMessage(data.data);
                 break;
@@ -205,6 +320,10 @@ class TelegramDashboard {
     handleHighRiskAlert(alertData) {
         console.log('[HIGH RISK ALERT]', alertData.username, '-', alertData.risk_score + '%');
         
+        if (alertData.id) {
+            this.alerts[alertData.id] = alertData;
+        }
+        
         this.showAlert('danger',
             `🚨 YÜKSƏK RİSK: ${alertData.username}`,
             `${alertData.risk_score}% risk: ${alertData.message}`);
@@ -212,11 +331,121 @@ class TelegramDashboard {
         this.playAlertSound();
     }
     
+    handleAlertUpdated(alertData) {
+        const previous = this.alerts[alertData.id];
+        
+        // Qruplaşdırılmış alert-ə yeni mesaj: yalnız risk artanda yenidən xəbərdar et
+        if (!previous || alertData.risk_score > previous.risk_score) {
+            this.handleHighRiskAlert(alertData);
+            return;
+        }
+        
+        console.log('[ALERT UPDATED]', alertData.username, '-', alertData.count, 'mesaj');
+        this.alerts[alertData.id] = alertData;
+    }
+    
+    handleAlertAcknowledged(alertData) {
+        console.log('[ALERT ACK]', alertData.username, '-', alertData.id);
+        delete this.alerts[alertData.id];
+        
+        this.showAlert('success',
+            `✅ Alert təsdiqləndi: ${alertData.username}`,
+            `${alertData.risk_score}% risk: ${alertData.message}`);
+    }
+    
+    handleEscalation(escalation) {
+        const reasons = {
+            level_up: `səviyyə: ${escalation.level}`,
+            streak: `${escalation.streak} ardıcıl riskli mesaj`,
+            surge: `risk sürətlə artır (+${escalation.velocity}/dəq)`
+        };
+        console.log('[ESCALATION]', escalation.username, '-', escalation.type);
+        
+        this.showAlert(escalation.level === 'danger' ? 'danger' : 'warning',
+            `📈 ESKALASİYA: ${escalation.username}`,
+            `${escalation.risk_score}% risk, ${reasons[escalation.type]}`);
+    }
+    
     handleBotStatusChanged(data) {
         console.log('[BOT STATUS]', data.user_id, '->', data.status);
         this.loadActiveChats();
     }
     
+    // ===== TOPIC DELTA HANDLERS =====
+    handleSnapshot(topic, snapshot) {
+        if (topic === 'chats') {
+            this.activeChats = snapshot || [];
+            this.refreshChatsList();
+        } else if (topic === 'alerts') {
+            this.alerts = {};
+            (snapshot || []).forEach(alert => { this.alerts[alert.id] = alert; });
+        } else if (topic.startsWith('user:')) {
+            if (snapshot && snapshot.success && topic === `user:${this.currentChat}`) {
+                this.displayChatDetails(snapshot);
+            }
+        }
+    }
+    
+    upsertChat(chat) {
+        this.mergeChats([chat]);
+    }
+    
+    mergeChats(chats) {
+        chats.forEach(chat => {
+            const index = this.activeChats.findIndex(c => c.user_id === chat.user_id);
+            if (index >= 0) {
+                this.activeChats[index] = chat;
+            } else {
+                this.activeChats.push(chat);
+            }
+        });
+        
+        // Son 1 saatdan köhnə söhbətləri çıxar, son aktiv əvvəl
+        const hourAgo = Date.now() - 3600 * 1000;
+        this.activeChats = this.activeChats
+            .filter(c => new Date(c.last_time).getTime() > hourAgo)
+            .sort((a, b) => (a.last_time < b.last_time ? 1 : -1));
+        
+        this.refreshChatsList();
+    }
+    
+    refreshChatsList() {
+        this.displayChatsList();
+        this.updateStats();
+        
+        if (!this.currentChat && this.activeChats.length > 0) {
+            this.openChat(this.activeChats[0].user_id);
+            this.currentChatIndex = 0;
+        } else if (this.currentChat) {
+            const index = this.activeChats.findIndex(c => c.user_id === this.currentChat);
+            if (index >= 0) this.currentChatIndex = index;
+        }
+    }
+    
+    handleMessageAppended(topic, data) {
+        if (topic !== `user:${this.currentChat}`) return;
+        
+        this.addMessageToChat(data.message);
+        document.getElementById('main-risk').textContent = data.stats.max_risk + '%';
+        document.getElementById('main-messages').textContent = data.stats.total;
+    }
+    
+    handleMessagesAppended(topic, data) {
+        if (topic !== `user:${this.currentChat}`) return;
+        
+        data.messages.forEach(message => this.addMessageToChat(message));
+        document.getElementById('main-risk').textContent = data.stats.max_risk + '%';
+        document.getElementById('main-messages').textContent = data.stats.total;
+    }
+    
+    handleRiskChanged(change) {
+        const chat = this.activeChats.find(c => c.user_id === change.user_id);
+        if (chat) {
+            chat.risk_score = change.risk_score;
+            this.refreshChatsList();
+        }
+    }
+    
     // ===== CHAT MANAGEMENT =====
     async loadActiveChats() {
         try {
@@ -308,8 +537,11 @@ class TelegramDashboard {
             activeItem.classList.add('active');
         }
         
+        // WebSocket açıqdırsa snapshot abunəlik ilə gəlir
         this.subscribeToChat(userId);
-        await this.loadChatDetails(userId);
+        if (!this.isSocketOpen()) {
+            await this.loadChatDetails(userId);
+        }
     }
     
     async loadChatDetails(userId) {
@@ -348,9 +580,45 @@ class TelegramDashboard {
             'linear-gradient(45deg, #00adb5, #4dff91)';
         
         // Display messages
+        this.historyCursor = chatData.before;
+        this.historyHasMore = !!chatData.has_more;
         this.displayMessages(chatData.messages);
     }
     
+    async loadOlderMessages() {
+        if (!this.currentChat || !this.historyHasMore || this.historyLoading || this.historyCursor == null) {
+            return;
+        }
+        
+        const userId = this.currentChat;
+        this.historyLoading = true;
+        try {
+            const response = await fetch(`${this.apiBase}/chats/${userId}/messages?before=${this.historyCursor}`);
+            const data = await response.json();
+            
+            // Cavab gələnə qədər başqa söhbət açılıbsa nəticə atılır
+            if (!data.success || userId !== this.currentChat) {
+                return;
+            }
+            
+            this.historyCursor = data.before;
+            this.historyHasMore = data.has_more;
+            if (data.messages.length === 0) {
+                return;
+            }
+            
+            // Yuxarıya əlavə et, scroll mövqeyi yerində qalsın
+            const container = document.getElementById('chat-messages');
+            const previousHeight = container.scrollHeight;
+            container.insertAdjacentHTML('afterbegin', data.messages.map(msg => this.renderMessage(msg)).join(''));
+            container.scrollTop += container.scrollHeight - previousHeight;
+        } catch (error) {
+            console.error('Köhnə mesajlar xətası:', error);
+        } finally {
+            this.historyLoading = false;
+        }
+    }
+    
     displayMessages(messages) {
         const container = document.getElementById('chat-messages');
         
@@ -367,26 +635,7 @@ class TelegramDashboard {
             return;
         }
         
-        container.innerHTML = messages.map(msg => {
-            const senderClass = msg.is_admin ? 'admin' : msg.is_bot ? 'bot' : 'user';
-            const riskClass = this.getRiskClass(msg.risk_score);
-            const showRisk = msg.risk_score > 50 && !msg.is_admin && !msg.is_bot;
-            
-            return `
-                <div class="message ${senderClass}">
-                    <div class="message-bubble">
-                        <div class="message-sender">${msg.sender}</div>
-                        <div class="message-text">${msg.text}</div>
-                        ${showRisk ? `
-                            <div class="risk-indicator ${riskClass}">
-                                ${msg.risk_score}% risk
-                            </div>
-                        ` : ''}
-                        <span class="message-time">${this.formatTime(msg.time)}</span>
-                    </div>
-                </div>
-            `;
-        }).join('');
+        container.innerHTML = messages.map(msg => this.renderMessage(msg)).join('');
         
         // Scroll to bottom
         setTimeout(() => {
@@ -394,6 +643,27 @@ class TelegramDashboard {
         }, 100);
     }
     
+    renderMessage(msg) {
+        const senderClass = msg.is_admin ? 'admin' : msg.is_bot ? 'bot' : 'user';
+        const riskClass = this.getRiskClass(msg.risk_score);
+        const showRisk = msg.risk_score > 50 && !msg.is_admin && !msg.is_bot;
+        
+        return `
+            <div class="message ${senderClass}">
+                <div class="message-bubble">
+                    <div class="message-sender">${msg.sender}</div>
+                    <div class="message-text">${msg.text}</div>
+                    ${showRisk ? `
+                        <div class="risk-indicator ${riskClass}">
+                            ${msg.risk_score}% risk
+                        </div>
+                    ` : ''}
+                    <span class="message-time">${this.formatTime(msg.time)}</span>
+                </div>
+            </div>
+        `;
+    }
+    
     addMessageToChat(messageData) {
         const container = document.getElementById('chat-messages');
         
@@ -664,6 +934,13 @@ class TelegramDashboard {
     
     // ===== EVENT LISTENERS =====
     setupEventListeners() {
+        // Tarixçə: yuxarı çatanda köhnə mesajları yüklə
+        document.getElementById('chat-messages').addEventListener('scroll', (event) => {
+            if (event.target.scrollTop < 80) {
+                this.loadOlderMessages();
+            }
+        });
+        
         // Navigation buttons
         document.getElementById('prev-chat-btn').addEventListener('click', () => {
             this.switchToPrevChat();